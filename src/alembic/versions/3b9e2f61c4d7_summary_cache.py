@@ -0,0 +1,36 @@
+"""summary cache
+
+Revision ID: 3b9e2f61c4d7
+Revises: 7f0c08a0f813
+Create Date: 2025-10-20 11:42:05.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e2f61c4d7'
+down_revision: Union[str, Sequence[str], None] = '7f0c08a0f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('summary_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('prompt_version', sa.String(length=128), nullable=False),
+    sa.Column('summary', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index('idx_summary_cache_version', 'summary_cache', ['prompt_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_summary_cache_version', table_name='summary_cache')
+    op.drop_table('summary_cache')
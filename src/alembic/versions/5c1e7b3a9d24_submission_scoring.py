@@ -0,0 +1,33 @@
+"""submission scoring
+
+Revision ID: 5c1e7b3a9d24
+Revises: a41c7d9e08b2
+Create Date: 2025-11-03 10:22:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7b3a9d24'
+down_revision: Union[str, Sequence[str], None] = 'a41c7d9e08b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('quiz_submissions', sa.Column('score_weighted', sa.Float(), nullable=True))
+    op.add_column('quiz_submissions', sa.Column('brier', sa.Float(), nullable=True))
+    # Earlier submissions had no hint penalty.
+    op.execute('UPDATE quiz_submissions SET score_weighted = score')
+    op.alter_column('quiz_submissions', 'score_weighted', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('quiz_submissions', 'brier')
+    op.drop_column('quiz_submissions', 'score_weighted')
@@ -0,0 +1,31 @@
+"""review due index
+
+Revision ID: 9d3f6a2b7c15
+Revises: 5c1e7b3a9d24
+Create Date: 2025-11-10 14:05:51.730264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6a2b7c15'
+down_revision: Union[str, Sequence[str], None] = '5c1e7b3a9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index('idx_review_cards_due', 'review_cards', ['user_id', 'next_review_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_review_cards_due', table_name='review_cards', postgresql_concurrently=True)
@@ -0,0 +1,65 @@
+"""user overview stats
+
+Revision ID: e2a8c4f19b63
+Revises: 9d3f6a2b7c15
+Create Date: 2025-11-14 11:47:20.904817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a8c4f19b63'
+down_revision: Union[str, Sequence[str], None] = '9d3f6a2b7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('materials_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('quizzes_completed', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('best_score_sum', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table('user_quiz_best',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('quiz_id', sa.Integer(), nullable=False),
+    sa.Column('best_score', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_gain', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['quiz_id'], ['quizzes.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'quiz_id')
+    )
+    op.create_index('idx_uqb_quiz', 'user_quiz_best', ['quiz_id'], unique=False)
+
+    # Backfill from the existing submissions and materials.
+    op.execute("""
+        INSERT INTO user_quiz_best (user_id, quiz_id, best_score, attempts, last_gain)
+        SELECT user_id, quiz_id, max(score), count(*), 0
+        FROM quiz_submissions
+        GROUP BY user_id, quiz_id
+    """)
+    op.execute("""
+        INSERT INTO user_stats (user_id, materials_count, quizzes_completed, best_score_sum)
+        SELECT u.id,
+               (SELECT count(*) FROM materials m WHERE m.user_id = u.id),
+               (SELECT count(*) FROM user_quiz_best b WHERE b.user_id = u.id),
+               (SELECT coalesce(sum(b.best_score), 0) FROM user_quiz_best b WHERE b.user_id = u.id)
+        FROM users u
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_uqb_quiz', table_name='user_quiz_best')
+    op.drop_table('user_quiz_best')
+    op.drop_table('user_stats')
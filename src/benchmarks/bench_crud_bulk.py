@@ -0,0 +1,90 @@
+"""
+Row-at-a-time CRUDBase calls vs. the bulk operations, on the users table.
+
+    cd src && python -m benchmarks.bench_crud_bulk [--rows 10 100 1000] [--batch-size 500]
+
+Needs a reachable Postgres at DATABASE_URL. Every scenario runs inside a transaction
+that is rolled back, so the table is left untouched.
+"""
+import time
+import asyncio
+import argparse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User
+from core.database import engine
+from modules.user.crud import UserDatabase
+
+crud = UserDatabase(User)
+
+
+def make_rows(n: int) -> list[dict]:
+    return [{"email": f"bench-bulk-{i}@example.invalid", "password_hash": "x", "role": "user"} for i in range(n)]
+
+
+async def per_row(db: AsyncSession, n: int) -> dict[str, float]:
+    timings = {}
+    started = time.perf_counter()
+    users = [await crud.create(db, row) for row in make_rows(n)]
+    timings["create"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for user in users:
+        await crud.update(db, db_obj=user, obj_in={"role": "admin"})
+    timings["update"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for user in users:
+        await crud.remove(db, user.id)
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def bulk(db: AsyncSession, n: int, batch_size: int) -> dict[str, float]:
+    timings = {}
+    started = time.perf_counter()
+    users = await crud.create_many(db, make_rows(n), batch_size=batch_size)
+    timings["create"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await crud.upsert_many(db, [{**row, "role": "admin"} for row in make_rows(n)], index_elements=["email"], batch_size=batch_size)
+    timings["upsert"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await crud.update_many(db, [{"id": user.id, "role": "user"} for user in users], batch_size=batch_size)
+    timings["update"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await crud.delete_where(db, id=[user.id for user in users], batch_size=batch_size)
+    timings["delete"] = time.perf_counter() - started
+    return timings
+
+
+async def in_rolled_back_transaction(scenario, *args) -> dict[str, float]:
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            return await scenario(db, *args)
+        finally:
+            await db.close()
+            await transaction.rollback()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    for n in args.rows:
+        single = await in_rolled_back_transaction(per_row, n)
+        many = await in_rolled_back_transaction(bulk, n, args.batch_size)
+        for op in ("create", "update", "delete"):
+            print(f"{n:>5} rows {op:<7} per-row {single[op] * 1e3:9.1f} ms   bulk {many[op] * 1e3:8.1f} ms   x{single[op] / many[op]:6.1f}")
+        print(f"{n:>5} rows upsert  bulk {many['upsert'] * 1e3:8.1f} ms")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
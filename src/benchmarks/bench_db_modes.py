@@ -0,0 +1,62 @@
+"""
+Per-query latency of the hot user lookup (UserDatabase.get_objects(email=...)) with the
+pooler and direct connection profiles.
+
+    cd src && python -m benchmarks.bench_db_modes [--queries 2000]
+
+Needs a reachable Postgres at DATABASE_URL (direct, not through PgBouncer, so both
+profiles can run against it). The benchmark user is inserted inside a transaction that
+is rolled back at the end.
+"""
+import time
+import asyncio
+import argparse
+import statistics
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from models import User
+from core.database import ASYNC_DATABASE_URL, async_connect_args
+from modules.user.crud import UserDatabase
+
+EMAIL = "bench-db-modes@example.invalid"
+
+
+async def measure(mode: str, queries: int) -> list[float]:
+    engine = create_async_engine(ASYNC_DATABASE_URL, connect_args=async_connect_args(mode), pool_size=1)
+    user_database = UserDatabase(User)
+    timings = []
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            db = AsyncSession(bind=conn)
+            await user_database.create(db, {"email": EMAIL, "password_hash": "x", "role": "user"})
+
+            for _ in range(50):
+                await user_database.get_objects(db, email=EMAIL)
+            for _ in range(queries):
+                db.expunge_all()
+                started = time.perf_counter()
+                await user_database.get_objects(db, email=EMAIL)
+                timings.append(time.perf_counter() - started)
+
+            await db.close()
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    for mode in ("pooler", "direct"):
+        timings = sorted(await measure(mode, args.queries))
+        p50 = statistics.median(timings)
+        p99 = timings[int(len(timings) * 0.99) - 1]
+        print(f"{mode:<7} p50 {p50 * 1e6:8.1f} us   p99 {p99 * 1e6:8.1f} us   mean {statistics.fmean(timings) * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
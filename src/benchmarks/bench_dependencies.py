@@ -0,0 +1,95 @@
+"""
+Per-request cost of resolving the auth service dependency.
+
+    cd src && python -m benchmarks.bench_dependencies [--requests 2000]
+
+"per-request graph" rebuilds AuthService, UserService, UserDatabase, JWTService and a
+passlib CryptContext on every request, as get_auth_service did before the service
+container; "container" is the current lookup on app.state.
+"""
+import time
+import asyncio
+import argparse
+import httpx
+from fastapi import Depends, FastAPI
+from passlib.context import CryptContext
+
+from models import User
+from container import ServiceContainer
+from core.dependencies import get_config
+from modules.auth.service import AuthService
+from modules.auth.jwt_service import JWTService
+from modules.auth.dependencies import get_auth_service
+from modules.user.crud import UserDatabase
+from modules.user.service import UserService
+
+
+class PerRequestPasswordManager:
+    def __init__(self):
+        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def per_request_auth_service() -> AuthService:
+    config = get_config()
+    return AuthService(
+        user_service=UserService(user_database=UserDatabase(User)),
+        password_manager=PerRequestPasswordManager(),
+        jwt_service=JWTService(
+            algorithm=config.ALGORITHM,
+            secret_key=config.SECRET_KEY,
+            access_expiry=config.ACCESS_TOKEN_EXPIRE_MINUTES,
+            refresh_expiry=config.REFRESH_TOKEN_EXPIRE_MINUTES,
+        ),
+    )
+
+
+def build_app(container: ServiceContainer) -> FastAPI:
+    app = FastAPI()
+    app.state.container = container
+
+    @app.get("/per-request")
+    async def per_request(auth_service: AuthService = Depends(per_request_auth_service)):
+        return {}
+
+    @app.get("/container")
+    async def from_container(auth_service: AuthService = Depends(get_auth_service)):
+        return {}
+
+    @app.get("/baseline")
+    async def baseline():
+        return {}
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    for _ in range(50):
+        await client.get(path)
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.perf_counter() - started) / requests
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    container = ServiceContainer(get_config())
+    transport = httpx.ASGITransport(app=build_app(container))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = await measure(client, "/baseline", args.requests)
+        for path in ("/per-request", "/container"):
+            per_request = await measure(client, path, args.requests)
+            print(f"{path:<14} {per_request * 1e6:9.1f} us/request  (+{(per_request - baseline) * 1e6:7.1f} us over an empty route)")
+
+    started = time.perf_counter()
+    for _ in range(args.requests):
+        per_request_auth_service()
+    print(f"graph construction alone: {(time.perf_counter() - started) / args.requests * 1e6:.1f} us")
+    await container.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,232 @@
+"""
+Latency and throughput of the main API endpoints under concurrent load.
+
+    cd src && python -m benchmarks.bench_http [--url http://127.0.0.1:8000]
+        [--scenarios register login refresh test summarize summarize_cached]
+        [--concurrency 1 8 32] [--requests 200] [--out results.json]
+        [--baseline PATH | --save-baseline] [--tolerance 0.15]
+
+Without --url the app from main.py is driven in-process through httpx's ASGI transport
+(its lifespan runs, so DATABASE_URL must point at a reachable Postgres). In-process runs
+default to AI_PROVIDER=fake, an effectively unlimited RATE_LIMIT_PER_MIN and, as no
+scenario enqueues jobs, CELERY_TASK_ALWAYS_EAGER=true instead of a REDIS_URL; a uvicorn
+given with --url should be started with the same settings.
+
+Every scenario runs at every concurrency level: that many clients send `requests`
+requests in total, back to back, after a short warm-up. Reported: p50/p95/p99 latency,
+throughput and the number of non-2xx responses. "summarize" sends a new text each time
+(one fake LLM call of FAKE_AI_LATENCY seconds per request), "summarize_cached" the same
+text every time.
+
+Results are compared with the baseline (by default benchmarks/baselines/http.json, if
+present): a p95 more than `tolerance` above the baseline's, or a throughput more than
+`tolerance` below it, is a regression and makes the exit status 1. --save-baseline
+stores the current run as the new baseline.
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import itertools
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import httpx
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "http.json"
+PASSWORD = "bench-password-1"
+SCENARIOS = ("register", "login", "refresh", "test", "summarize", "summarize_cached")
+MATERIAL = (
+    "Фотосинтез — процесс образования органических веществ из углекислого газа и воды "
+    "на свету при участии фотосинтетических пигментов. Материал для нагрузочного теста {n}."
+)
+
+Request = tuple[str, str, dict]
+
+
+def user_payload(tag: str, n: int) -> dict:
+    return {
+        "email": f"bench-{tag}-{n}@example.com",
+        "phone_number": f"+{tag}{n:07d}",
+        "password": PASSWORD,
+    }
+
+
+def build_scenarios(tag: str, account: dict, email: str) -> dict[str, Callable[[int], Request]]:
+    """
+    Request factories per scenario; each gets a number that is unique within the run.
+    """
+    access = {"headers": {"Authorization": f"Bearer {account['access_token']}"}}
+    refresh = {"headers": {"Authorization": f"Bearer {account['refresh_token']}"}}
+    cached_text = MATERIAL.format(n=f"{tag}-cached")
+    return {
+        "register": lambda n: ("POST", "/v1/auth/register", {"json": user_payload(tag, n)}),
+        "login": lambda n: ("POST", "/v1/auth/login", {"data": {"username": email, "password": PASSWORD}}),
+        "refresh": lambda n: ("POST", "/v1/auth/token/refresh", refresh),
+        "test": lambda n: ("POST", "/v1/auth/test", access),
+        "summarize": lambda n: ("POST", "/v1/ai/summarize", {"json": {"text": MATERIAL.format(n=f"{tag}-{n}")}, **access}),
+        "summarize_cached": lambda n: ("POST", "/v1/ai/summarize", {"json": {"text": cached_text}, **access}),
+    }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3),
+        "rps": round(len(values) / elapsed, 2),
+    }
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    make_request: Callable[[int], Request],
+    sequence: itertools.count,
+    concurrency: int,
+    requests: int,
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            method, path, kwargs = make_request(next(sequence))
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                ok = response.is_success
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run(client: httpx.AsyncClient, scenarios: list[str], levels: list[int], requests: int, warmup: int) -> dict:
+    # Phone numbers are at most 32 characters and unique, so the run tag is numeric.
+    tag = str(random.randrange(10 ** 8, 10 ** 9))
+    sequence = itertools.count()
+    account_payload = user_payload(tag, next(sequence))
+    response = await client.post("/v1/auth/register", json=account_payload)
+    if not response.is_success:
+        raise SystemExit(f"Could not register the benchmark user: {response.status_code} {response.text}")
+    factories = build_scenarios(tag, response.json(), account_payload["email"])
+
+    results: dict[str, dict[str, dict]] = {}
+    for name in scenarios:
+        results[name] = {}
+        for concurrency in levels:
+            await run_level(client, factories[name], sequence, concurrency, min(warmup, requests))
+            stats = await run_level(client, factories[name], sequence, concurrency, requests)
+            results[name][str(concurrency)] = stats
+            print(
+                f"{name:<17} c={concurrency:<4} p50 {stats['p50_ms']:9.2f} ms  p95 {stats['p95_ms']:9.2f} ms  "
+                f"p99 {stats['p99_ms']:9.2f} ms  {stats['rps']:9.1f} req/s  errors {stats['errors']}",
+                flush=True,
+            )
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Prints p95/throughput changes against the baseline and returns the regressions.
+    Scenario/concurrency pairs missing from either run are skipped.
+    """
+    regressions = []
+    print(f"\nAgainst baseline from {baseline.get('created_at', '?')} (tolerance {tolerance:.0%}):")
+    for name, levels in current["results"].items():
+        for concurrency, stats in levels.items():
+            before = baseline.get("results", {}).get(name, {}).get(concurrency)
+            if before is None:
+                continue
+            p95_change = stats["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+            rps_change = stats["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+            flags = []
+            if p95_change > tolerance:
+                flags.append("p95")
+            if rps_change < -tolerance:
+                flags.append("throughput")
+            print(f"{name:<17} c={concurrency:<4} p95 {p95_change:+7.1%}  req/s {rps_change:+7.1%}  {'REGRESSION: ' + ', '.join(flags) if flags else 'ok'}")
+            if flags:
+                regressions.append(f"{name} c={concurrency}: {', '.join(flags)}")
+    return regressions
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="base URL of a running server; default: drive main.app in-process")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per scenario and concurrency level")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--out", type=Path, help="write the results as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=120) as client:
+            results = await run(client, args.scenarios, args.concurrency, args.requests, args.warmup)
+        fake_latency: Optional[float] = None
+    else:
+        os.environ.setdefault("AI_PROVIDER", "fake")
+        os.environ.setdefault("RATE_LIMIT_PER_MIN", str(10 ** 9))
+        os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "true")  # no job scenarios, no broker needed
+        from main import app, config
+
+        if config.AI_PROVIDER != "fake":
+            print("warning: AI_PROVIDER is not 'fake', summarize scenarios call the real assistant", file=sys.stderr)
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+                results = await run(client, args.scenarios, args.concurrency, args.requests, args.warmup)
+        fake_latency = config.FAKE_AI_LATENCY if config.AI_PROVIDER == "fake" else None
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": args.url or "in-process",
+        "requests": args.requests,
+        "fake_ai_latency": fake_latency,
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nResults written to {args.out}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline}")
+    elif args.baseline.exists():
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): " + "; ".join(regressions))
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Caller-side cost of logging: what a request pays on the event loop per log call.
+
+    cd src && python -m benchmarks.bench_logging [--records 20000]
+
+Compares the previous setup (StreamHandler writing in the caller, Path.resolve() per
+record, f-string debug messages) with the current one (QueueHandler + listener thread,
+memoized paths, lazy %-args). Output goes to a temporary file.
+"""
+import time
+import queue
+import logging
+import logging.handlers
+import argparse
+import tempfile
+from pathlib import Path
+
+from core.logger import DATEFMT, FORMAT, CustomFormatter, QueueHandler
+
+PAYLOAD = {"email": "user@example.com", "phone_number": "+77001234567", "password_hash": "$2b$12$" + "x" * 53}
+
+
+class PreviousFormatter(logging.Formatter):
+    def format(self, record):
+        full_path = Path(record.pathname).resolve()
+        record.custom_filename = str(full_path).replace('/src/', '').replace('src/', '')
+        record.level = f"{record.levelname:^7}"
+        return super().format(record)
+
+
+def make_logger(name: str, handler: logging.Handler, level: int) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def per_call(fn, records: int) -> float:
+    started = time.perf_counter()
+    for i in range(records):
+        fn(i)
+    return (time.perf_counter() - started) / records * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryFile("w") as out:
+        direct = logging.StreamHandler(out)
+        direct.setFormatter(PreviousFormatter(FORMAT, DATEFMT))
+        previous = make_logger("bench.previous", direct, logging.INFO)
+
+        listener_handler = logging.StreamHandler(out)
+        listener_handler.setFormatter(CustomFormatter(FORMAT, DATEFMT))
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, listener_handler)
+        listener.start()
+        current = make_logger("bench.current", QueueHandler(log_queue), logging.INFO)
+
+        n = args.records
+        print(f"DEBUG disabled, f-string payload   {per_call(lambda i: previous.debug(f'Creating User with data: {PAYLOAD}'), n):7.2f} us/call")
+        print(f"DEBUG disabled, lazy %-args        {per_call(lambda i: current.debug('Creating %s with fields %s', 'User', list(PAYLOAD)), n):7.2f} us/call")
+        print(f"INFO, direct write + Path.resolve  {per_call(lambda i: previous.info('request %d handled', i), n):7.2f} us/call")
+        print(f"INFO, queued                       {per_call(lambda i: current.info('request %d handled', i), n):7.2f} us/call")
+
+        started = time.perf_counter()
+        listener.stop()
+        print(f"listener drained the backlog in {(time.perf_counter() - started) * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
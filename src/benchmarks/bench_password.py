@@ -0,0 +1,70 @@
+"""
+Login throughput and event-loop stalls with bcrypt inline vs. in the PasswordManager pool.
+
+    cd src && python -m benchmarks.bench_password [--rounds 12] [--logins 64] [--concurrency 1 8 32]
+
+"Loop lag" is the worst delay seen by a 10 ms heartbeat task, i.e. how long every other
+request on the worker would have been frozen.
+"""
+import time
+import asyncio
+import argparse
+
+from modules.auth.password_manager import PasswordManager
+
+
+async def heartbeat(stop: asyncio.Event, lags: list[float], interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(pm: PasswordManager, hashed: str, logins: int, concurrency: int, pooled: bool) -> tuple[float, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if pooled:
+                await pm.verify_and_update("secret123", hashed)
+            else:
+                pm.verify_password("secret123", hashed)
+                await asyncio.sleep(0)
+
+    stop, lags = asyncio.Event(), []
+    beat = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await beat
+    return logins / elapsed, max(lags, default=0.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    pm = PasswordManager(rounds=args.rounds, workers=args.workers, max_pending=max(args.concurrency))
+    hashed = pm.hash_password("secret123")
+
+    print(f"bcrypt rounds={args.rounds}, pool workers={args.workers}, logins={args.logins}")
+    print(f"{'mode':<8}{'concurrency':>12}{'logins/s':>12}{'loop lag ms':>14}")
+    for concurrency in args.concurrency:
+        for pooled in (False, True):
+            throughput, lag = await run(pm, hashed, args.logins, concurrency, pooled)
+            mode = "pool" if pooled else "inline"
+            print(f"{mode:<8}{concurrency:>12}{throughput:>12.1f}{lag * 1000:>14.1f}")
+
+    pm.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
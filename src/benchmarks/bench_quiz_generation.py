@@ -0,0 +1,133 @@
+"""
+Wall-clock time and token use of quiz generation strategies against a simulated LLM.
+
+    cd src && python -m benchmarks.bench_quiz_generation [--questions 10] [--invalid-rate 0.1]
+        [--trials 5] [--ttft 0.3] [--token-ms 1.0]
+
+The simulated model answers after `ttft` seconds and then streams its JSON at `token-ms`
+per token (4 characters); each question comes out invalid with probability
+`invalid-rate`. Strategies:
+
+  per_question    one call per question (8 at a time), each with the material, and the
+                  same one-call repair as below for the questions that fail
+  whole_document  one call for all questions, validated once the document is complete;
+                  if anything is invalid the whole quiz is requested again (once)
+  streamed        QuizGenerator: one call, questions validated as they complete, then one
+                  small call that re-asks only for the failed questions
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import argparse
+from contextlib import aclosing
+
+from modules.quiz.generator import QUIZ_PROMPT, QUESTION_FORMAT, QUIZ_RULES, QuizGenerator, parse_question
+from modules.summary.chunking import estimate_tokens
+
+MATERIAL = " ".join(
+    f"Параграф {i}. Клетка — элементарная единица строения и жизнедеятельности организмов; "
+    f"митоз обеспечивает равномерное распределение хромосом между дочерними клетками."
+    for i in range(40)
+)
+_COUNT = re.compile(r"Количество вопросов: (\d+)")
+
+
+class SimulatedLLM:
+    def __init__(self, ttft: float, token_seconds: float, invalid_rate: float, seed: int):
+        self.ttft = ttft
+        self.token_seconds = token_seconds
+        self.invalid_rate = invalid_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def question(self, n: int) -> dict:
+        return {
+            "question_text": f"Вопрос {n}: что обеспечивает митоз в параграфе {n % 40}?",
+            "options": ["Распределение хромосом", "Синтез белка", "Транспорт веществ", "Деление ядра без хромосом"],
+            "correct_index": 7 if self.random.random() < self.invalid_rate else n % 4,
+            "difficulty": "medium",
+            "tags": ["клетка", "митоз"],
+            "bloom": "understand",
+            "hints": ["Вспомните, что происходит с хромосомами.", "Сравните число хромосом до и после."],
+            "rationales": {str(k): "Пояснение, почему этот вариант верен или неверен." for k in range(4)},
+        }
+
+    async def stream_completion(self, content: str, operation: str = "custom"):
+        self.calls += 1
+        self.prompt_tokens += estimate_tokens(content)
+        count = int(_COUNT.search(content).group(1))
+        pieces = ['{"questions": [']
+        for i in range(count):
+            pieces.append(("" if i == 0 else ", ") + json.dumps(self.question(self.calls * 1000 + i), ensure_ascii=False))
+        pieces.append("]}")
+
+        await asyncio.sleep(self.ttft)
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            await asyncio.sleep(tokens * self.token_seconds)
+            self.completion_tokens += tokens
+            yield piece
+
+
+async def per_question(llm: SimulatedLLM, count: int) -> int:
+    generator = QuizGenerator(llm)
+    semaphore = asyncio.Semaphore(8)
+
+    async def one():
+        async with semaphore:
+            try:
+                return len(await generator.generate(MATERIAL, 1))
+            except Exception:
+                return 0
+
+    return sum(await asyncio.gather(*(one() for _ in range(count))))
+
+
+async def whole_document(llm: SimulatedLLM, count: int) -> int:
+    prompt = QUIZ_PROMPT.format(count=count, question_format=QUESTION_FORMAT, rules=QUIZ_RULES, text=MATERIAL)
+    valid = []
+    for _ in range(2):
+        async with aclosing(llm.stream_completion(prompt, "quiz")) as stream:
+            document = "".join([delta async for delta in stream])
+        questions = [parse_question(json.dumps(item))[0] for item in json.loads(document)["questions"]]
+        valid = [q for q in questions if q is not None]
+        if len(valid) == count:
+            break
+    return len(valid)
+
+
+async def streamed(llm: SimulatedLLM, count: int) -> int:
+    return len(await QuizGenerator(llm).generate(MATERIAL, count))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--invalid-rate", type=float, default=0.1)
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--ttft", type=float, default=0.3)
+    parser.add_argument("--token-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    print(f"{args.questions} questions, invalid rate {args.invalid_rate:.0%}, {args.trials} trials, material ~{estimate_tokens(MATERIAL)} tokens")
+    print(f"{'strategy':<15} {'wall s':>8} {'calls':>6} {'prompt tok':>11} {'output tok':>11} {'questions':>10}")
+    for name, strategy in (("per_question", per_question), ("whole_document", whole_document), ("streamed", streamed)):
+        wall = calls = prompt_tokens = completion_tokens = questions = 0
+        for trial in range(args.trials):
+            llm = SimulatedLLM(args.ttft, args.token_ms / 1000, args.invalid_rate, seed=trial)
+            started = time.perf_counter()
+            questions += await strategy(llm, args.questions)
+            wall += time.perf_counter() - started
+            calls += llm.calls
+            prompt_tokens += llm.prompt_tokens
+            completion_tokens += llm.completion_tokens
+        n = args.trials
+        print(f"{name:<15} {wall / n:8.2f} {calls / n:6.1f} {prompt_tokens / n:11.0f} {completion_tokens / n:11.0f} {questions / n:10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
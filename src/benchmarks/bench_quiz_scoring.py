@@ -0,0 +1,97 @@
+"""
+Cost of grading quiz submissions.
+
+    cd src && python -m benchmarks.bench_quiz_scoring [--questions 50] [--batches 100 1000 5000]
+
+"per-answer loop" is the straightforward implementation: a dict from question id to
+its row and Python arithmetic per answer and per tag. "numpy" is modules.quiz.scoring.score.
+Both grade the same submissions and must agree. Also reports the one-off cost of
+building the AnswerKey from the database rows.
+"""
+import time
+import random
+import argparse
+from collections import defaultdict
+
+from modules.quiz.schemas import AnswerSubmit
+from modules.quiz.scoring import AnswerKey, HINT_PENALTY, score
+
+P = {"low": 0.55, "med": 0.70, "high": 0.85}
+TAGS = [f"тема-{i}" for i in range(12)]
+
+
+def make_rows(questions: int, rng: random.Random) -> list[tuple]:
+    return [
+        (1000 + i, rng.randrange(4), rng.sample(TAGS, rng.randint(1, 3)), f"Вопрос {i}", ["A", "B", "C", "D"], {}, 1, 1)
+        for i in range(questions)
+    ]
+
+
+def make_submission(rows: list[tuple], rng: random.Random) -> list[AnswerSubmit]:
+    return [
+        AnswerSubmit(
+            question_id=row[0],
+            answer_index=rng.randrange(4),
+            confidence=rng.choice(list(P)),
+            hints_used=rng.sample([1, 2], rng.randint(0, 2)),
+        )
+        for row in rng.sample(rows, len(rows))
+    ]
+
+
+def score_loop(by_id: dict[int, tuple], answers: list[AnswerSubmit]) -> tuple[int, float, float, dict[str, float]]:
+    correct = 0
+    penalty = 0.0
+    brier = 0.0
+    tag_hits: dict[str, float] = defaultdict(float)
+    tag_counts: dict[str, int] = defaultdict(int)
+    for a in answers:
+        row = by_id[a.question_id]
+        hit = a.answer_index == row[1]
+        correct += hit
+        penalty += HINT_PENALTY * len(set(a.hints_used))
+        brier += (P[a.confidence.value] - hit) ** 2
+        for tag in row[2]:
+            tag_hits[tag] += hit
+            tag_counts[tag] += 1
+    return correct, penalty, brier / len(answers), {tag: tag_hits[tag] / n for tag, n in tag_counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--batches", type=int, nargs="+", default=[100, 1000, 5000])
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    rows = make_rows(args.questions, rng)
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        key = AnswerKey.from_rows(1, rows)
+    print(f"AnswerKey.from_rows ({args.questions} questions): {(time.perf_counter() - started) / 1000 * 1e6:.1f} us")
+
+    by_id = {row[0]: row for row in rows}
+    for batch in args.batches:
+        submissions = [make_submission(rows, rng) for _ in range(batch)]
+
+        started = time.perf_counter()
+        expected = [score_loop(by_id, answers) for answers in submissions]
+        loop = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = [score(key, answers) for answers in submissions]
+        vectorized = time.perf_counter() - started
+
+        for (correct, penalty, brier, tags), result in zip(expected, results):
+            assert correct == result.score and abs(penalty - result.penalty) < 1e-9 and abs(brier - result.brier) < 1e-9
+            assert tags.keys() == result.tag_accuracy.keys()
+
+        print(
+            f"{batch:>6} submissions  per-answer loop {loop / batch * 1e6:8.1f} us/submission   "
+            f"numpy {vectorized / batch * 1e6:8.1f} us/submission   ({loop / vectorized:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Per-request overhead of the generation rate limiter.
+
+    cd src && python -m benchmarks.bench_rate_limit [--keys 10000] [--requests 200000]
+
+Set RATE_LIMIT_BENCH_REDIS_URL to also measure the shared Redis backend.
+"""
+import os
+import time
+import asyncio
+import argparse
+from fastapi import HTTPException, Response
+
+from core.rate_limit import InMemoryBackend, RateLimiter, RedisBackend
+
+
+async def bench_limiter(limiter: RateLimiter, keys: int, requests: int) -> float:
+    identities = [str(i) for i in range(keys)]
+    started = time.perf_counter()
+    for i in range(requests):
+        await limiter.hit(identities[i % keys])
+    return (time.perf_counter() - started) / requests
+
+
+async def bench_dependency(limiter: RateLimiter, keys: int, requests: int) -> float:
+    from models import User
+    from modules.open_ai.dependencies import generation_rate_limit
+
+    users = [User(id=i, email=f"u{i}@bench.local", role="user") for i in range(keys)]
+    started = time.perf_counter()
+    for i in range(requests):
+        try:
+            await generation_rate_limit(Response(), current_user=users[i % keys], limiter=limiter)
+        except HTTPException:
+            pass
+    return (time.perf_counter() - started) / requests
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=200_000)
+    args = parser.parse_args()
+
+    limiter = RateLimiter(InMemoryBackend(), limit=5, period=60, scope="bench")
+    per_hit = await bench_limiter(limiter, args.keys, args.requests)
+    print(f"memory backend, limiter.hit:          {per_hit * 1e6:8.2f} us/request")
+
+    per_dep = await bench_dependency(limiter, args.keys, args.requests)
+    print(f"memory backend, FastAPI dependency:   {per_dep * 1e6:8.2f} us/request (incl. 429 path)")
+
+    redis_url = os.getenv("RATE_LIMIT_BENCH_REDIS_URL")
+    if redis_url:
+        redis_limiter = RateLimiter(RedisBackend(redis_url), limit=5, period=60, scope="bench")
+        per_redis = await bench_limiter(redis_limiter, args.keys, min(args.requests, 20_000))
+        print(f"redis backend, limiter.hit:           {per_redis * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
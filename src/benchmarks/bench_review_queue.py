@@ -0,0 +1,141 @@
+"""
+Due-review queue latency with and without idx_review_cards_due (user_id, next_review_at).
+
+    cd src && python -m benchmarks.bench_review_queue [--users 10000] [--cards 1000000]
+        [--queries 500] [--pages 5] [--page-size 20] [--grade-batch 20]
+
+Needs a reachable Postgres at DATABASE_URL with the schema migrated; use a scratch
+database: the users, materials and cards are generated inside a transaction that is
+rolled back, but the "without index" run drops the index inside it, which holds an
+exclusive lock on review_cards until the end. Half of the cards are due, spread over
+the last 30 days; the rest are due within the next 30 days.
+
+Scenarios, each measured for random users:
+  first page      GET /review/due without a cursor
+  walk pages      `pages` consecutive pages following next_cursor
+  grade per card  `grade-batch` cards, one SELECT + UPDATE each
+  grade bulk      the same cards with ReviewCardDatabase.reschedule (one UPDATE)
+"""
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import ReviewCard
+from core.database import engine
+from modules.review.crud import ReviewCardDatabase
+from modules.review.schemas import CardGrade, ReviewGrade
+from modules.review.service import EASE_STEP, INTERVALS
+
+crud = ReviewCardDatabase(ReviewCard)
+
+SEED = """
+WITH new_users AS (
+    INSERT INTO users (email, password_hash, role)
+    SELECT 'bench-review-' || n || '@example.invalid', 'x', 'user' FROM generate_series(1, :users) AS n
+    RETURNING id
+)
+INSERT INTO materials (user_id, title, text)
+SELECT id, 'bench', 'bench' FROM new_users
+RETURNING id, user_id
+"""
+CARDS = """
+INSERT INTO review_cards (user_id, material_id, tag, prompt, answer, next_review_at, ease)
+SELECT m.user_id, m.material_id, 'тема', 'Вопрос', 'Ответ',
+       now() + (random() * 60 - 30) * interval '1 day', 2
+FROM unnest(CAST(:user_ids AS integer[]), CAST(:material_ids AS integer[])) AS m(user_id, material_id),
+     generate_series(1, :per_user)
+"""
+
+
+def percentiles(samples: list[float]) -> str:
+    ms = sorted(s * 1e3 for s in samples)
+    return f"p50 {statistics.median(ms):7.2f} ms  p95 {ms[int(len(ms) * 0.95) - 1]:7.2f} ms"
+
+
+async def first_page(db: AsyncSession, user_id: int, args) -> None:
+    await crud.get_due_page(db, user_id, datetime.now(timezone.utc), args.page_size)
+
+
+async def walk_pages(db: AsyncSession, user_id: int, args) -> None:
+    cursor = None
+    for _ in range(args.pages):
+        _, cursor = await crud.get_due_page(db, user_id, datetime.now(timezone.utc), args.page_size, cursor)
+        if cursor is None:
+            break
+
+
+def schedule(cards: list[ReviewCard]) -> list[tuple[int, datetime, int]]:
+    now = datetime.now(timezone.utc)
+    grades = [CardGrade(card_id=card.id, grade=random.choice(list(ReviewGrade))) for card in cards]
+    return [(g.card_id, now + INTERVALS[g.grade], EASE_STEP[g.grade]) for g in grades]
+
+
+async def grade_per_card(db: AsyncSession, user_id: int, args) -> None:
+    cards, _ = await crud.get_due_page(db, user_id, datetime.now(timezone.utc), args.grade_batch)
+    for card_id, due, step in schedule(cards):
+        card = await crud.get(db, card_id)
+        await crud.update(db, db_obj=card, obj_in={"next_review_at": due, "ease": min(3, max(1, card.ease + step))})
+
+
+async def grade_bulk(db: AsyncSession, user_id: int, args) -> None:
+    cards, _ = await crud.get_due_page(db, user_id, datetime.now(timezone.utc), args.grade_batch)
+    await crud.reschedule(db, user_id, schedule(cards))
+
+
+async def measure(db: AsyncSession, scenario, user_ids: list[int], args) -> list[float]:
+    timings = []
+    for user_id in random.sample(user_ids, min(args.queries, len(user_ids))):
+        started = time.perf_counter()
+        await scenario(db, user_id, args)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--cards", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--grade-batch", type=int, default=20)
+    args = parser.parse_args()
+    random.seed(7)
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            started = time.perf_counter()
+            materials = (await db.execute(text(SEED), {"users": args.users})).all()
+            user_ids = [user_id for _, user_id in materials]
+            await db.execute(text(CARDS), {
+                "user_ids": user_ids,
+                "material_ids": [material_id for material_id, _ in materials],
+                "per_user": args.cards // args.users,
+            })
+            await db.execute(text("ANALYZE review_cards"))
+            print(f"seeded {args.users} users, {args.cards // args.users * args.users} cards in {time.perf_counter() - started:.1f} s")
+
+            scenarios = (("first page", first_page), ("walk pages", walk_pages), ("grade per card", grade_per_card), ("grade bulk", grade_bulk))
+            for label in ("with index", "without index"):
+                if label == "without index":
+                    await db.execute(text("DROP INDEX idx_review_cards_due"))
+                    await db.execute(text("ANALYZE review_cards"))
+                for name, scenario in scenarios:
+                    timings = await measure(db, scenario, user_ids, args)
+                    print(f"{label:<14} {name:<15} {percentiles(timings)}")
+                    db.expunge_all()
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
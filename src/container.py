@@ -0,0 +1,160 @@
+from fastapi import Request
+
+from core.config import Config
+from core.logger import logger
+from core.rate_limit import RateLimiter, create_backend
+from models import (
+    GenerationJob, Material, Quiz, QuizQuestion, QuizSubmission, ReviewCard, SummaryCacheEntry,
+    User, UserSkillMastery, UserStats,
+)
+from modules.auth.service import AuthService
+from modules.auth.principal import PrincipalCache
+from modules.auth.revocation import create_revocation_store
+from modules.auth.jwt_service import JWTService
+from modules.auth.password_manager import PasswordManager
+from modules.jobs.crud import GenerationJobDatabase
+from modules.material.crud import MaterialDatabase
+from modules.jobs.service import JobService
+from modules.open_ai.provider import AIProvider
+from modules.open_ai.service import OpenAIService
+from modules.open_ai.fake import FakeOpenAIService
+from modules.quiz.cache import QuizCache, create_quiz_invalidations
+from modules.quiz.crud import MasteryDatabase, QuizDatabase, QuizQuestionDatabase, QuizSubmissionDatabase
+from modules.quiz.generator import QuizGenerator
+from modules.quiz.service import QuizService
+from modules.summary.cache import SummaryCache
+from modules.summary.crud import SummaryCacheDatabase
+from modules.summary.service import SummaryService
+from modules.review.crud import ReviewCardDatabase
+from modules.overview.crud import UserStatsDatabase
+from modules.overview.service import OverviewService
+from modules.review.service import ReviewService
+from modules.user.crud import UserDatabase
+from modules.user.service import UserService
+from modules.user.importer import UserImporter
+
+
+class ServiceContainer:
+    """
+    Application-scoped service graph, built once per worker process.
+    The API builds it in the lifespan of main.py; Celery workers build their own.
+    """
+
+    def __init__(self, config: Config):
+        self.config = config
+
+        # --- Auth / users ---
+        self.principal_cache = PrincipalCache(
+            maxsize=config.PRINCIPAL_CACHE_SIZE,
+            ttl=config.PRINCIPAL_CACHE_TTL,
+        )
+        self.revocation_store = create_revocation_store(
+            config.REVOCATION_BACKEND,
+            config.REDIS_URL,
+            retention=config.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+            capacity=config.REVOCATION_BLOOM_CAPACITY,
+            sync_interval=config.REVOCATION_SYNC_INTERVAL,
+        )
+        self.user_service = UserService(
+            user_database=UserDatabase(User),
+            principal_cache=self.principal_cache,
+        )
+        self.password_manager = PasswordManager(
+            rounds=config.BCRYPT_ROUNDS,
+            workers=config.PASSWORD_HASH_WORKERS,
+            max_pending=config.PASSWORD_HASH_MAX_PENDING,
+        )
+        self.user_importer = UserImporter(
+            user_database=self.user_service.user_database,
+            password_manager=PasswordManager(
+                rounds=config.BCRYPT_ROUNDS,
+                workers=config.USER_IMPORT_HASH_WORKERS,
+                max_pending=config.USER_IMPORT_BATCH_SIZE,
+            ),
+            batch_size=config.USER_IMPORT_BATCH_SIZE,
+        )
+        self.jwt_service = JWTService(
+            algorithm=config.ALGORITHM,
+            secret_key=config.SECRET_KEY,
+            access_expiry=config.ACCESS_TOKEN_EXPIRE_MINUTES,
+            refresh_expiry=config.REFRESH_TOKEN_EXPIRE_MINUTES,
+        )
+        self.auth_service = AuthService(
+            user_service=self.user_service,
+            password_manager=self.password_manager,
+            jwt_service=self.jwt_service,
+            principal_cache=self.principal_cache,
+            revocation_store=self.revocation_store,
+            trust_token_claims=config.AUTH_TRUST_TOKEN_CLAIMS,
+        )
+
+        # --- AI / generation ---
+        if config.AI_PROVIDER == "fake":
+            self.ai_provider = None
+            self.ai_service = FakeOpenAIService(latency=config.FAKE_AI_LATENCY)
+        else:
+            self.ai_provider = AIProvider(config=config)
+            self.ai_service = OpenAIService(provider=self.ai_provider)
+        self.summary_cache = SummaryCache(
+            database=SummaryCacheDatabase(SummaryCacheEntry),
+            prompt_version=self.ai_service.prompt_version,
+            maxsize=config.SUMMARY_CACHE_SIZE,
+            ttl=config.SUMMARY_CACHE_TTL,
+        )
+        self.summary_service = SummaryService(
+            ai_service=self.ai_service,
+            cache=self.summary_cache,
+            chunk_threshold_tokens=config.SUMMARY_CHUNK_THRESHOLD_TOKENS,
+            chunk_tokens=config.SUMMARY_CHUNK_TOKENS,
+            chunk_concurrency=config.SUMMARY_CHUNK_CONCURRENCY,
+        )
+
+        # --- Quizzes / reviews / overview ---
+        self.stats_database = UserStatsDatabase(UserStats)
+        self.overview_service = OverviewService(stats_database=self.stats_database)
+        self.review_database = ReviewCardDatabase(ReviewCard)
+        self.review_service = ReviewService(review_database=self.review_database)
+        self.quiz_cache = QuizCache(maxsize=config.QUIZ_CACHE_SIZE, ttl=config.QUIZ_CACHE_TTL)
+        self.quiz_invalidations = create_quiz_invalidations(config.REDIS_URL, self.quiz_cache)
+        self.quiz_service = QuizService(
+            generator=QuizGenerator(ai_service=self.ai_service, repair_rounds=config.QUIZ_REPAIR_ROUNDS),
+            quiz_database=QuizDatabase(Quiz),
+            question_database=QuizQuestionDatabase(QuizQuestion),
+            material_database=MaterialDatabase(Material, stats_database=self.stats_database),
+            submission_database=QuizSubmissionDatabase(QuizSubmission),
+            mastery_database=MasteryDatabase(UserSkillMastery),
+            review_database=self.review_database,
+            stats_database=self.stats_database,
+            cache=self.quiz_cache,
+            mastery_alpha=config.MASTERY_EMA_ALPHA,
+            invalidations=self.quiz_invalidations,
+        )
+        self.generation_limiter = RateLimiter(
+            backend=create_backend(config.RATE_LIMIT_BACKEND, config.REDIS_URL),
+            limit=config.RATE_LIMIT_PER_MIN,
+            period=60,
+            scope="generation",
+        )
+        self.job_service = JobService(
+            job_database=GenerationJobDatabase(GenerationJob),
+        )
+
+    async def start(self):
+        await self.revocation_store.start()
+        if self.quiz_invalidations is not None:
+            await self.quiz_invalidations.start()
+
+    async def aclose(self):
+        logger.debug("Closing service container")
+        await self.revocation_store.aclose()
+        if self.quiz_invalidations is not None:
+            await self.quiz_invalidations.aclose()
+        await self.generation_limiter.aclose()
+        if self.ai_provider is not None:
+            await self.ai_provider.aclose()
+        self.password_manager.shutdown()
+        self.user_importer.password_manager.shutdown()
+
+
+async def get_container(request: Request) -> ServiceContainer:
+    return request.app.state.container
@@ -8,20 +8,52 @@ from core.logger import logger, setup_logging
 def on_celery_setup_logging(**kwargs):
     setup_logging()
 
+@signals.worker_process_init.connect
+def on_worker_process_init(**kwargs):
+    # The log listener thread of the parent does not survive the fork into pool children.
+    setup_logging()
+
+def check_broker(config) -> None:
+    """
+    Fails startup when generation jobs could never run: without REDIS_URL they would sit
+    in a process-local queue no worker reads. Eager mode runs them inline in the caller,
+    which works from tests and scripts but not from a running event loop, so the API
+    only warns about it.
+    """
+    if config.CELERY_TASK_ALWAYS_EAGER:
+        if config.PROCESS_ROLE == "api":
+            logger.warning("CELERY_TASK_ALWAYS_EAGER is for tests and scripts; POST /v1/ai/jobs/* will fail in the API")
+        return
+    if not config.REDIS_URL:
+        raise RuntimeError("Generation jobs require REDIS_URL (or CELERY_TASK_ALWAYS_EAGER=true in tests)")
+
+@signals.worker_init.connect
+def on_worker_init(**kwargs):
+    check_broker(config)
+
 logger.debug("Creating celery app")
 
 config = get_config()
-redis_url = config.REDIS_URL
+redis_url = config.REDIS_URL or ""
 
+# The in-memory fallbacks only serve eager mode; check_broker refuses them otherwise.
 celery_app = Celery(
     'backend',
-    broker=redis_url,
-    backend=redis_url,
+    broker=redis_url or "memory://",
+    backend=redis_url or "cache+memory://",
     include=[
         'services.scheduler.tasks',
     ]
 )
 
+celery_app.conf.update(
+    task_always_eager=config.CELERY_TASK_ALWAYS_EAGER,
+    task_eager_propagates=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_ignore_result=True,  # job state lives in generation_jobs
+)
+
 if redis_url.startswith("rediss://"):
     ssl_config = {
         "ssl_cert_reqs": ssl.CERT_REQUIRED,
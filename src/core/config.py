@@ -1,7 +1,6 @@
 import os
 from dotenv import load_dotenv
-from openai import AzureOpenAI
-from functools import cached_property
+from typing import Optional
 
 load_dotenv()
 
@@ -13,23 +12,95 @@ class Config:
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     OAUTH2_TOKEN_URL: str = "/" \
     "v1/auth/login"
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+    # With AUTH_TRUST_TOKEN_CLAIMS the principal is built from the access token alone, so role
+    # changes and deleted users take effect only when the token expires.
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    PRINCIPAL_CACHE_TTL: int = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+    AUTH_TRUST_TOKEN_CLAIMS: bool = os.getenv("AUTH_TRUST_TOKEN_CLAIMS", "false").lower() == "true"
+    REVOCATION_BACKEND: str = os.getenv("REVOCATION_BACKEND", "memory")  # memory | redis
+    REVOCATION_BLOOM_CAPACITY: int = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+    REVOCATION_SYNC_INTERVAL: float = float(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))
+
+    # === USER IMPORT ===
+    USER_IMPORT_BATCH_SIZE: int = int(os.getenv("USER_IMPORT_BATCH_SIZE", "500"))
+    USER_IMPORT_HASH_WORKERS: int = int(os.getenv("USER_IMPORT_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
 
     # === GENERAL SETTINGS ===
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     ALLOWED_HOSTS: list[str] = os.getenv("ALLOWED_HOSTS", "").split(",")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")  # text | json
+    LOG_QUEUE: bool = os.getenv("LOG_QUEUE", "true").lower() == "true"
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Per-request SQL tracking: Server-Timing header, N+1 warnings, optional query budget
+    # (requests over it are logged as warnings).
+    QUERY_TRACKING: bool = os.getenv("QUERY_TRACKING", "true").lower() == "true"
+    QUERY_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("QUERY_N_PLUS_ONE_THRESHOLD", "5"))
+    QUERY_BUDGET: Optional[int] = int(os.getenv("QUERY_BUDGET")) if os.getenv("QUERY_BUDGET") else None
 
     # === DATABASE ===
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    # pooler: behind transaction-mode PgBouncer, prepared statements are not cached.
+    # direct: straight to Postgres, asyncpg caches prepared statements per connection.
+    DATABASE_CONNECTION_MODE: str = os.getenv("DATABASE_CONNECTION_MODE", "pooler")  # pooler | direct
+    DATABASE_STATEMENT_CACHE_SIZE: int = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "100"))
+    DATABASE_QUERY_CACHE_SIZE: int = int(os.getenv("DATABASE_QUERY_CACHE_SIZE", "500"))
+    # api: uvicorn workers; worker: Celery workers. Pool sizes are per process.
+    PROCESS_ROLE: str = os.getenv("PROCESS_ROLE", "api")  # api | worker
+    DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", "20"))
+    DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", "30"))
+    # The API's sync engine only serves the odd script or admin task.
+    DATABASE_SYNC_POOL_SIZE: int = int(os.getenv("DATABASE_SYNC_POOL_SIZE", "1"))
+    DATABASE_SYNC_MAX_OVERFLOW: int = int(os.getenv("DATABASE_SYNC_MAX_OVERFLOW", "2"))
+    DATABASE_POOL_TIMEOUT: float = float(os.getenv("DATABASE_POOL_TIMEOUT", "60"))
+    WORKER_DATABASE_POOL_SIZE: int = int(os.getenv("WORKER_DATABASE_POOL_SIZE", "2"))
+    WORKER_DATABASE_MAX_OVERFLOW: int = int(os.getenv("WORKER_DATABASE_MAX_OVERFLOW", "2"))
+
+    # === RATE LIMITS ===
+    RATE_LIMIT_PER_MIN: int = int(os.getenv("RATE_LIMIT_PER_MIN", "5"))
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")  # memory | redis
+
+    # === CELERY ===
+    # REDIS_URL is required for the API and the worker to start. CELERY_TASK_ALWAYS_EAGER runs
+    # jobs inline in the caller instead; it is for tests and local scripts only, since the
+    # job handlers cannot run inside the API's event loop.
+    REDIS_URL: str = os.getenv("REDIS_URL")
+    CELERY_TASK_ALWAYS_EAGER: bool = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() == "true"
 
     # === OPENAI ===
+    # "fake" swaps the assistant for a deterministic local stand-in (modules/open_ai/fake.py)
+    # that answers after FAKE_AI_LATENCY seconds; meant for load tests and local development.
+    AI_PROVIDER: str = os.getenv("AI_PROVIDER", "azure")  # azure | fake
+    FAKE_AI_LATENCY: float = float(os.getenv("FAKE_AI_LATENCY", "0.5"))
     AZURE_OPENAI_API_KEY: str = os.getenv("AZURE_OPENAI_API_KEY")
     AZURE_OPENAI_ENDPOINT: str = os.getenv("AZURE_OPENAI_ENDPOINT")
     AZURE_OPENAI_VERSION: str = os.getenv("AZURE_OPENAI_VERSION")
-    
-    @cached_property
-    def azure_client(self) -> AzureOpenAI:
-        return AzureOpenAI(
-            api_key=self.AZURE_OPENAI_API_KEY,
-            api_version=self.AZURE_OPENAI_VERSION,
-            azure_endpoint=self.AZURE_OPENAI_ENDPOINT
-        )
\ No newline at end of file
+    AZURE_OPENAI_MAX_CONNECTIONS: int = int(os.getenv("AZURE_OPENAI_MAX_CONNECTIONS", "20"))
+    AZURE_OPENAI_MAX_KEEPALIVE: int = int(os.getenv("AZURE_OPENAI_MAX_KEEPALIVE", "10"))
+    AZURE_OPENAI_KEEPALIVE_EXPIRY: float = float(os.getenv("AZURE_OPENAI_KEEPALIVE_EXPIRY", "30"))
+    AZURE_OPENAI_MAX_CONCURRENCY: int = int(os.getenv("AZURE_OPENAI_MAX_CONCURRENCY", "8"))
+    AZURE_OPENAI_CONNECT_TIMEOUT: float = float(os.getenv("AZURE_OPENAI_CONNECT_TIMEOUT", "5"))
+    AZURE_OPENAI_TIMEOUT: float = float(os.getenv("AZURE_OPENAI_TIMEOUT", "30"))
+    AZURE_OPENAI_RUN_TIMEOUT: float = float(os.getenv("AZURE_OPENAI_RUN_TIMEOUT", "120"))
+    AZURE_OPENAI_MAX_RETRIES: int = int(os.getenv("AZURE_OPENAI_MAX_RETRIES", "2"))
+
+    # === QUIZZES ===
+    # Follow-up calls that re-ask only for the questions that failed validation.
+    QUIZ_REPAIR_ROUNDS: int = int(os.getenv("QUIZ_REPAIR_ROUNDS", "1"))
+    # Weight of one submission in the per-tag mastery EMA.
+    MASTERY_EMA_ALPHA: float = float(os.getenv("MASTERY_EMA_ALPHA", "0.3"))
+    # Per-worker cache of quiz views (public JSON, answer key, hints). A recreated quiz is
+    # announced to the other processes over REDIS_URL; the TTL bounds a missed message.
+    QUIZ_CACHE_SIZE: int = int(os.getenv("QUIZ_CACHE_SIZE", "1024"))
+    QUIZ_CACHE_TTL: int = int(os.getenv("QUIZ_CACHE_TTL", "60"))
+
+    # === SUMMARY CACHE ===
+    SUMMARY_CACHE_SIZE: int = int(os.getenv("SUMMARY_CACHE_SIZE", "1024"))
+    SUMMARY_CACHE_TTL: int = int(os.getenv("SUMMARY_CACHE_TTL", "3600"))
+
+    # === CHUNKED SUMMARIES ===
+    SUMMARY_CHUNK_THRESHOLD_TOKENS: int = int(os.getenv("SUMMARY_CHUNK_THRESHOLD_TOKENS", "3000"))
+    SUMMARY_CHUNK_TOKENS: int = int(os.getenv("SUMMARY_CHUNK_TOKENS", "1500"))
+    SUMMARY_CHUNK_CONCURRENCY: int = int(os.getenv("SUMMARY_CHUNK_CONCURRENCY", "4"))
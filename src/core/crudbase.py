@@ -1,28 +1,47 @@
+import json
+import base64
+import binascii
+from datetime import date, datetime
 from pydantic import BaseModel
 from fastapi import HTTPException
-from typing import Any, Generic, Optional, Type, TypeVar, Union
+from typing import Any, Generic, Iterable, Iterator, Optional, Sequence, Type, TypeVar, Union
 
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, column, delete, insert, inspect, select, update, func, text, tuple_, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import TTLCache
 from core.database import Base
 from core.logger import logger
 
+# asyncpg accepts at most 32767 bind parameters per statement.
+MAX_BIND_PARAMS = 32_000
+
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def _field_names(obj_in: Union[BaseModel, dict[str, Any]]) -> list[str]:
+    # Debug logs name the fields only: payloads can be large and carry password hashes.
+    return list(obj_in) if isinstance(obj_in, dict) else list(obj_in.model_fields_set)
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Generic CRUD base class for SQLAlchemy models.
     Provides create, read, update, delete operations with helpful error messages.
+    The *_many / *_where variants work on whole sets of rows, one statement per batch.
     """
 
-    def __init__(self, model: Type[ModelType]):
+    batch_size: int = 500
+
+    def __init__(self, model: Type[ModelType], count_ttl: float = 30):
         """
         Initialize with a SQLAlchemy model class.
+        count_ttl is how long count_cached() reuses an exact row count.
         """
         self.model = model
+        self._count_cache: TTLCache[int] = TTLCache(maxsize=1, ttl=count_ttl)
 
     def _raise_not_found_if_empty(self, obj, detail=None, **kwargs):
         """
@@ -45,7 +64,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Create a new object from input schema or dict.
         """
-        logger.debug(f"Creating {self.model.__name__} with data: {obj_in}")
+        logger.debug("Creating %s with fields %s", self.model.__name__, _field_names(obj_in))
         obj_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
         db_obj = self.model(**obj_data)
         db.add(db_obj)
@@ -53,6 +72,154 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db_obj
 
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        objs_in: Iterable[Union[CreateSchemaType, dict[str, Any]]],
+        batch_size: Optional[int] = None,
+    ) -> list[ModelType]:
+        """
+        Inserts many rows with one multi-row INSERT ... RETURNING per batch and
+        returns the created objects in input order.
+        """
+        created = []
+        for batch in self._batches(objs_in, batch_size):
+            logger.debug("Creating %d %s rows", len(batch), self.model.__name__)
+            # Without sort_by_parameter_order, insertmanyvalues may return rows in any order.
+            result = await db.scalars(insert(self.model).returning(self.model, sort_by_parameter_order=True), batch)
+            created.extend(result.all())
+        return created
+
+
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        objs_in: Iterable[Union[CreateSchemaType, dict[str, Any]]],
+        index_elements: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> list[ModelType]:
+        """
+        Postgres INSERT ... ON CONFLICT (index_elements) DO UPDATE ... RETURNING, one
+        statement per batch. update_fields defaults to every supplied column outside the
+        conflict target; an empty list means DO NOTHING, in which case only the rows
+        actually inserted are returned.
+        Rows within one batch must not conflict with each other.
+        """
+        upserted = []
+        for batch in self._batches(objs_in, batch_size):
+            stmt = pg_insert(self.model).values(batch)
+            fields = [k for k in batch[0] if k not in index_elements] if update_fields is None else update_fields
+            if fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={field: stmt.excluded[field] for field in fields},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+            logger.debug("Upserting %d %s rows on %s", len(batch), self.model.__name__, index_elements)
+            result = await db.scalars(
+                stmt.returning(self.model),
+                execution_options={"populate_existing": True},
+            )
+            upserted.extend(result.all())
+        return upserted
+
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        objs_in: Iterable[dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Bulk UPDATE by primary key: every dict carries the primary key column(s) plus the
+        fields to set. Rows of a batch that set the same fields are sent together: on
+        Postgres as one UPDATE ... FROM (VALUES ...), elsewhere as one executemany.
+        Returns the number of rows matched; fewer than were passed in means some keys
+        do not exist.
+        """
+        table = self.model.__table__
+        primary_key = [c.key for c in inspect(self.model).primary_key]
+        # Postgres drivers report no rowcount for executemany; one statement per group does.
+        from_values = db.get_bind().dialect.name == "postgresql"
+        updated = 0
+        for batch in self._batches(objs_in, batch_size):
+            if any(k not in row for row in batch for k in primary_key):
+                raise HTTPException(status_code=400, detail=f"update_many rows need {', '.join(primary_key)}")
+            logger.debug("Updating %d %s rows", len(batch), self.model.__name__)
+
+            groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+            for row in batch:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            for keys, rows in groups.items():
+                fields = [k for k in keys if k not in primary_key]
+                if not fields:
+                    continue
+                if from_values:
+                    data = values(*(column(k, table.c[k].type) for k in keys), name="rows").data(
+                        [tuple(row[k] for k in keys) for row in rows]
+                    )
+                    stmt = update(table).where(*(table.c[k] == data.c[k] for k in primary_key)).values({k: data.c[k] for k in fields})
+                    result = await db.execute(stmt)
+                else:
+                    stmt = update(table).where(*(table.c[k] == bindparam(f"pk_{k}") for k in primary_key))
+                    result = await db.execute(stmt, [
+                        {**{f"pk_{k}": row[k] for k in primary_key}, **{k: row[k] for k in fields}}
+                        for row in rows
+                    ])
+                updated += result.rowcount
+        return updated
+
+
+    async def delete_where(self, db: AsyncSession, *criteria: Any, batch_size: Optional[int] = None, **filters) -> int:
+        """
+        Deletes every row matching the criteria and field filters in one statement.
+        A list/tuple/set filter value becomes IN (...), split into batches if it is long.
+        Refuses to run without any condition. Returns the number of deleted rows.
+        """
+        if not criteria and not filters:
+            raise HTTPException(status_code=400, detail="delete_where needs at least one condition")
+        invalid_fields = [k for k in filters if k not in self.model.__table__.columns]
+        if invalid_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
+
+        columns = self.model.__table__.columns
+        scalar_filters = [columns[k] == v for k, v in filters.items() if not isinstance(v, (list, tuple, set))]
+        list_filters = [(k, list(v)) for k, v in filters.items() if isinstance(v, (list, tuple, set))]
+        conditions = [*criteria, *scalar_filters, *(columns[k].in_(v) for k, v in list_filters[1:])]
+
+        if not list_filters:
+            result = await db.execute(delete(self.model).where(*conditions))
+            return result.rowcount
+
+        name, values = list_filters[0]
+        deleted = 0
+        size = batch_size or self.batch_size
+        for start in range(0, len(values), size):
+            chunk = values[start:start + size]
+            result = await db.execute(delete(self.model).where(columns[name].in_(chunk), *conditions))
+            deleted += result.rowcount
+        logger.debug("Deleted %d %s rows where %s", deleted, self.model.__name__, list(filters))
+        return deleted
+
+
+    def _batches(self, objs_in: Iterable[Union[BaseModel, dict[str, Any]]], batch_size: Optional[int]) -> Iterator[list[dict[str, Any]]]:
+        size = batch_size or self.batch_size
+        batch: list[dict[str, Any]] = []
+        for obj in objs_in:
+            row = obj if isinstance(obj, dict) else obj.model_dump()
+            if not batch:
+                size = max(1, min(size, MAX_BIND_PARAMS // max(1, len(row))))
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
     async def get(
         self, 
         db: AsyncSession, 
@@ -64,7 +231,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         If options are provided, loads related objects (e.g. selectinload()).
         Raises 404 if not found.
         """
-        logger.debug(f"Fetching {self.model.__name__} by primary key id={id} with options={options}")
+        logger.debug("Fetching %s by primary key id=%s with options=%s", self.model.__name__, id, options)
 
         if options:
             stmt = select(self.model).options(*options).filter_by(id=id)
@@ -81,13 +248,96 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Retrieve multiple objects (paginated).
         Returns an empty list if none found.
         """
-        logger.debug(f"Fetching multiple {self.model.__name__} entries: skip={skip}, limit={limit}")
+        logger.debug("Fetching multiple %s entries: skip=%s, limit=%s", self.model.__name__, skip, limit)
         stmt = select(self.model).offset(skip).limit(limit)
         if options:
             stmt = stmt.options(*options)
         result = await db.execute(stmt)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        order_by: Sequence[str] = (),
+        descending: bool = False,
+        options: Optional[list[Any]] = None,
+        where: Sequence[Any] = (),
+        **filters,
+    ) -> tuple[list[ModelType], Optional[str]]:
+        """
+        Keyset pagination: returns up to `limit` objects after `cursor` and the cursor of
+        the next page (None on the last page). Unlike OFFSET, the cost of a page does not
+        grow with its depth.
+        The primary key columns (all of them, for a composite key) are appended to
+        order_by as a tie-breaker, so the order is total; without order_by the page
+        follows the primary key. The leading column must be indexed. `where` takes extra SQL conditions (ranges)
+        next to the equality filters. Raises 400 on an invalid cursor or ordering.
+        """
+        keys = [*order_by, *(c.key for c in self.model.__mapper__.primary_key if c.key not in order_by)]
+        columns = self._order_columns(keys)
+        invalid_fields = [k for k in filters if k not in self.model.__table__.columns]
+        if invalid_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
+        logger.debug("Fetching page of %s: limit=%s, order_by=%s, filters=%s", self.model.__name__, limit, keys, filters)
+
+        stmt = select(self.model).filter_by(**filters).where(*where)
+        if cursor:
+            values = self.decode_cursor(cursor, keys)
+            position = tuple_(*columns)
+            stmt = stmt.where(position < tuple_(*values) if descending else position > tuple_(*values))
+        stmt = stmt.order_by(*(c.desc() if descending else c.asc() for c in columns)).limit(limit + 1)
+        if options:
+            stmt = stmt.options(*options)
+
+        result = await db.execute(stmt)
+        objects = list(result.scalars().all())
+        if len(objects) <= limit:
+            return objects, None
+
+        objects = objects[:limit]
+        return objects, self.encode_cursor(keys, [getattr(objects[-1], k) for k in keys])
+
+
+    def _order_columns(self, keys: list[str]) -> list[Any]:
+        table = self.model.__table__
+        invalid_fields = [k for k in keys if k not in table.columns]
+        if invalid_fields:
+            raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
+
+        leading = table.columns[keys[0]]
+        indexed = leading.primary_key or leading.unique or leading.index or any(
+            index.columns.values()[0] is leading for index in table.indexes
+        )
+        if not indexed:
+            raise HTTPException(status_code=400, detail=f"Cannot paginate {self.model.__name__} by unindexed field {keys[0]}")
+        return [table.columns[k] for k in keys]
+
+
+    @staticmethod
+    def encode_cursor(keys: list[str], values: list[Any]) -> str:
+        """
+        Opaque page token: the ordering keys and the last row's values, as url-safe base64 JSON.
+        """
+        encoded = [{"dt": v.isoformat()} if isinstance(v, (datetime, date)) else v for v in values]
+        raw = json.dumps({"k": keys, "v": encoded}, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+    @staticmethod
+    def decode_cursor(cursor: str, keys: list[str]) -> list[Any]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            data = json.loads(raw)
+            values = data["v"]
+            if data["k"] != keys or len(values) != len(keys):
+                raise ValueError("cursor does not match the ordering")
+            return [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v for v in values]
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
     async def get_objects(self, db: AsyncSession, return_many: bool = False, options: Optional[list[Any]] = None, **kwargs) -> Union[ModelType, list[ModelType]]:
         """
         Universal search for objects by one or more fields.
@@ -99,7 +349,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         invalid_fields = [k for k in kwargs if k not in self.model.__table__.columns]
         if invalid_fields:
             raise HTTPException(status_code=400, detail=f"Invalid field(s): {', '.join(invalid_fields)}")
-        logger.debug(f"Fetching {'all' if return_many else 'one'} {self.model.__name__} by fields: {kwargs}")
+        logger.debug("Fetching %s %s by fields: %s", "all" if return_many else "one", self.model.__name__, kwargs)
 
         stmt = select(self.model).filter_by(**kwargs)
         if options:
@@ -119,7 +369,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Update an existing object with input schema or dict.
         Only fields present in input will be updated.
         """
-        logger.debug(f"Updating {self.model.__name__} with data: {obj_in}")
+        logger.debug("Updating %s fields %s", self.model.__name__, _field_names(obj_in))
         update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
@@ -133,7 +383,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Remove an object by primary key.
         Raises 404 if not found.
         """
-        logger.debug(f"Removing {self.model.__name__} with id: {id}")
+        logger.debug("Removing %s with id: %s", self.model.__name__, id)
         obj = await self.get(db, id)
         await db.delete(obj)
         await db.flush()
@@ -145,7 +395,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Remove a single object by field(s) and value(s).
         Raises 404 if not found or 400 if any field is invalid.
         """
-        logger.debug(f"Removing {self.model.__name__} entry by fields: {kwargs}")
+        logger.debug("Removing %s entry by fields: %s", self.model.__name__, kwargs)
         obj = await self.get_objects(db, **kwargs)
         await db.delete(obj)
         await db.flush()
@@ -155,4 +405,27 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def count(self, db: AsyncSession) -> int:
         stmt = select(func.count()).select_from(self.model)
         result = await db.execute(stmt)
-        return result.scalar_one()
\ No newline at end of file
+        return result.scalar_one()
+
+
+    async def count_cached(self, db: AsyncSession) -> int:
+        """
+        Exact row count, reused for count_ttl seconds.
+        """
+        total = self._count_cache.get("total")
+        if total is None:
+            total = await self.count(db)
+            self._count_cache.set("total", total)
+        return total
+
+
+    async def approximate_count(self, db: AsyncSession) -> Optional[int]:
+        """
+        Row estimate from the planner statistics in pg_class (kept current by autovacuum/ANALYZE).
+        Costs one catalog lookup regardless of table size. Returns None while the table has
+        never been analyzed.
+        """
+        stmt = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+        result = await db.execute(stmt, {"table": self.model.__tablename__})
+        estimate = result.scalar_one_or_none()
+        return estimate if estimate is not None and estimate >= 0 else None
\ No newline at end of file
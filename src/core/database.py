@@ -1,4 +1,6 @@
 import uuid
+import threading
+from typing import Any, Optional
 
 from sqlalchemy import create_engine
 from sqlalchemy.exc import SQLAlchemyError
@@ -8,6 +10,9 @@ from sqlalchemy.orm import sessionmaker
 
 from core.dependencies import get_config
 from core.logger import logger
+from core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from core.metrics import instrument_engine
+from core.query_tracker import install_query_tracking
 
 # --- Инициализация ---
 config = get_config()
@@ -21,25 +26,91 @@ ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg:/
 SYNC_DATABASE_URL = ASYNC_DATABASE_URL.replace("asyncpg", "psycopg2")
 
 # --- Параметры подключения ---
-COMMON_CONNECT_ARGS = {
-    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
-    "statement_cache_size": 0,
-    "prepared_statement_cache_size": 0,
-}
+def async_connect_args(mode: str, statement_cache_size: int = 100) -> dict:
+    """
+    asyncpg settings for the connection profile.
+    pooler: transaction-mode PgBouncer may hand every transaction a different server
+        connection, so prepared statements must neither be cached nor reuse names.
+    direct: a connection always talks to the same backend, so asyncpg keeps parsed
+        and planned statements per connection.
+    """
+    if mode == "pooler":
+        return {
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+        }
+    if mode == "direct":
+        return {
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        }
+    raise RuntimeError(f"Unknown DATABASE_CONNECTION_MODE: {mode}")
 
-DATABASE_KWARGS = dict(echo=False, pool_size=20, max_overflow=30, pool_timeout=60)
+
+COMMON_CONNECT_ARGS = async_connect_args(config.DATABASE_CONNECTION_MODE, config.DATABASE_STATEMENT_CACHE_SIZE)
+
+def pool_settings(role: str, kind: str) -> dict:
+    """
+    Pool size per process role and engine. The API serves requests from the async
+    engine and only needs the sync one for the odd script; Celery workers run one task
+    per process and touch both engines lightly.
+    """
+    if role == "api" and kind == "async":
+        pool_size, max_overflow = config.DATABASE_POOL_SIZE, config.DATABASE_MAX_OVERFLOW
+    elif role == "api" and kind == "sync":
+        pool_size, max_overflow = config.DATABASE_SYNC_POOL_SIZE, config.DATABASE_SYNC_MAX_OVERFLOW
+    elif role == "worker":
+        pool_size, max_overflow = config.WORKER_DATABASE_POOL_SIZE, config.WORKER_DATABASE_MAX_OVERFLOW
+    else:
+        raise RuntimeError(f"Unknown PROCESS_ROLE: {role}")
+    return dict(pool_size=pool_size, max_overflow=max_overflow, pool_timeout=config.DATABASE_POOL_TIMEOUT)
+
+
+DATABASE_KWARGS = dict(
+    echo=False,
+    query_cache_size=config.DATABASE_QUERY_CACHE_SIZE,
+)
 
 # --- Создание движков ---
 engine = create_async_engine(
     ASYNC_DATABASE_URL,
     connect_args=COMMON_CONNECT_ARGS,
+    poolclass=InstrumentedAsyncQueuePool,
+    **pool_settings(config.PROCESS_ROLE, "async"),
     **DATABASE_KWARGS
 )
+instrument_engine(engine.sync_engine, "async")
+install_query_tracking(engine.sync_engine)
 
-sync_engine = create_engine(
-    SYNC_DATABASE_URL,
-    **DATABASE_KWARGS
-)
+# The sync engine is created on first use: API workers never need it, and every
+# engine holds its own pool of Postgres connections.
+_sync_engine = None
+_sync_engine_lock = threading.Lock()
+
+
+def get_sync_engine():
+    global _sync_engine
+    if _sync_engine is None:
+        with _sync_engine_lock:
+            if _sync_engine is None:
+                logger.debug("Creating sync database engine")
+                _sync_engine = create_engine(
+                    SYNC_DATABASE_URL,
+                    poolclass=InstrumentedQueuePool,
+                    **pool_settings(config.PROCESS_ROLE, "sync"),
+                    **DATABASE_KWARGS
+                )
+                instrument_engine(_sync_engine, "sync")
+                install_query_tracking(_sync_engine)
+    return _sync_engine
+
+
+def pool_stats() -> dict[str, Optional[dict[str, Any]]]:
+    return {
+        "async": engine.pool.stats(),
+        "sync": _sync_engine.pool.stats() if _sync_engine is not None else None,
+    }
 
 # --- Сессии ---
 SessionLocal = sessionmaker(
@@ -49,8 +120,8 @@ SessionLocal = sessionmaker(
     autoflush=False
 )
 
+# Bound to the sync engine on first use, see get_db_sync.
 SyncSessionLocal = sessionmaker(
-    bind=sync_engine,
     autocommit=False,
     autoflush=False
 )
@@ -65,7 +136,7 @@ async def init_db():
             await conn.run_sync(Base.metadata.create_all)
         logger.debug("Database initialized")
     except Exception as e:
-        logger.error(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
 
 # --- Асинхронная сессия ---
 async def get_db():
@@ -74,27 +145,29 @@ async def get_db():
             yield session
             await session.commit()
         except SQLAlchemyError as e:
-            logger.error(f"Database error: {e}")
+            logger.error("Database error: %s", e)
             try:
                 await session.rollback()
             except Exception as rollback_exc:
-                logger.warning(f"Error during DB rollback: {rollback_exc}")
+                logger.warning("Error during DB rollback: %s", rollback_exc)
             raise
         finally:
             logger.debug("Async DB session closed.")
 
 # --- Синхронная сессия (например, для Celery) ---
 def get_db_sync():
+    if SyncSessionLocal.kw.get("bind") is None:
+        SyncSessionLocal.configure(bind=get_sync_engine())
     session = SyncSessionLocal()
     try:
         yield session
         session.commit()
     except SQLAlchemyError as e:
-        logger.error(f"Database error: {e}")
+        logger.error("Database error: %s", e)
         try:
             session.rollback()
         except Exception as rollback_exc:
-            logger.warning(f"Error during DB rollback: {rollback_exc}")
+            logger.warning("Error during DB rollback: %s", rollback_exc)
         raise
     finally:
         session.close()
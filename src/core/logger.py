@@ -1,9 +1,32 @@
+import sys
+import copy
+import json
+import queue
+import atexit
 import logging
 import logging.config
+import logging.handlers
+from typing import Optional
 from pathlib import Path
+from functools import lru_cache
 from datetime import datetime, timezone, timedelta
 from core.dependencies import get_config
 
+SRC_DIR = Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=1024)
+def display_path(pathname: str) -> str:
+    """
+    Path of the emitting module relative to src/, resolved once per module.
+    """
+    full_path = Path(pathname).resolve()
+    try:
+        return str(full_path.relative_to(SRC_DIR))
+    except ValueError:
+        return full_path.name
+
+
 class CustomFormatter(logging.Formatter):
     def formatTime(self, record, datefmt=None):
         utc_dt = datetime.fromtimestamp(record.created, tz=timezone.utc)
@@ -16,44 +39,101 @@ class CustomFormatter(logging.Formatter):
         if record.name.startswith("uvicorn"):
             record.custom_filename = "uvicorn"
         else:
-            full_path = Path(record.pathname).resolve()
-            try:
-                relative_path = str(full_path).replace('/src/', '').replace('src/', '')
-                record.custom_filename = relative_path
-            except Exception:
-                record.custom_filename = full_path.name
+            record.custom_filename = display_path(record.pathname)
+        record.level = f"{record.levelname:^7}"
 
-        try:
-            record.levelname = f"{record.levelname:^7}"
-        except Exception:
-            pass
+        # logging.Formatter.format already appends the traceback.
+        return super().format(record)
 
-        s = super().format(record)
 
-        if record.exc_info:
-            exc_text = self.formatException(record.exc_info)
-            s = f"{s}\n{exc_text}"
+class JsonFormatter(CustomFormatter):
+    """
+    One JSON object per line, for log collectors.
+    """
 
-        return s
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "file": "uvicorn" if record.name.startswith("uvicorn") else display_path(record.pathname),
+            "line": record.lineno,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
 
-FORMAT = "[%(asctime)s] [ %(levelname)s ] [%(custom_filename)s] %(message)s"
+FORMAT = "[%(asctime)s] [ %(level)s ] [%(custom_filename)s] %(message)s"
 DATEFMT = "%Y-%m-%d %H:%M:%S"
 
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        """
+        Merges the %-args and renders the traceback in the calling thread (args may be
+        mutated later, tracebacks reference live frames), but leaves the line layout to
+        the listener's formatter, unlike the stdlib version which formats twice.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_exc_formatter = logging.Formatter()
+
+
+def console_handler() -> logging.Handler:
+    """
+    Handler shared by every configured logger. With LOG_QUEUE (default) the calling
+    thread only enqueues the record; formatting and the blocking stdout write happen
+    in a QueueListener thread, so the event loop never waits on the log pipe.
+    """
+    global _listener
+    config = get_config()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if config.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(CustomFormatter(FORMAT, DATEFMT))
+
+    if not config.LOG_QUEUE:
+        return stream_handler
+
+    if _listener is not None:
+        _listener.stop()
+    else:
+        atexit.register(stop_logging)
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    return QueueHandler(log_queue)
+
+
+def stop_logging():
+    """
+    Flushes queued records and stops the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 LOGGING_CONFIG = {
     "version": 1,
     "disable_existing_loggers": False,
-    "formatters": {
-        "default": {
-            "()": CustomFormatter,
-            "format": FORMAT,
-            "datefmt": DATEFMT,
-        },
-    },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "default",
-            "stream": "ext://sys.stdout",
+            "()": console_handler,
         },
     },
     "loggers": {
@@ -0,0 +1,142 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from core.logger import logger
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryTracker:
+    """
+    SQL statements executed on behalf of one request. Statements are grouped by shape
+    (the parameterized SQL text), so the same lazy load fired once per parent row
+    shows up as one shape with a high count.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.closed = False
+
+    def record(self, statement: str, duration: float) -> None:
+        if self.closed:
+            # Work the request handed off (e.g. a shared generation task) outlived it.
+            return
+        self.count += 1
+        self.duration += duration
+        self.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """
+        Shapes executed at least `threshold` times: N+1 candidates, most frequent first.
+        """
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryTracker]] = ContextVar("query_tracker", default=None)
+_budget_override: Optional[int] = None
+
+
+def current_tracker() -> Optional[QueryTracker]:
+    return _current.get()
+
+
+@contextmanager
+def query_budget(max_queries: int):
+    """
+    For tests: every request served inside the block fails with QueryBudgetExceeded
+    if it executes more than max_queries statements (TestClient re-raises it).
+    """
+    global _budget_override
+    previous, _budget_override = _budget_override, max_queries
+    try:
+        yield
+    finally:
+        _budget_override = previous
+
+
+def install_query_tracking(engine: Engine) -> None:
+    """
+    Feeds statements of a (sync) engine into the tracker of the current request.
+    SQLAlchemy runs async sessions' statements in greenlets that share the caller's
+    context, so the ContextVar set by the middleware is visible here.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _current.get() is not None:
+            context._tracker_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        tracker = _current.get()
+        if tracker is not None:
+            started = getattr(context, "_tracker_started", None)
+            tracker.record(statement, time.perf_counter() - started if started else 0.0)
+
+
+class QueryTrackingMiddleware:
+    """
+    Pure ASGI middleware: tracks the SQL of each request, adds a Server-Timing header,
+    logs a per-request summary at DEBUG and warns about repeated statement shapes (N+1).
+    A request over `budget` is logged as a warning: by then the response has been sent,
+    so raising would only reach the server log. Inside query_budget() (tests) it raises
+    QueryBudgetExceeded instead.
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int = 5, budget: Optional[int] = None):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.budget = budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        tracker = QueryTracker()
+        token = _current.set(tracker)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and tracker.count:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", tracker.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            tracker.closed = True
+
+        self._report(scope, tracker)
+
+    def _report(self, scope, tracker: QueryTracker) -> None:
+        if not tracker.count:
+            return
+        method, path = scope["method"], scope["path"]
+        logger.debug("%s %s: %d queries in %.1f ms", method, path, tracker.count, tracker.duration * 1000)
+
+        for shape, n in tracker.repeated(self.n_plus_one_threshold):
+            logger.warning("Possible N+1 in %s %s: %d x %s", method, path, n, shape[:300])
+
+        if _budget_override is not None and tracker.count > _budget_override:
+            raise QueryBudgetExceeded(f"{method} {path} ran {tracker.count} queries, budget is {_budget_override}")
+        if self.budget is not None and tracker.count > self.budget:
+            logger.warning("%s %s ran %d queries, budget is %d", method, path, tracker.count, self.budget)
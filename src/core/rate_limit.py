@@ -0,0 +1,150 @@
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Protocol
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until one more token is available, 0 when allowed
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, capacity: int, rate: float, cost: float = 1) -> tuple[bool, float, float]:
+        """
+        Takes cost tokens from the bucket if possible.
+        Returns (allowed, tokens left, seconds until cost tokens are available).
+        """
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class InMemoryBackend:
+    """
+    Token buckets of a single worker process: one (tokens, timestamp) pair per key,
+    refilled lazily on access. The key table is LRU-bounded; an evicted bucket simply
+    starts full again.
+    """
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, key: str, capacity: int, rate: float, cost: float = 1) -> tuple[bool, float, float]:
+        now = self.clock()
+        tokens, updated_at = self._buckets.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, tokens, 0.0 if allowed else (cost - tokens) / rate
+
+    async def aclose(self) -> None:
+        pass
+
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+class RedisBackend:
+    """
+    Token buckets shared by all workers. The refill-and-take step runs as one Lua
+    script on the Redis clock, so it stays atomic and immune to worker clock skew.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        from redis.asyncio import Redis
+
+        self.redis = Redis.from_url(url)
+        self.prefix = prefix
+        self._script = self.redis.register_script(_TOKEN_BUCKET_LUA)
+
+    async def acquire(self, key: str, capacity: int, rate: float, cost: float = 1) -> tuple[bool, float, float]:
+        allowed, tokens, retry_after = await self._script(keys=[self.prefix + key], args=[capacity, rate, cost])
+        return bool(allowed), float(tokens), float(retry_after)
+
+    async def aclose(self) -> None:
+        await self.redis.aclose()
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter: bursts of up to `limit` requests, refilled at limit/period per second.
+    """
+
+    def __init__(self, backend: RateLimitBackend, limit: int, period: float = 60, scope: str = "default"):
+        self.backend = backend
+        self.limit = limit
+        self.rate = limit / period
+        self.scope = scope
+
+    async def hit(self, identity: str, cost: float = 1) -> RateLimitResult:
+        allowed, tokens, retry_after = await self.backend.acquire(
+            f"{self.scope}:{identity}", self.limit, self.rate, cost,
+        )
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.limit,
+            remaining=int(tokens),
+            retry_after=retry_after,
+        )
+
+    async def aclose(self) -> None:
+        await self.backend.aclose()
+
+
+def create_backend(kind: str, redis_url: Optional[str] = None) -> RateLimitBackend:
+    if kind == "memory":
+        return InMemoryBackend()
+    if kind == "redis":
+        if not redis_url:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requires REDIS_URL")
+        return RedisBackend(redis_url)
+    raise RuntimeError(f"Unknown RATE_LIMIT_BACKEND: {kind}")
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("task", "waiters", "on_release")
+
+    def __init__(self, task: asyncio.Task, on_release: Optional[Callable[[], None]] = None):
+        self.task = task
+        self.waiters = 0
+        self.on_release = on_release
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight task.
+
+    The work runs in its own task rather than in the first caller, so a caller that is
+    cancelled (e.g. its client disconnected) only stops waiting; the shared task is
+    cancelled only when no caller is left waiting on it. An exception raised by the work
+    is delivered to every waiter, and the key is released as soon as the task finishes,
+    so the next call after a failure starts fresh.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        on_release: Optional[Callable[[], None]] = None,
+    ) -> Awaitable[Any]:
+        """
+        Joins the in-flight call for key, starting fn() if there is none.
+        The call is registered synchronously, before the returned awaitable is scheduled.
+        on_release (used only when this starts the call) runs at the moment the key is
+        released, so state kept alongside the call never outlives or predates it.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()), on_release)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._release(key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return self._wait(key, call)
+
+    async def _wait(self, key: Hashable, call: _Call) -> Any:
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.task.cancelled() or call.waiters > 1:
+                raise
+            # Last waiter is gone: nobody needs the result any more.
+            # Forget the call right away so a new caller does not join a dying task.
+            self._release(key, call)
+            call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def _release(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+            if call.on_release is not None:
+                call.on_release()
+        if call.task.done() and not call.task.cancelled():
+            # Mark the exception as retrieved when every waiter went away before it was raised.
+            call.task.exception()
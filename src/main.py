@@ -1,30 +1,55 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from contextlib import asynccontextmanager
 from starlette.middleware.cors import CORSMiddleware
 
 from router import routers
+from routers.metrics_router import router as metrics_router
+from core.metrics import MetricsMiddleware, track_in_flight
+from core.query_tracker import QueryTrackingMiddleware
 from core.dependencies import get_config
-from core.database import engine, init_db
+from core.database import engine, init_db, SessionLocal
+from core.celery_config import check_broker
 from core.logger import logger, setup_logging
+from container import ServiceContainer
 
 setup_logging()
 
 config = get_config() 
 
+async def purge_stale_summaries(container: ServiceContainer):
+    try:
+        async with SessionLocal() as db:
+            await container.summary_cache.invalidate(db, stale_only=True)
+            await db.commit()
+    except Exception as e:
+        logger.error("Error purging stale summaries: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting application")
-    logger.debug(f"Debug mode: {config.DEBUG}")
+    logger.debug("Debug mode: %s", config.DEBUG)
+    check_broker(config)
 
     await init_db()
 
+    container = ServiceContainer(config)
+    app.state.container = container
+    await container.start()
+    await purge_stale_summaries(container)
+
     try:
         yield
     finally:    
+        await container.aclose()
         await engine.dispose()
 
 
-app = FastAPI(debug=get_config().DEBUG, lifespan=lifespan)
+app = FastAPI(
+    debug=get_config().DEBUG,
+    lifespan=lifespan,
+    dependencies=[Depends(track_in_flight)] if config.METRICS_ENABLED else None,
+)
 
 app.include_router(routers)
 
@@ -35,3 +60,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+
+if config.METRICS_ENABLED:
+    app.include_router(metrics_router)
+    app.add_middleware(MetricsMiddleware)
+
+if config.QUERY_TRACKING:
+    app.add_middleware(
+        QueryTrackingMiddleware,
+        n_plus_one_threshold=config.QUERY_N_PLUS_ONE_THRESHOLD,
+        budget=config.QUERY_BUDGET,
+    )
@@ -59,6 +59,38 @@ class Summary(Base):
     material = relationship("Material", back_populates="summary")
 
 
+class SummaryCacheEntry(Base):
+    __tablename__ = "summary_cache"
+
+    key = Column(String(64), primary_key=True)  # sha256(prompt_version + normalized text)
+    prompt_version = Column(String(128), nullable=False)
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_summary_cache_version", "prompt_version"),
+    )
+
+
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    id = Column(String(36), primary_key=True)  # uuid4, returned to the client as job id
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    kind = Column(String(32), nullable=False)  # summary | quiz
+    status = Column(String(16), nullable=False, default="queued")  # queued | running | succeeded | failed
+    progress = Column(Float, nullable=False, default=0)
+    payload = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_gj_user", "user_id"),
+    )
+
+
 class Quiz(Base):
     __tablename__ = "quizzes"
 
@@ -68,7 +100,7 @@ class Quiz(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     material = relationship("Material", back_populates="quiz")
-    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan")
+    questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan", order_by="QuizQuestion.id")
     submissions = relationship("QuizSubmission", back_populates="quiz", cascade="all, delete-orphan")
 
 
@@ -101,6 +133,8 @@ class QuizSubmission(Base):
     quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     score = Column(Integer, nullable=False)
+    score_weighted = Column(Float, nullable=False)  # score minus hint penalties, at least 0
+    brier = Column(Float)  # mean (p - correct)^2 over the answered questions
     total_questions = Column(Integer, nullable=False)
     answers = Column(JSON, nullable=False)
     calibration = Column(JSON)
@@ -146,6 +180,10 @@ class ReviewCard(Base):
     user = relationship("User", back_populates="review_cards")
     material = relationship("Material", back_populates="review_cards")
 
+    __table_args__ = (
+        Index("idx_review_cards_due", "user_id", "next_review_at"),
+    )
+
 
 class ProgressEvent(Base):
     __tablename__ = "progress_events"
@@ -163,3 +201,31 @@ class ProgressEvent(Base):
     __table_args__ = (
         Index("idx_pe_user", "user_id"),
     )
+
+
+class UserStats(Base):
+    """
+    Running totals behind GET /me/overview, kept in step by the write paths
+    (see modules/overview/crud.py) and rebuilt by `python -m modules.overview.commands`.
+    """
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    materials_count = Column(Integer, nullable=False, default=0, server_default="0")
+    quizzes_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    best_score_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class UserQuizBest(Base):
+    __tablename__ = "user_quiz_best"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    quiz_id = Column(Integer, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    best_score = Column(Integer, nullable=False)
+    attempts = Column(Integer, nullable=False, default=1)
+    last_gain = Column(Integer, nullable=False, default=0)  # how much the latest attempt raised best_score
+
+    __table_args__ = (
+        Index("idx_uqb_quiz", "quiz_id"),
+    )
@@ -1,13 +1,60 @@
+import asyncio
+from typing import Optional
+from fastapi import HTTPException
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+
 from core.logger import logger
-from passlib.context import CryptContext 
 
 class PasswordManager:
-    def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    """
+    bcrypt hashing off the event loop. Hashes run in a dedicated thread pool (the bcrypt
+    C extension releases the GIL), and at most max_pending hashes may be queued or running;
+    beyond that callers get 503 instead of piling up behind a login spike.
+    """
+
+    def __init__(self, rounds: int = 12, workers: int = 4, max_pending: int = 64):
+        # min == max == default: hashes made with any other cost factor are flagged for rehash.
+        self.pwd_context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds,
+        )
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self.max_pending = max_pending
+        self.pending = 0
 
     def hash_password(self, password: str) -> str:
-        logger.info(f"GOT PASSWORD: {password}")
         return self.pwd_context.hash(password)
 
     def verify_password(self, password: str, hashed_password: str) -> bool:
-        return self.pwd_context.verify(password, hashed_password)
\ No newline at end of file
+        return self.pwd_context.verify(password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.pwd_context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Verifies the password and, if the stored hash uses an outdated cost factor,
+        also returns a fresh hash to store (otherwise None).
+        """
+        return await self._run(self.pwd_context.verify_and_update, password, hashed_password)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn, *args):
+        if self.pending >= self.max_pending:
+            logger.warning("Password hashing queue full (%s pending)", self.pending)
+            raise HTTPException(status_code=503, detail="Server is busy, try again", headers={"Retry-After": "1"})
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        finally:
+            self.pending -= 1
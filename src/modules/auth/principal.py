@@ -0,0 +1,38 @@
+from typing import Optional
+
+from core.cache import TTLCache
+from .schemas import Principal
+
+_STALE = object()
+
+
+class PrincipalCache:
+    """
+    Per-worker cache of authenticated principals keyed by user id.
+
+    Invalidation leaves a short-lived tombstone instead of just dropping the entry: a request
+    that started loading the user before the change (or reads it before the changing
+    transaction commits) must not put the old snapshot back for a full TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, settle: float = 5.0):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.settle = settle
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        principal = self._cache.get(user_id)
+        return None if principal is _STALE else principal
+
+    def set(self, principal: Principal) -> None:
+        if self._cache.peek(principal.id) is _STALE:
+            return
+        self._cache.set(principal.id, principal)
+
+    def invalidate(self, user_id: int) -> None:
+        self._cache.set(user_id, _STALE, ttl=self.settle)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
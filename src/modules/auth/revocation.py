@@ -0,0 +1,241 @@
+import math
+import time
+import heapq
+import asyncio
+import hashlib
+from typing import Callable, Optional, Protocol
+
+from core.logger import logger
+
+
+class RevocationStore(Protocol):
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        """
+        Marks the token as revoked until its `exp` (unix seconds); afterwards it is forgotten.
+        """
+        ...
+
+    async def is_revoked(self, jti: str) -> bool:
+        ...
+
+    async def start(self) -> None:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class InMemoryRevocationStore:
+    """
+    Revoked jtis of a single worker process. Entries are filed into buckets by expiry
+    time, so expired tokens are dropped a whole bucket at a time and memory stays
+    proportional to the tokens that are still valid.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, clock: Callable[[], float] = time.time):
+        self.bucket_seconds = bucket_seconds
+        self.clock = clock
+        self._expiry: dict[str, float] = {}
+        self._buckets: dict[int, list[str]] = {}
+        self._bucket_heap: list[int] = []
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        now = self.clock()
+        self._purge(now)
+        if expires_at <= now:
+            return
+
+        self._expiry[jti] = max(expires_at, self._expiry.get(jti, 0))
+        # Bucket b holds expiries in ((b - 1) * size, b * size] and is dropped once now >= b * size.
+        bucket = math.ceil(expires_at / self.bucket_seconds)
+        if bucket not in self._buckets:
+            self._buckets[bucket] = []
+            heapq.heappush(self._bucket_heap, bucket)
+        self._buckets[bucket].append(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        now = self.clock()
+        self._purge(now)
+        expires_at = self._expiry.get(jti)
+        return expires_at is not None and expires_at > now
+
+    def _purge(self, now: float) -> None:
+        current = int(now // self.bucket_seconds)
+        while self._bucket_heap and self._bucket_heap[0] <= current:
+            for jti in self._buckets.pop(heapq.heappop(self._bucket_heap)):
+                if self._expiry.get(jti, math.inf) <= now:
+                    del self._expiry[jti]
+
+    async def start(self) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+class SharedRevocationBackend(Protocol):
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        ...
+
+    async def is_revoked(self, jti: str) -> bool:
+        ...
+
+    async def changes_since(self, cursor: float) -> tuple[list[str], float]:
+        """
+        Returns the jtis revoked after `cursor` and the cursor to pass next time.
+        """
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+class RedisRevocationBackend:
+    """
+    Revocations shared by all workers: one key per jti expiring at the token's `exp`,
+    plus a feed of recent revocations (sorted set scored by revocation time) that
+    workers poll to keep their bloom filters current.
+    """
+
+    def __init__(self, url: str, retention: float, prefix: str = "revoked:"):
+        from redis.asyncio import Redis
+
+        self.redis = Redis.from_url(url)
+        self.retention = retention
+        self.prefix = prefix
+        self.feed_key = prefix + "feed"
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        now = time.time()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self.prefix + jti, 1, exat=math.ceil(expires_at))
+            pipe.zadd(self.feed_key, {jti: now})
+            pipe.zremrangebyscore(self.feed_key, "-inf", now - self.retention)
+            await pipe.execute()
+
+    async def is_revoked(self, jti: str) -> bool:
+        return bool(await self.redis.exists(self.prefix + jti))
+
+    async def changes_since(self, cursor: float) -> tuple[list[str], float]:
+        now = time.time()
+        # Overlap by a second so a revocation stamped by a worker with a slightly slow
+        # clock is not skipped; adding a jti to the bloom filter twice is harmless.
+        members = await self.redis.zrangebyscore(self.feed_key, max(cursor - 1, now - self.retention), "+inf")
+        return [m.decode() if isinstance(m, bytes) else m for m in members], now
+
+    async def aclose(self) -> None:
+        await self.redis.aclose()
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class BloomFrontedStore:
+    """
+    Puts a per-worker bloom filter in front of a shared backend, so that checking a token
+    that was never revoked (nearly every refresh) is answered locally. Only bloom hits go
+    to the backend. The filter follows the backend's revocation feed every
+    `sync_interval` seconds and is rebuilt from scratch every `rebuild_interval` seconds,
+    so it does not fill up with expired tokens.
+
+    A token revoked on another worker can still be refreshed here until the next sync.
+    """
+
+    def __init__(
+        self,
+        backend: SharedRevocationBackend,
+        capacity: int,
+        error_rate: float = 0.01,
+        sync_interval: float = 5,
+        rebuild_interval: float = 3600,
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._cursor = 0.0
+        self._rebuilt_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self.remote_lookups = 0
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        await self.backend.revoke(jti, expires_at)
+        self.bloom.add(jti)
+
+    async def is_revoked(self, jti: str) -> bool:
+        if jti not in self.bloom:
+            return False
+        self.remote_lookups += 1
+        return await self.backend.is_revoked(jti)
+
+    async def sync(self) -> None:
+        if time.monotonic() - self._rebuilt_at >= self.rebuild_interval:
+            bloom, cursor = BloomFilter(self.capacity, self.error_rate), 0.0
+            self._rebuilt_at = time.monotonic()
+        else:
+            bloom, cursor = self.bloom, self._cursor
+
+        jtis, self._cursor = await self.backend.changes_since(cursor)
+        for jti in jtis:
+            bloom.add(jti)
+        self.bloom = bloom
+
+    async def _sync_forever(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error("Revocation list sync failed: %s", e)
+            await asyncio.sleep(self.sync_interval)
+
+    async def start(self) -> None:
+        await self.sync()
+        self._task = asyncio.create_task(self._sync_forever())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.backend.aclose()
+
+
+def create_revocation_store(
+    kind: str,
+    redis_url: Optional[str] = None,
+    retention: float = 0,
+    capacity: int = 100_000,
+    sync_interval: float = 5,
+) -> RevocationStore:
+    if kind == "memory":
+        return InMemoryRevocationStore()
+    if kind == "redis":
+        if not redis_url:
+            raise RuntimeError("REVOCATION_BACKEND=redis requires REDIS_URL")
+        return BloomFrontedStore(
+            RedisRevocationBackend(redis_url, retention=retention),
+            capacity=capacity,
+            sync_interval=sync_interval,
+        )
+    raise RuntimeError(f"Unknown REVOCATION_BACKEND: {kind}")
@@ -9,6 +9,21 @@ class TokenResponse(BaseModel):
     token_type: str = "Bearer"
 
 
+class Principal(BaseModel):
+    """
+    Authenticated caller as seen by the routes: a detached snapshot of the user row,
+    safe to share between requests.
+    """
+    model_config = {
+        "from_attributes": True,
+        "frozen": True,
+    }
+
+    id: int
+    email: str
+    role: str
+
+
 class ChangePasswordRequest(BaseModel):
     email: str
 
@@ -2,10 +2,14 @@ from fastapi import HTTPException
 from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from models import User
 from core.logger import logger
 from .jwt_service import JWTService
 from modules.user.schemas import UserCreate
 from modules.user.service import UserService
+from .schemas import Principal
+from .principal import PrincipalCache
+from .revocation import RevocationStore
 from .password_manager import PasswordManager
 
 class AuthService:
@@ -14,29 +18,71 @@ class AuthService:
         jwt_service: JWTService,
         password_manager: PasswordManager,
         user_service: UserService,
+        principal_cache: PrincipalCache,
+        revocation_store: RevocationStore,
+        trust_token_claims: bool = False,
     ):
         self.jwt_service = jwt_service
         self.password_manager = password_manager
         self.user_service = user_service
-        self.revoked_tokens: set[str] = set()
+        self.principal_cache = principal_cache
+        self.revocation_store = revocation_store
+        self.trust_token_claims = trust_token_claims
 
     async def register_user(self, data: UserCreate, db: AsyncSession):
-        await self.user_service.create_user(data, self.password_manager.hash_password(data.password), db)
-        return await self.authenticate_user(data.email, data.password, db)
+        hashed = await self.password_manager.hash(data.password)
+        user = await self.user_service.create_user(data, hashed, db)
+        return self.issue_tokens(user)
 
 
     async def authenticate_user(self, email: str, password: str, db: AsyncSession):
         user = await self.user_service.get_user_by_email(email, db)
 
-        if not self.password_manager.verify_password(password, user.password_hash):
+        valid, new_hash = await self.password_manager.verify_and_update(password, user.password_hash)
+        if not valid:
             raise HTTPException(status_code=400, detail="Incorrect password")
 
+        if new_hash:
+            logger.info("Rehashing password of user id=%s with the current cost factor", user.id)
+            await self.user_service.update_user(user.id, {"password_hash": new_hash}, db)
+
+        return self.issue_tokens(user)
+
+
+    def issue_tokens(self, user: User) -> tuple[str, str]:
         access_token = self.jwt_service.generate_access_token(user)
         refresh_token = self.jwt_service.generate_refresh_token(user)
 
         return access_token, refresh_token
 
 
+    async def resolve_principal(self, payload: dict, db: AsyncSession) -> Principal:
+        """
+        Turns a decoded access token into the calling principal. Claims-only mode trusts
+        the id/role claims; otherwise the user row is read once per cache TTL.
+        """
+        email = payload.get("sub")
+        user_id = payload.get("id")
+        if not email:
+            raise HTTPException(status_code=403, detail="Invalid token payload")
+
+        if user_id is None:
+            # Tokens without an id claim predate it; resolve them the old way, uncached.
+            return Principal.model_validate(await self.user_service.get_user_by_email(email, db))
+
+        if self.trust_token_claims and payload.get("role"):
+            return Principal(id=user_id, email=email, role=payload["role"])
+
+        principal = self.principal_cache.get(user_id)
+        if principal is None:
+            principal = Principal.model_validate(await self.user_service.get_user(user_id, db))
+            self.principal_cache.set(principal)
+
+        if principal.email != email:
+            raise HTTPException(status_code=403, detail="Invalid token payload")
+        return principal
+
+
     async def refresh_token(self, token: str, db: AsyncSession):
         payload = self.jwt_service.decode_token(token)
 
@@ -44,7 +90,7 @@ class AuthService:
             raise HTTPException(status_code=403, detail="Invalid token type")
 
         jti = payload.get("jti")
-        if jti in self.revoked_tokens:
+        if jti and await self.revocation_store.is_revoked(jti):
             raise HTTPException(status_code=403, detail="Refresh token revoked")
 
         email = payload.get("sub")
@@ -62,9 +108,9 @@ class AuthService:
         if not user_id:
             raise HTTPException(status_code=400, detail="Invalid token payload")
         
-        hashed = self.password_manager.hash_password(new_password)
+        hashed = await self.password_manager.hash(new_password)
         user = await self.user_service.update_user(user_id, {"password_hash": hashed}, db)
-        return await self.authenticate_user(user.email, new_password, db)
+        return self.issue_tokens(user)
     
 
     async def logout_user(self, refresh_token: str):
@@ -83,7 +129,7 @@ class AuthService:
 
         ttl = exp_timestamp - int(datetime.now(timezone.utc).timestamp())
         if ttl <= 0:
-            logger.info(f"Refresh token already expired (jti={jti}), skipping revoke.")
+            logger.info("Refresh token already expired (jti=%s), skipping revoke.", jti)
             return
 
-        self.revoked_tokens.add(jti)
\ No newline at end of file
+        await self.revocation_store.revoke(jti, exp_timestamp)
\ No newline at end of file
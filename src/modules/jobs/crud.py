@@ -0,0 +1,7 @@
+from core.crudbase import CRUDBase
+from models import GenerationJob
+from .schemas import JobCreate
+
+
+class GenerationJobDatabase(CRUDBase[GenerationJob, JobCreate, JobCreate]):
+    pass
@@ -0,0 +1,7 @@
+from fastapi import Depends
+
+from container import ServiceContainer, get_container
+from .service import JobService
+
+async def get_job_service(container: ServiceContainer = Depends(get_container)) -> JobService:
+    return container.job_service
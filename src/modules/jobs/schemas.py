@@ -0,0 +1,40 @@
+from enum import Enum
+from typing import Any, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class JobKind(str, Enum):
+    summary = "summary"
+    quiz = "quiz"
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobCreate(BaseModel):
+    id: str
+    user_id: Optional[int] = None
+    kind: JobKind
+    status: JobStatus = JobStatus.queued
+    progress: float = 0
+    payload: dict[str, Any]
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: JobKind
+    status: JobStatus
+    progress: float
+    result: Optional[dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
@@ -0,0 +1,50 @@
+import uuid
+from typing import Any
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import GenerationJob
+from modules.auth.schemas import Principal
+from core.logger import logger
+from services.scheduler.tasks import run_generation_job
+from .crud import GenerationJobDatabase
+from .schemas import JobCreate, JobKind, JobStatus
+
+
+class JobService:
+    def __init__(
+        self,
+        job_database: GenerationJobDatabase,
+    ):
+        self.job_database = job_database
+
+    async def enqueue(self, kind: JobKind, payload: dict[str, Any], user: Principal, db: AsyncSession) -> GenerationJob:
+        job = await self.job_database.create(
+            db,
+            JobCreate(id=str(uuid.uuid4()), user_id=user.id, kind=kind, payload=payload),
+        )
+        job_id = job.id
+        # The worker reads the job through its own connection, so it has to be committed first.
+        await db.commit()
+
+        try:
+            run_generation_job.delay(job_id)
+        except Exception as e:
+            logger.error("Failed to enqueue generation job %s: %s", job_id, e)
+            await self.job_database.update(
+                db,
+                db_obj=await self.job_database.get(db, job_id),
+                obj_in={"status": JobStatus.failed.value, "error": "Job queue unavailable"},
+            )
+            await db.commit()
+            raise HTTPException(status_code=503, detail="Job queue unavailable")
+
+        await db.refresh(job)
+        return job
+
+
+    async def get_job(self, job_id: str, user: Principal, db: AsyncSession) -> GenerationJob:
+        job = await self.job_database.get(db, job_id)
+        if job.user_id != user.id:
+            raise HTTPException(status_code=403, detail="You do not have access to this job")
+        return job
@@ -0,0 +1,46 @@
+from typing import Any, Optional, Union
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crudbase import CRUDBase
+from models import Material
+from modules.overview.crud import UserStatsDatabase
+from .schemas import MaterialCreate
+
+
+class MaterialDatabase(CRUDBase[Material, MaterialCreate, MaterialCreate]):
+    """
+    create and remove keep user_stats in the same transaction. Bulk writes
+    (create_many, delete_where) do not; rebuild the stats after them.
+    """
+
+    def __init__(self, model: type[Material], stats_database: Optional[UserStatsDatabase] = None):
+        super().__init__(model)
+        self.stats_database = stats_database
+
+    async def create(self, db: AsyncSession, obj_in: Union[MaterialCreate, dict[str, Any]]) -> Material:
+        material = await super().create(db, obj_in)
+        if self.stats_database is not None:
+            await self.stats_database.add_materials(db, material.user_id, 1)
+        return material
+
+
+    async def remove(self, db: AsyncSession, id: int) -> Material:
+        if self.stats_database is not None:
+            await self.stats_database.forget_material_quizzes(db, id)
+        material = await super().remove(db, id)
+        if self.stats_database is not None:
+            await self.stats_database.add_materials(db, material.user_id, -1)
+        return material
+
+
+    async def lock(self, db: AsyncSession, id: int) -> Material:
+        """
+        SELECT ... FOR UPDATE on the material: other transactions that lock it (to replace
+        its quiz) wait until this one ends, in every process.
+        """
+        material = (await db.execute(select(self.model).where(self.model.id == id).with_for_update())).scalar_one_or_none()
+        if material is None:
+            raise HTTPException(status_code=404, detail="Material not found")
+        return material
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class MaterialCreate(BaseModel):
+    user_id: int
+    title: str
+    text: str
@@ -1,5 +1,27 @@
+from fastapi import Depends, HTTPException, Response
+
+from modules.auth.schemas import Principal
+from core.rate_limit import RateLimiter
+from container import ServiceContainer, get_container
+from modules.auth.dependencies import get_current_user
 from .service import OpenAIService
-from core.dependencies import get_config
 
-def get_ai_service() -> OpenAIService:
-    return OpenAIService(config=get_config())
\ No newline at end of file
+async def get_ai_service(container: ServiceContainer = Depends(get_container)) -> OpenAIService:
+    return container.ai_service
+
+
+async def get_generation_limiter(container: ServiceContainer = Depends(get_container)) -> RateLimiter:
+    return container.generation_limiter
+
+
+async def generation_rate_limit(
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    limiter: RateLimiter = Depends(get_generation_limiter),
+) -> Principal:
+    result = await limiter.hit(str(current_user.id))
+    if not result.allowed:
+        raise HTTPException(status_code=429, detail="Rate limit exceeded", headers=result.headers)
+
+    response.headers.update(result.headers)
+    return current_user
@@ -0,0 +1,70 @@
+import re
+import json
+import asyncio
+import hashlib
+from typing import AsyncIterator
+
+from .service import SUMMARY_PROMPT
+
+_QUESTION_COUNT = re.compile(r"Количество вопросов: (\d+)")
+
+
+class FakeOpenAIService:
+    """
+    Local stand-in for OpenAIService (AI_PROVIDER=fake) for benchmarks and tests.
+    The "summary" is derived from the prompt and text only, so the same input always
+    gives the same output, and it is streamed in `deltas` pieces spread over `latency`
+    seconds. Quiz prompts get a deterministic, valid quiz. Nothing leaves the process.
+    """
+    prompt_version = "fake-v1"
+
+    def __init__(self, latency: float = 0.0, deltas: int = 8):
+        self.latency = latency
+        self.deltas = max(1, deltas)
+        self.calls = 0
+
+    def render(self, text: str, prompt: str = SUMMARY_PROMPT) -> str:
+        digest = hashlib.sha256(prompt.format(text=text).encode("utf-8")).hexdigest()[:12]
+        words = text.split()
+        head = " ".join(words[:12])
+        return f"Конспект [{digest}]: {head}{' …' if len(words) > 12 else ''}"
+
+    def render_quiz(self, content: str) -> str:
+        match = _QUESTION_COUNT.search(content)
+        count = int(match.group(1)) if match else 5
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:8]
+        questions = [
+            {
+                "question_text": f"Вопрос {i + 1} по материалу [{digest}]?",
+                "options": [f"Вариант {i + 1}.{letter}" for letter in "ABCD"],
+                "correct_index": i % 4,
+                "difficulty": ("easy", "medium", "hard")[i % 3],
+                "tags": [f"тема-{digest[:4]}", f"раздел-{i % 3 + 1}"],
+                "bloom": "understand",
+                "hints": [f"Подсказка {i + 1}.1", f"Подсказка {i + 1}.2"],
+                "rationales": {str(k): f"Пояснение к варианту {k}" for k in range(4)},
+            }
+            for i in range(count)
+        ]
+        return json.dumps({"questions": questions}, ensure_ascii=False)
+
+    async def stream_summary(self, text: str, prompt: str = SUMMARY_PROMPT) -> AsyncIterator[str]:
+        async for delta in self._stream(self.render(text, prompt)):
+            yield delta
+
+    async def stream_completion(self, content: str, operation: str = "custom") -> AsyncIterator[str]:
+        output = self.render_quiz(content) if operation.startswith("quiz") else self.render(content, "{text}")
+        async for delta in self._stream(output):
+            yield delta
+
+    async def _stream(self, output: str) -> AsyncIterator[str]:
+        self.calls += 1
+        step = -(-len(output) // self.deltas)
+        pause = self.latency / self.deltas
+        for start in range(0, len(output), step):
+            if pause:
+                await asyncio.sleep(pause)
+            yield output[start:start + step]
+
+    async def summarize_text(self, text: str) -> str:
+        return "".join([delta async for delta in self.stream_summary(text)]).strip()
@@ -0,0 +1,48 @@
+import asyncio
+import httpx
+from contextlib import asynccontextmanager
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+from core.config import Config
+from core.logger import logger
+
+
+class AIProvider:
+    """
+    Async Azure OpenAI client shared by the whole worker process.
+    Keeps one keep-alive HTTP connection pool and caps how many LLM operations run at once.
+    """
+
+    def __init__(self, config: Config):
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=config.AZURE_OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=config.AZURE_OPENAI_MAX_KEEPALIVE,
+                keepalive_expiry=config.AZURE_OPENAI_KEEPALIVE_EXPIRY,
+            ),
+        )
+        self.client = AsyncAzureOpenAI(
+            api_key=config.AZURE_OPENAI_API_KEY,
+            api_version=config.AZURE_OPENAI_VERSION,
+            azure_endpoint=config.AZURE_OPENAI_ENDPOINT,
+            http_client=self.http_client,
+            timeout=httpx.Timeout(config.AZURE_OPENAI_TIMEOUT, connect=config.AZURE_OPENAI_CONNECT_TIMEOUT),
+            max_retries=config.AZURE_OPENAI_MAX_RETRIES,
+        )
+        self.run_timeout = config.AZURE_OPENAI_RUN_TIMEOUT
+        self.max_concurrency = config.AZURE_OPENAI_MAX_CONCURRENCY
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Waits for a free concurrency slot and bounds the whole operation by run_timeout.
+        Every HTTP call inside additionally gets the per-call client timeout.
+        """
+        async with self._semaphore:
+            async with asyncio.timeout(self.run_timeout):
+                yield self.client
+
+    async def aclose(self):
+        logger.debug("Closing AI provider HTTP pool")
+        await self.client.close()
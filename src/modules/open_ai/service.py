@@ -1,52 +1,91 @@
+import time
 import asyncio
-from core.config import Config
+import hashlib
+from typing import AsyncIterator
+
 from core.logger import logger
+from core.metrics import LLM_DURATION, LLM_REQUESTS, LLM_TOKENS
+from .provider import AIProvider
+
+ASSISTANT_ID = "asst_T5wYIPegTAqwxmf4ZcBrtehK"
+SUMMARY_PROMPT = "Сделай краткий конспект следующего текста:\n\n{text}"
+CHUNK_PROMPT = (
+    "Сделай краткий конспект следующего фрагмента учебного материала. "
+    "Сохрани ключевые определения, факты и формулы:\n\n{text}"
+)
+REDUCE_PROMPT = (
+    "Ниже конспекты последовательных частей одного учебного материала. "
+    "Объедини их в один связный краткий конспект без повторов:\n\n{text}"
+)
+# Cached summaries are keyed by it, so editing any prompt above retires the old entries.
+SUMMARY_PROMPT_VERSION = hashlib.sha256(
+    "\x00".join((SUMMARY_PROMPT, CHUNK_PROMPT, REDUCE_PROMPT)).encode("utf-8")
+).hexdigest()[:16]
+# Metric label per prompt.
+PROMPT_OPERATIONS = {SUMMARY_PROMPT: "summary", CHUNK_PROMPT: "chunk", REDUCE_PROMPT: "reduce"}
 
 
 class OpenAIService:
-    def __init__(self, config: Config):
-        self.client = config.azure_client
-        self.assistant_id = "asst_T5wYIPegTAqwxmf4ZcBrtehK"
+    assistant_id = ASSISTANT_ID
+    prompt_version = f"{SUMMARY_PROMPT_VERSION}:{ASSISTANT_ID}"
+
+    def __init__(self, provider: AIProvider):
+        self.provider = provider
+
+    def stream_summary(self, text: str, prompt: str = SUMMARY_PROMPT) -> AsyncIterator[str]:
+        return self.stream_completion(prompt.format(text=text), PROMPT_OPERATIONS.get(prompt, "custom"))
+
+    async def stream_completion(self, content: str, operation: str = "custom") -> AsyncIterator[str]:
+        """
+        Runs the assistant on a fresh thread in one streamed request and yields text deltas
+        as soon as they arrive. Raises RuntimeError if the run does not complete.
+        """
+        status = "error"
+        started = time.perf_counter()
+        try:
+            async with self.provider.slot() as client:
+                logger.info("Running assistant (stream)...")
+                async with client.beta.threads.create_and_run_stream(
+                    assistant_id=self.assistant_id,
+                    thread={
+                        "messages": [
+                            {"role": "user", "content": content},
+                        ],
+                    },
+                ) as stream:
+                    async for delta in stream.text_deltas:
+                        yield delta
+
+                    run = await stream.get_final_run()
+                    if run.usage is not None:
+                        LLM_TOKENS.labels(operation, "prompt").inc(run.usage.prompt_tokens)
+                        LLM_TOKENS.labels(operation, "completion").inc(run.usage.completion_tokens)
+                    if run.status != "completed":
+                        logger.warning("Run ended with status=%s", run.status)
+                        status = run.status
+                        raise RuntimeError(run.status)
+            status = "ok"
+        except TimeoutError:
+            status = "timeout"
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            status = "cancelled"
+            raise
+        finally:
+            LLM_REQUESTS.labels(operation, status).inc()
+            LLM_DURATION.labels(operation).observe(time.perf_counter() - started)
 
     async def summarize_text(self, text: str) -> str:
         try:
-            logger.info("Creating thread...")
-            thread = self.client.beta.threads.create()
-
-            logger.info("Adding message to thread...")
-            self.client.beta.threads.messages.create(
-                thread_id=thread.id,
-                role="user",
-                content=f"Сделай краткий конспект следующего текста:\n\n{text}",
-            )
-
-            logger.info("Running assistant...")
-            run = self.client.beta.threads.runs.create(
-                thread_id=thread.id,
-                assistant_id=self.assistant_id,
-            )
-
-            while True:
-                run = self.client.beta.threads.runs.retrieve(
-                    thread_id=thread.id,
-                    run_id=run.id,
-                )
-
-                if run.status in ("completed", "failed", "cancelled"):
-                    break
-                await asyncio.sleep(1)
-
-            if run.status != "completed":
-                logger.warning(f"Run ended with status={run.status}")
-                return f"Ошибка: {run.status}"
-
-            messages = self.client.beta.threads.messages.list(thread_id=thread.id)
-            if not messages.data:
+            parts = [delta async for delta in self.stream_summary(text)]
+            text_content = "".join(parts).strip()
+            if not text_content:
                 return "Нет ответа от ассистента."
+            return text_content
 
-            latest = messages.data[0]
-            text_content = latest.content[0].text.value if latest.content else ""
-            return text_content.strip()
+        except TimeoutError:
+            logger.warning("AI summarize_text timed out after %ss", self.provider.run_timeout)
+            return "Ошибка: timeout"
 
         except Exception as e:
             logger.exception("AI summarize_text failed")
@@ -0,0 +1,17 @@
+import json
+from typing import Any, Optional
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """
+    Formats one Server-Sent Event. The payload is JSON-encoded so newlines inside
+    model output never break the event framing.
+    """
+    message = f"event: {event}\n" if event else ""
+    return f"{message}data: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,71 @@
+"""
+Maintenance of the overview stats (user_stats, user_quiz_best).
+
+    cd src && python -m modules.overview.commands rebuild [--user-id N]
+    cd src && python -m modules.overview.commands check [--user-id N] [--limit 20]
+
+rebuild recomputes both tables from quiz_submissions and materials in one transaction;
+run it after bulk imports or deletes that bypass MaterialDatabase/QuizService. A
+submission committed while a full rebuild runs can be lost from the totals, so rebuild
+everyone at a quiet time (or re-run check afterwards).
+check compares user_stats with the full aggregate and exits with status 1 on drift.
+"""
+import sys
+import asyncio
+import argparse
+from typing import Optional
+
+from models import UserStats
+from core.database import SessionLocal, engine
+from .crud import STAT_COLUMNS, UserStatsDatabase
+
+stats_database = UserStatsDatabase(UserStats)
+
+
+async def rebuild(user_id: Optional[int] = None) -> int:
+    async with SessionLocal() as db:
+        written = await stats_database.rebuild(db, user_id)
+        await db.commit()
+    print(f"Rebuilt overview stats for {written} user(s)")
+    return 0
+
+
+async def check(user_id: Optional[int] = None, limit: int = 20) -> int:
+    async with SessionLocal() as db:
+        drift = await stats_database.find_drift(db, user_id, limit)
+    if not drift:
+        print("Overview stats match the submissions and materials")
+        return 0
+
+    print(f"Overview stats differ for {len(drift)}{'+' if len(drift) == limit else ''} user(s):")
+    n = len(STAT_COLUMNS)
+    for row in drift:
+        changes = ", ".join(
+            f"{column} {stored} != {expected}"
+            for column, stored, expected in zip(STAT_COLUMNS, row[1:1 + n], row[1 + n:])
+            if stored != expected
+        )
+        print(f"  user {row[0]}: {changes}")
+    return 1
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or check the overview stats")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = commands.add_parser("rebuild", help="recompute the stats from the full aggregates")
+    rebuild_parser.add_argument("--user-id", type=int)
+    check_parser = commands.add_parser("check", help="compare the stats with the full aggregates")
+    check_parser.add_argument("--user-id", type=int)
+    check_parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "rebuild":
+            return await rebuild(args.user_id)
+        return await check(args.user_id, args.limit)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
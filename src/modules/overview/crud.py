@@ -0,0 +1,171 @@
+from typing import Any, Optional
+from sqlalchemy import delete, func, insert, literal, or_, select, update
+from sqlalchemy.sql import Select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crudbase import CRUDBase
+from models import Material, Quiz, QuizSubmission, User, UserQuizBest, UserStats
+
+STAT_COLUMNS = ("materials_count", "quizzes_completed", "best_score_sum")
+
+
+def best_per_quiz(user_id: Optional[int] = None) -> Select:
+    """
+    The full aggregate user_quiz_best is a running copy of.
+    """
+    stmt = select(
+        QuizSubmission.user_id,
+        QuizSubmission.quiz_id,
+        func.max(QuizSubmission.score).label("best_score"),
+        func.count().label("attempts"),
+    ).group_by(QuizSubmission.user_id, QuizSubmission.quiz_id)
+    if user_id is not None:
+        stmt = stmt.where(QuizSubmission.user_id == user_id)
+    return stmt
+
+
+def stats_per_user(user_id: Optional[int] = None) -> Select:
+    """
+    The full aggregate user_stats is a running copy of: one row per user, zeros included.
+    """
+    best = best_per_quiz(user_id).subquery()
+    quizzes = (
+        select(best.c.user_id, func.count().label("completed"), func.sum(best.c.best_score).label("best_sum"))
+        .group_by(best.c.user_id)
+        .subquery()
+    )
+    materials = select(Material.user_id, func.count().label("materials")).group_by(Material.user_id)
+    if user_id is not None:
+        materials = materials.where(Material.user_id == user_id)
+    materials = materials.subquery()
+
+    stmt = (
+        select(
+            User.id.label("user_id"),
+            func.coalesce(materials.c.materials, 0).label("materials_count"),
+            func.coalesce(quizzes.c.completed, 0).label("quizzes_completed"),
+            func.coalesce(quizzes.c.best_sum, 0).label("best_score_sum"),
+        )
+        .outerjoin(materials, materials.c.user_id == User.id)
+        .outerjoin(quizzes, quizzes.c.user_id == User.id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(User.id == user_id)
+    return stmt
+
+
+class UserStatsDatabase(CRUDBase[UserStats, dict, dict]):
+
+    async def find(self, db: AsyncSession, user_id: int) -> Optional[UserStats]:
+        return await db.get(self.model, user_id)
+
+
+    async def record_attempt(self, db: AsyncSession, user_id: int, quiz_id: int, score: int) -> None:
+        """
+        Folds one submission into user_quiz_best and user_stats with two upserts.
+        The first keeps the best score per quiz and reports how much this attempt raised
+        it; ON CONFLICT locks the row, so concurrent attempts at one quiz are applied one
+        after the other and none of the gains is counted twice.
+        """
+        best = pg_insert(UserQuizBest).values(user_id=user_id, quiz_id=quiz_id, best_score=score, attempts=1, last_gain=score)
+        best = best.on_conflict_do_update(
+            index_elements=["user_id", "quiz_id"],
+            set_={
+                "best_score": func.greatest(UserQuizBest.best_score, best.excluded.best_score),
+                "attempts": UserQuizBest.attempts + 1,
+                "last_gain": func.greatest(best.excluded.best_score - UserQuizBest.best_score, 0),
+            },
+        ).returning(UserQuizBest.attempts, UserQuizBest.last_gain)
+        attempts, gain = (await db.execute(best)).one()
+
+        completed = 1 if attempts == 1 else 0
+        if completed or gain:
+            await self._add(db, user_id, quizzes_completed=completed, best_score_sum=gain)
+
+
+    async def add_materials(self, db: AsyncSession, user_id: int, delta: int) -> None:
+        await self._add(db, user_id, materials_count=delta)
+
+
+    async def forget_material_quizzes(self, db: AsyncSession, material_id: int) -> None:
+        """
+        Takes the best scores of the material's quiz out of every user's totals; call it
+        before the quiz is deleted (its user_quiz_best rows go with it by cascade).
+        """
+        gone = (
+            select(
+                UserQuizBest.user_id,
+                func.count().label("completed"),
+                func.sum(UserQuizBest.best_score).label("best_sum"),
+            )
+            .join(Quiz, Quiz.id == UserQuizBest.quiz_id)
+            .where(Quiz.material_id == material_id)
+            .group_by(UserQuizBest.user_id)
+            .subquery()
+        )
+        await db.execute(
+            update(self.model)
+            .where(self.model.user_id == gone.c.user_id)
+            .values(
+                quizzes_completed=self.model.quizzes_completed - gone.c.completed,
+                best_score_sum=self.model.best_score_sum - gone.c.best_sum,
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+    async def rebuild(self, db: AsyncSession, user_id: Optional[int] = None) -> int:
+        """
+        Recomputes user_quiz_best and user_stats from the full aggregates, for one user
+        or everyone. Returns the number of user_stats rows written.
+        """
+        clear = delete(UserQuizBest)
+        if user_id is not None:
+            clear = clear.where(UserQuizBest.user_id == user_id)
+        await db.execute(clear)
+
+        best = best_per_quiz(user_id).subquery()
+        await db.execute(
+            insert(UserQuizBest).from_select(
+                ["user_id", "quiz_id", "best_score", "attempts", "last_gain"],
+                select(best.c.user_id, best.c.quiz_id, best.c.best_score, best.c.attempts, literal(0)),
+            )
+        )
+
+        stmt = pg_insert(self.model).from_select(["user_id", *STAT_COLUMNS], stats_per_user(user_id))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={**{column: stmt.excluded[column] for column in STAT_COLUMNS}, "updated_at": func.now()},
+        )
+        return (await db.execute(stmt)).rowcount
+
+
+    async def find_drift(self, db: AsyncSession, user_id: Optional[int] = None, limit: int = 20) -> list[Any]:
+        """
+        Users whose stored totals differ from the full aggregate (a missing row counts as
+        zeros): rows of (user_id, stored..., expected...) in STAT_COLUMNS order.
+        """
+        expected = stats_per_user(user_id).subquery()
+        stored = [func.coalesce(getattr(self.model, column), 0) for column in STAT_COLUMNS]
+        stmt = (
+            select(expected.c.user_id, *stored, *(expected.c[column] for column in STAT_COLUMNS))
+            .outerjoin(self.model, self.model.user_id == expected.c.user_id)
+            .where(or_(*(value != expected.c[column] for value, column in zip(stored, STAT_COLUMNS))))
+            .order_by(expected.c.user_id)
+            .limit(limit)
+        )
+        return (await db.execute(stmt)).all()
+
+
+    async def _add(self, db: AsyncSession, user_id: int, **deltas: int) -> None:
+        stmt = pg_insert(self.model).values(user_id=user_id, **deltas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                **{column: getattr(self.model, column) + stmt.excluded[column] for column in deltas},
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
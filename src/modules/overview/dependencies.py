@@ -0,0 +1,7 @@
+from fastapi import Depends
+
+from container import ServiceContainer, get_container
+from .service import OverviewService
+
+async def get_overview_service(container: ServiceContainer = Depends(get_container)) -> OverviewService:
+    return container.overview_service
@@ -0,0 +1,8 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class OverviewResponse(BaseModel):
+    materials: int
+    completed_quizzes: int
+    avg_best_score: Optional[float] = None
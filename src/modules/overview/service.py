@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from modules.auth.schemas import Principal
+from .crud import UserStatsDatabase
+from .schemas import OverviewResponse
+
+
+class OverviewService:
+    def __init__(self, stats_database: UserStatsDatabase):
+        self.stats_database = stats_database
+
+    async def get_overview(self, user: Principal, db: AsyncSession) -> OverviewResponse:
+        """
+        One primary-key read of user_stats; a user without a row has done nothing yet.
+        """
+        stats = await self.stats_database.find(db, user.id)
+        if stats is None:
+            return OverviewResponse(materials=0, completed_quizzes=0)
+        return OverviewResponse(
+            materials=stats.materials_count,
+            completed_quizzes=stats.quizzes_completed,
+            avg_best_score=stats.best_score_sum / stats.quizzes_completed if stats.quizzes_completed else None,
+        )
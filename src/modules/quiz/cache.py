@@ -0,0 +1,179 @@
+import json
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException
+
+from core.cache import TTLCache
+from core.logger import logger
+from .schemas import QuizPublic, QuizQuestionPublic
+from .scoring import AnswerKey
+
+_STALE = object()
+
+
+@dataclass(frozen=True)
+class QuizView:
+    """
+    Everything the read paths need from one quiz, built once from its rows:
+    the public JSON (already serialized, without correct_index, hints or rationales),
+    the answer key for grading and the hints by question id.
+    """
+    quiz_id: int
+    material_id: int
+    owner_id: int
+    public_json: bytes
+    key: AnswerKey
+    hints: dict[int, tuple[str, ...]]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "QuizView":
+        """
+        rows: as returned by QuizDatabase.load_view_rows.
+        """
+        if not rows:
+            raise HTTPException(status_code=404, detail="quiz_not_found")
+
+        first = rows[0]
+        quiz_id = first[11]
+        public = QuizPublic(
+            id=quiz_id,
+            material_id=first[6],
+            question_count=first[12],
+            created_at=first[13],
+            questions=[
+                QuizQuestionPublic(
+                    id=row[0],
+                    question_text=row[3],
+                    options=row[4],
+                    difficulty=row[8],
+                    tags=row[2],
+                    bloom=row[9],
+                )
+                for row in rows
+            ],
+        )
+        return cls(
+            quiz_id=quiz_id,
+            material_id=first[6],
+            owner_id=first[7],
+            public_json=public.model_dump_json().encode(),
+            key=AnswerKey.from_rows(quiz_id, rows),
+            hints={row[0]: tuple(row[10] or ()) for row in rows},
+        )
+
+
+class QuizCache:
+    """
+    Per-worker read-through cache of QuizView, reachable by quiz id and by material id.
+
+    Recreating a quiz (force) replaces it under a new id, so invalidation drops both keys
+    and, like PrincipalCache, leaves short-lived tombstones: a request that read the old
+    rows before the new quiz was committed must not put them back. Other processes
+    hear about a replacement through QuizInvalidations (with REDIS_URL); without it, or
+    for a message lost while disconnected, only the TTL ends a stale entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, settle: float = 5.0):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.settle = settle
+
+    def get(self, quiz_id: int) -> Optional[QuizView]:
+        view = self._cache.get(("quiz", quiz_id))
+        return None if view is _STALE else view
+
+    def get_by_material(self, material_id: int) -> Optional[QuizView]:
+        view = self._cache.get(("material", material_id))
+        return None if view is _STALE else view
+
+    def set(self, view: QuizView) -> None:
+        for key in (("quiz", view.quiz_id), ("material", view.material_id)):
+            if self._cache.peek(key) is not _STALE:
+                self._cache.set(key, view)
+
+    def invalidate(self, material_id: int, quiz_id: Optional[int] = None) -> None:
+        """
+        Drops the material's quiz. quiz_id names a replaced quiz whose material entry
+        may already have been evicted.
+        """
+        cached = self._cache.peek(("material", material_id))
+        stale_ids = {quiz_id, getattr(cached, "quiz_id", None)} - {None}
+        self._cache.set(("material", material_id), _STALE, ttl=self.settle)
+        for stale_id in stale_ids:
+            self._cache.set(("quiz", stale_id), _STALE, ttl=self.settle)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+class QuizInvalidations:
+    """
+    Carries quiz replacements between processes over Redis pub/sub: the process that
+    replaced a quiz (usually a Celery worker) publishes (material_id, quiz_id), and every
+    process that started the listener drops it from its QuizCache. After a lost
+    connection the whole cache is cleared, since messages may have been missed.
+    """
+
+    def __init__(self, redis, cache: QuizCache, channel: str = "quiz:invalidate", retry_interval: float = 1.0):
+        self.redis = redis
+        self.cache = cache
+        self.channel = channel
+        self.retry_interval = retry_interval
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, material_id: int, quiz_id: Optional[int]) -> None:
+        self.cache.invalidate(material_id, quiz_id)
+        try:
+            await self.redis.publish(self.channel, json.dumps([material_id, quiz_id]))
+        except Exception as e:
+            logger.error("Publishing quiz invalidation for material %s failed: %s", material_id, e)
+
+    async def _subscribe(self):
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        return pubsub
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = await self._subscribe()
+                async for message in self._pubsub.listen():
+                    if message["type"] == "message":
+                        self.cache.invalidate(*json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Quiz invalidation listener failed: %s", e)
+            self._pubsub = None
+            self.cache.clear()
+            await asyncio.sleep(self.retry_interval)
+
+    async def start(self) -> None:
+        """
+        Subscribes before returning, so no replacement published afterwards is missed.
+        """
+        self._pubsub = await self._subscribe()
+        self._task = asyncio.create_task(self._listen())
+
+    async def aclose(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.redis.aclose()
+
+
+def create_quiz_invalidations(redis_url: Optional[str], cache: QuizCache) -> Optional[QuizInvalidations]:
+    if not redis_url:
+        return None
+    from redis.asyncio import Redis
+
+    return QuizInvalidations(Redis.from_url(redis_url), cache)
@@ -0,0 +1,106 @@
+from typing import Any, Optional
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crudbase import CRUDBase
+from models import Material, Quiz, QuizQuestion, QuizSubmission, UserSkillMastery
+
+
+class QuizDatabase(CRUDBase[Quiz, dict, dict]):
+
+    async def find_by_material(self, db: AsyncSession, material_id: int, lock: bool = False) -> Optional[Quiz]:
+        stmt = select(self.model).filter_by(material_id=material_id)
+        if lock:
+            stmt = stmt.with_for_update()
+        return await db.scalar(stmt)
+
+
+    async def lock_key(self, db: AsyncSession, quiz_id: int) -> bool:
+        """
+        SELECT ... FOR KEY SHARE on the quiz: False if it is gone, otherwise it cannot be
+        deleted before this transaction ends (find_by_material with lock waits for it).
+        """
+        stmt = select(self.model.id).where(self.model.id == quiz_id).with_for_update(key_share=True)
+        return await db.scalar(stmt) is not None
+
+
+    async def load_view_rows(
+        self,
+        db: AsyncSession,
+        quiz_id: Optional[int] = None,
+        material_id: Optional[int] = None,
+    ) -> list[Any]:
+        """
+        One row per question of the quiz (picked by id or by material), ordered by id:
+        the grading columns and the owner first, as AnswerKey.from_rows expects, then
+        what the public projection and the hint lookup need. See QuizView.from_rows.
+        """
+        stmt = (
+            select(
+                QuizQuestion.id,
+                QuizQuestion.correct_index,
+                QuizQuestion.tags,
+                QuizQuestion.question_text,
+                QuizQuestion.options,
+                QuizQuestion.rationales,
+                Quiz.material_id,
+                Material.user_id,
+                QuizQuestion.difficulty,
+                QuizQuestion.bloom,
+                QuizQuestion.hints,
+                Quiz.id,
+                Quiz.question_count,
+                Quiz.created_at,
+            )
+            .join(Quiz, Quiz.id == QuizQuestion.quiz_id)
+            .join(Material, Material.id == Quiz.material_id)
+            .order_by(QuizQuestion.id)
+        )
+        if quiz_id is not None:
+            stmt = stmt.where(QuizQuestion.quiz_id == quiz_id)
+        else:
+            stmt = stmt.where(Quiz.material_id == material_id)
+        return (await db.execute(stmt)).all()
+
+
+class QuizQuestionDatabase(CRUDBase[QuizQuestion, dict, dict]):
+    pass
+
+
+class QuizSubmissionDatabase(CRUDBase[QuizSubmission, dict, dict]):
+    pass
+
+
+class MasteryDatabase(CRUDBase[UserSkillMastery, dict, dict]):
+
+    async def apply_ema(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        accuracy: dict[str, float],
+        alpha: float,
+        prior: float = 0.5,
+    ) -> dict[str, float]:
+        """
+        mastery <- (1 - alpha) * mastery + alpha * accuracy for every tag, in one upsert.
+        A new row starts from `prior`. The update reads the current value inside the
+        statement, so concurrent submissions cannot overwrite each other's step.
+        Returns the new mastery per tag.
+        """
+        if not accuracy:
+            return {}
+
+        keep = 1 - alpha
+        stmt = pg_insert(self.model).values([
+            {"user_id": user_id, "tag": tag, "mastery": keep * prior + alpha * value}
+            for tag, value in accuracy.items()
+        ])
+        # excluded.mastery carries keep * prior + alpha * accuracy; take alpha * accuracy back out.
+        step = stmt.excluded.mastery - keep * prior
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.model.user_id, self.model.tag],
+            set_={"mastery": func.least(1.0, func.greatest(0.0, keep * self.model.mastery + step))},
+        ).returning(self.model.tag, self.model.mastery)
+
+        return {tag: mastery for tag, mastery in (await db.execute(stmt)).all()}
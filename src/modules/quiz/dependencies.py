@@ -0,0 +1,7 @@
+from fastapi import Depends
+
+from container import ServiceContainer, get_container
+from .service import QuizService
+
+async def get_quiz_service(container: ServiceContainer = Depends(get_container)) -> QuizService:
+    return container.quiz_service
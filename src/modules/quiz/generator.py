@@ -0,0 +1,153 @@
+import json
+from contextlib import aclosing
+from typing import Callable, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from core.logger import logger
+from modules.open_ai.service import OpenAIService
+from .parser import JSONItemStream
+from .schemas import QuestionDraft
+
+QUESTION_FORMAT = (
+    '{"question_text": "...", "options": ["...", "...", "...", "..."], "correct_index": 0, '
+    '"difficulty": "easy|medium|hard", "tags": ["..."], '
+    '"bloom": "remember|understand|apply|analyze|evaluate|create", '
+    '"hints": ["...", "..."], "rationales": {"0": "...", "1": "...", "2": "...", "3": "..."}}'
+)
+QUIZ_RULES = (
+    "Ровно 4 разных варианта ответа, один правильный (correct_index от 0 до 3); 1–3 тега; "
+    "не больше 2 подсказок, от общей к конкретной; rationales объясняют каждый вариант."
+)
+QUIZ_PROMPT = (
+    "Составь тест с выбором ответа по учебному материалу ниже.\n"
+    "Количество вопросов: {count}\n"
+    "Ответь только JSON без пояснений и без markdown: {{\"questions\": [вопрос, ...]}}, где каждый вопрос:\n"
+    "{question_format}\n{rules}\n\nМатериал:\n{text}"
+)
+QUIZ_REPAIR_PROMPT = (
+    "Часть вопросов теста не прошла проверку.\n"
+    "Количество вопросов: {count}\n"
+    "Ответь только JSON без пояснений и без markdown: {{\"questions\": [вопрос, ...]}}, где каждый вопрос:\n"
+    "{question_format}\n{rules}\n\n"
+    "Исправь эти вопросы (ошибка указана перед каждым):\n{rejected}"
+)
+QUIZ_EXTRA_PROMPT = (
+    "\n\nНедостающие вопросы составь заново по материалу, не повторяя уже готовые:\n{existing}\n\nМатериал:\n{text}"
+)
+# A rejected question is quoted back at most this long in the repair prompt.
+MAX_REJECTED_CHARS = 1500
+TRUNCATED = "truncated"
+
+
+def parse_question(raw: str) -> tuple[Optional[QuestionDraft], Optional[str]]:
+    """
+    Decodes and validates one question object; returns (question, None) or (None, error).
+    """
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as e:
+        return None, f"invalid JSON: {e.msg}"
+    try:
+        return QuestionDraft.model_validate(data), None
+    except ValidationError as e:
+        return None, "; ".join(f"{'.'.join(map(str, err['loc'])) or 'question'}: {err['msg']}" for err in e.errors())
+
+
+def question_key(question: QuestionDraft) -> str:
+    return " ".join(question.question_text.casefold().split())
+
+
+class QuizGenerator:
+    """
+    Generates a whole quiz in one streamed call. Each question is decoded and validated as
+    soon as its object is complete in the stream, so problems are known when the stream
+    ends, without a second pass over the document. Only the questions that failed, were
+    cut off or never came are asked for again, in a follow-up call per repair round that
+    quotes the failed objects and includes the material only if new questions are needed.
+    """
+
+    def __init__(self, ai_service: OpenAIService, repair_rounds: int = 1):
+        self.ai_service = ai_service
+        self.repair_rounds = repair_rounds
+
+    async def generate(
+        self,
+        text: str,
+        count: int,
+        on_question: Optional[Callable[[int], None]] = None,
+    ) -> list[QuestionDraft]:
+        """
+        Returns up to `count` valid, distinct questions; on_question gets the number
+        accepted so far. Raises 422 llm_invalid_json if not a single question is valid.
+        """
+        accepted: list[QuestionDraft] = []
+        seen: set[str] = set()
+
+        prompt = QUIZ_PROMPT.format(count=count, question_format=QUESTION_FORMAT, rules=QUIZ_RULES, text=text)
+        rejected = await self._collect(prompt, "quiz", count, accepted, seen, on_question)
+
+        for round_no in range(1, self.repair_rounds + 1):
+            missing = count - len(accepted)
+            if missing <= 0:
+                break
+            logger.info("Quiz repair round %d: %d question(s) missing, %d rejected", round_no, missing, len(rejected))
+            prompt = self._repair_prompt(text, missing, rejected, accepted)
+            rejected = await self._collect(prompt, "quiz_repair", missing, accepted, seen, on_question)
+
+        if not accepted:
+            raise HTTPException(status_code=422, detail="llm_invalid_json")
+        if len(accepted) < count:
+            logger.warning("Quiz generation returned %d of %d questions", len(accepted), count)
+        return accepted
+
+    async def _collect(
+        self,
+        prompt: str,
+        operation: str,
+        limit: int,
+        accepted: list[QuestionDraft],
+        seen: set[str],
+        on_question: Optional[Callable[[int], None]],
+    ) -> list[tuple[str, str]]:
+        """
+        Streams one call, appending valid new questions to `accepted` (at most `limit`)
+        and returning the rejected ones as (raw text, error). The stream is closed as
+        soon as the limit is reached, so extra questions are not paid for.
+        """
+        target = len(accepted) + limit
+        rejected: list[tuple[str, str]] = []
+        parser = JSONItemStream()
+
+        async with aclosing(self.ai_service.stream_completion(prompt, operation)) as stream:
+            async for delta in stream:
+                for raw in parser.feed(delta):
+                    question, error = parse_question(raw)
+                    if question is not None and question_key(question) in seen:
+                        question, error = None, "duplicate of another question"
+                    if question is None:
+                        rejected.append((raw, error))
+                        continue
+                    accepted.append(question)
+                    seen.add(question_key(question))
+                    if on_question is not None:
+                        on_question(len(accepted))
+                    if len(accepted) >= target:
+                        break
+                if len(accepted) >= target:
+                    break
+
+        tail = parser.close()
+        if tail is not None and len(accepted) < target:
+            rejected.append((tail, TRUNCATED))
+        return rejected
+
+    def _repair_prompt(self, text: str, missing: int, rejected: list[tuple[str, str]], accepted: list[QuestionDraft]) -> str:
+        # A cut-off question has lost its content, so it is written anew like a missing one.
+        fixable = [(raw, error) for raw, error in rejected if error != TRUNCATED][:missing]
+        quoted = "\n".join(f"- {error}\n  {raw[:MAX_REJECTED_CHARS]}" for raw, error in fixable) or "-"
+        prompt = QUIZ_REPAIR_PROMPT.format(count=missing, question_format=QUESTION_FORMAT, rules=QUIZ_RULES, rejected=quoted)
+        if missing > len(fixable):
+            existing = "\n".join(f"- {question.question_text}" for question in accepted) or "-"
+            prompt += QUIZ_EXTRA_PROMPT.format(existing=existing, text=text)
+        return prompt
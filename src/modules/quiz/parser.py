@@ -0,0 +1,66 @@
+from typing import Optional
+
+
+class JSONItemStream:
+    """
+    Incremental scanner for a streamed JSON document that carries one array of objects,
+    either bare ([{...}, ...]) or as a top-level field ({"questions": [{...}, ...]}).
+    feed() returns the raw text of every array item that completed within the chunk, so
+    each item can be decoded and validated while the rest is still being generated.
+
+    Only structure is tracked here (nesting, strings, escapes); decoding is left to
+    json.loads on each item. Text before the document, such as a markdown fence, is
+    skipped, and everything after the array is closed is ignored.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.items_depth: Optional[int] = None
+        self.done = False
+        self._in_string = False
+        self._escape = False
+        self._parts: Optional[list[str]] = None  # text of the item being read, None outside items
+
+    def feed(self, chunk: str) -> list[str]:
+        items = []
+        start = 0 if self._parts is not None else None
+
+        for i, char in enumerate(chunk):
+            if self.done:
+                break
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if self.depth:
+                    self._in_string = True
+            elif char in "{[":
+                self.depth += 1
+                if char == "[" and self.items_depth is None and self.depth <= 2:
+                    self.items_depth = self.depth
+                elif char == "{" and self.items_depth is not None and self.depth == self.items_depth + 1:
+                    self._parts, start = [], i
+            elif char in "}]" and self.depth:
+                self.depth -= 1
+                if self._parts is not None and self.depth == self.items_depth:
+                    self._parts.append(chunk[start:i + 1])
+                    items.append("".join(self._parts))
+                    self._parts, start = None, None
+                elif self.items_depth is not None and self.depth < self.items_depth:
+                    self.done = True
+
+        if self._parts is not None:
+            self._parts.append(chunk[start:])
+        return items
+
+    def close(self) -> Optional[str]:
+        """
+        Text of an item cut off by the end of the stream, if any.
+        """
+        tail, self._parts = self._parts, None
+        return "".join(tail) if tail else None
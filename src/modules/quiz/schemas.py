@@ -0,0 +1,171 @@
+from enum import Enum
+from typing import Any, Literal, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+OPTION_COUNT = 4
+
+
+class Difficulty(str, Enum):
+    easy = "easy"
+    medium = "medium"
+    hard = "hard"
+
+
+class Bloom(str, Enum):
+    remember = "remember"
+    understand = "understand"
+    apply = "apply"
+    analyze = "analyze"
+    evaluate = "evaluate"
+    create = "create"
+
+
+class Confidence(str, Enum):
+    low = "low"
+    med = "med"
+    high = "high"
+
+
+class QuestionDraft(BaseModel):
+    """
+    One generated question, validated before it is stored as a QuizQuestion row.
+    """
+    model_config = {"str_strip_whitespace": True}
+
+    question_text: str = Field(min_length=5, max_length=2000)
+    options: list[str] = Field(min_length=OPTION_COUNT, max_length=OPTION_COUNT)
+    correct_index: int = Field(ge=0, lt=OPTION_COUNT)
+    difficulty: Difficulty = Difficulty.medium
+    tags: list[str] = Field(min_length=1, max_length=5)
+    bloom: Bloom = Bloom.understand
+    hints: list[str] = Field(default_factory=list, max_length=2)
+    rationales: dict[str, str] = Field(default_factory=dict)
+
+    @field_validator("options")
+    @classmethod
+    def options_distinct(cls, options: list[str]) -> list[str]:
+        if any(not option for option in options):
+            raise ValueError("options must not be empty")
+        if len({option.casefold() for option in options}) != len(options):
+            raise ValueError("options must be distinct")
+        return options
+
+    @field_validator("tags")
+    @classmethod
+    def normalize_tags(cls, tags: list[str]) -> list[str]:
+        normalized = list(dict.fromkeys(tag.lower() for tag in tags if tag))
+        if not normalized:
+            raise ValueError("at least one tag is required")
+        return normalized
+
+    @field_validator("hints")
+    @classmethod
+    def hints_not_empty(cls, hints: list[str]) -> list[str]:
+        if any(not hint for hint in hints):
+            raise ValueError("hints must not be empty")
+        return hints
+
+    @field_validator("rationales", mode="before")
+    @classmethod
+    def rationales_by_index(cls, rationales: Any) -> Any:
+        # Models sometimes answer with a list, one rationale per option.
+        if isinstance(rationales, list):
+            return {str(i): rationale for i, rationale in enumerate(rationales)}
+        return rationales
+
+    @model_validator(mode="after")
+    def rationale_keys(self) -> "QuestionDraft":
+        unknown = set(self.rationales) - {str(i) for i in range(OPTION_COUNT)}
+        if unknown:
+            raise ValueError(f"rationales refer to unknown options: {', '.join(sorted(unknown))}")
+        return self
+
+
+class QuizGenerateRequest(BaseModel):
+    material_id: int
+    num_questions: int = Field(5, ge=1, le=30)
+
+
+class QuizQuestionPublic(BaseModel):
+    """
+    A question as shown to the student: no correct answer, hints or rationales.
+    """
+    id: int
+    question_text: str
+    options: list[str]
+    difficulty: str
+    tags: list[str]
+    bloom: str
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class QuizPublic(BaseModel):
+    id: int
+    material_id: int
+    question_count: int
+    created_at: datetime
+    questions: list[QuizQuestionPublic]
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class HintRequest(BaseModel):
+    level: Literal[1, 2]
+
+
+class HintResponse(BaseModel):
+    question_id: int
+    level: int
+    hint: str
+    penalty: float
+
+
+class AnswerSubmit(BaseModel):
+    question_id: int
+    answer_index: int = Field(ge=0, lt=OPTION_COUNT)
+    confidence: Confidence = Confidence.med
+    hints_used: list[Literal[1, 2]] = Field(default_factory=list, max_length=2)
+    time_ms: Optional[int] = Field(None, ge=0)
+
+    @field_validator("hints_used")
+    @classmethod
+    def unique_levels(cls, levels: list[int]) -> list[int]:
+        # The penalty is per unique hint level.
+        return sorted(set(levels))
+
+
+class SubmitRequest(BaseModel):
+    answers: list[AnswerSubmit] = Field(min_length=1, max_length=200)
+
+
+class QuestionResult(BaseModel):
+    question_id: int
+    answer_index: int
+    correct_index: int
+    correct: bool
+    explanation: Optional[str] = None
+
+
+class TagMastery(BaseModel):
+    tag: str
+    accuracy: float
+    mastery: float
+
+
+class SubmitResponse(BaseModel):
+    submission_id: int
+    score: int
+    total_questions: int
+    penalty: float
+    score_weighted: float
+    brier: Optional[float] = None
+    calibration: dict[str, dict[str, float]]
+    results: list[QuestionResult]
+    mastery: list[TagMastery]
+    review_cards: int
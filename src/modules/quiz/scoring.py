@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+from fastapi import HTTPException
+
+from .schemas import AnswerSubmit, Confidence
+
+# Scoring rules (README, Core Rules).
+HINT_PENALTY = 0.25
+CONFIDENCE_LEVELS = (Confidence.low, Confidence.med, Confidence.high)
+CONFIDENCE_P = np.array([0.55, 0.70, 0.85])
+_LEVEL_INDEX = {level: i for i, level in enumerate(CONFIDENCE_LEVELS)}
+_LEVEL_P = CONFIDENCE_P.tolist()
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """
+    Everything needed to grade a quiz, as arrays aligned by question row (ascending id).
+    tag_matrix[i, j] is 1.0 if question i carries tag_names[j].
+    """
+    quiz_id: int
+    material_id: int
+    owner_id: int
+    question_ids: np.ndarray
+    correct: np.ndarray
+    tag_names: tuple[str, ...]
+    tag_matrix: np.ndarray
+    tags: tuple[tuple[str, ...], ...]
+    question_texts: tuple[str, ...]
+    options: tuple[tuple[str, ...], ...]
+    rationales: tuple[dict[str, str], ...]
+
+    @classmethod
+    def from_rows(cls, quiz_id: int, rows: Sequence[Any]) -> "AnswerKey":
+        """
+        rows: (id, correct_index, tags, question_text, options, rationales, material_id, owner_id, ...)
+        ordered by id, as returned by QuizDatabase.load_view_rows.
+        """
+        if not rows:
+            raise HTTPException(status_code=404, detail="quiz_not_found")
+
+        tag_names = tuple(sorted({tag for row in rows for tag in row[2]}))
+        tag_column = {tag: j for j, tag in enumerate(tag_names)}
+        tag_matrix = np.zeros((len(rows), len(tag_names)))
+        for i, row in enumerate(rows):
+            tag_matrix[i, [tag_column[tag] for tag in row[2]]] = 1.0
+
+        return cls(
+            quiz_id=quiz_id,
+            material_id=rows[0][6],
+            owner_id=rows[0][7],
+            question_ids=np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)),
+            correct=np.fromiter((row[1] for row in rows), dtype=np.int16, count=len(rows)),
+            tag_names=tag_names,
+            tag_matrix=tag_matrix,
+            tags=tuple(tuple(row[2]) for row in rows),
+            question_texts=tuple(row[3] for row in rows),
+            options=tuple(tuple(row[4]) for row in rows),
+            rationales=tuple(row[5] or {} for row in rows),
+        )
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+
+@dataclass(frozen=True)
+class ScoreResult:
+    rows: np.ndarray            # answer key row of each submitted answer
+    chosen: np.ndarray
+    is_correct: np.ndarray
+    score: int
+    penalty: float
+    score_weighted: float
+    brier: Optional[float]
+    calibration: dict[str, dict[str, float]]
+    tag_accuracy: dict[str, float]
+
+
+def score(key: AnswerKey, answers: Sequence[AnswerSubmit]) -> ScoreResult:
+    """
+    Grades one submission in a single vectorized pass. Questions left out count as
+    wrong for the score and are skipped for calibration and mastery.
+    """
+    n = len(answers)
+    # One pass over the pydantic objects; everything after it works on arrays.
+    table = np.array(
+        [(a.question_id, a.answer_index, _LEVEL_INDEX[a.confidence], len(a.hints_used)) for a in answers],
+        dtype=np.int64,
+    ).reshape(n, 4)
+    ids, chosen, levels, hint_levels = table.T
+
+    rows = np.searchsorted(key.question_ids, ids)
+    if n and (rows.max() >= len(key) or not np.array_equal(key.question_ids[rows], ids)):
+        raise HTTPException(status_code=400, detail="Answer refers to a question outside this quiz")
+    if n and np.bincount(rows).max() > 1:
+        raise HTTPException(status_code=400, detail="Each question may be answered once")
+
+    is_correct = chosen == key.correct[rows]
+    hits = is_correct.astype(np.float64)
+    score_ = int(hits.sum())
+    penalty = HINT_PENALTY * int(hint_levels.sum())
+
+    errors = CONFIDENCE_P[levels] - hits
+    brier = float(errors @ errors) / n if n else None
+    level_counts = np.bincount(levels, minlength=len(CONFIDENCE_LEVELS)).tolist()
+    level_hits = np.bincount(levels, weights=hits, minlength=len(CONFIDENCE_LEVELS)).tolist()
+    calibration = {
+        level.value: {"count": level_counts[i], "accuracy": level_hits[i] / level_counts[i], "p": _LEVEL_P[i]}
+        for i, level in enumerate(CONFIDENCE_LEVELS) if level_counts[i]
+    }
+
+    tags = key.tag_matrix[rows]
+    tag_counts = tags.sum(axis=0).tolist()
+    tag_hits = (hits @ tags).tolist()
+    tag_accuracy = {name: tag_hits[j] / tag_counts[j] for j, name in enumerate(key.tag_names) if tag_counts[j]}
+
+    return ScoreResult(
+        rows=rows,
+        chosen=chosen,
+        is_correct=is_correct,
+        score=score_,
+        penalty=penalty,
+        score_weighted=max(0.0, score_ - penalty),
+        brier=brier,
+        calibration=calibration,
+        tag_accuracy=tag_accuracy,
+    )
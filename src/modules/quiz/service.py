@@ -0,0 +1,236 @@
+from typing import Callable, NoReturn, Optional
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Material
+from core.database import SessionLocal
+from core.logger import logger
+from core.singleflight import SingleFlight
+from modules.auth.schemas import Principal
+from modules.material.crud import MaterialDatabase
+from modules.overview.crud import UserStatsDatabase
+from modules.review.crud import ReviewCardDatabase
+from .cache import QuizCache, QuizInvalidations, QuizView
+from .crud import MasteryDatabase, QuizDatabase, QuizQuestionDatabase, QuizSubmissionDatabase
+from .generator import QuizGenerator
+from .schemas import HintResponse, QuestionResult, SubmitRequest, SubmitResponse, TagMastery
+from .scoring import HINT_PENALTY, score
+
+# A wrong answer comes back for review like an "again" grade.
+FIRST_REVIEW_DELAY = timedelta(hours=8)
+
+
+class QuizService:
+    def __init__(
+        self,
+        generator: QuizGenerator,
+        quiz_database: QuizDatabase,
+        question_database: QuizQuestionDatabase,
+        material_database: MaterialDatabase,
+        submission_database: QuizSubmissionDatabase,
+        mastery_database: MasteryDatabase,
+        review_database: ReviewCardDatabase,
+        stats_database: UserStatsDatabase,
+        cache: QuizCache,
+        mastery_alpha: float = 0.3,
+        invalidations: Optional[QuizInvalidations] = None,
+    ):
+        self.generator = generator
+        self.quiz_database = quiz_database
+        self.question_database = question_database
+        self.material_database = material_database
+        self.submission_database = submission_database
+        self.mastery_database = mastery_database
+        self.review_database = review_database
+        self.stats_database = stats_database
+        self.cache = cache
+        self.mastery_alpha = mastery_alpha
+        self.invalidations = invalidations
+        self.flights = SingleFlight()
+
+    async def generate_quiz(
+        self,
+        material_id: int,
+        count: int,
+        force: bool = False,
+        on_question: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Creates the material's quiz if it has none (or recreates it with force) and returns
+        its id; run by the quiz generation job. Concurrent calls for one material share a
+        single generation, which reports accepted questions to the first caller's on_question.
+        """
+        return await self.flights.do(
+            (material_id, force), lambda: self._generate(material_id, count, force, on_question)
+        )
+
+
+    async def get_material_quiz(self, material_id: int, user: Principal, db: AsyncSession) -> QuizView:
+        view = self.cache.get_by_material(material_id)
+        if view is None:
+            rows = await self.quiz_database.load_view_rows(db, material_id=material_id)
+            if not rows:
+                # Tell a missing or foreign material apart from one without a quiz.
+                await self.get_owned_material(material_id, user, db)
+            view = QuizView.from_rows(rows)
+            self.cache.set(view)
+        if view.owner_id != user.id:
+            raise HTTPException(status_code=403, detail="You do not have access to this material")
+        return view
+
+
+    async def get_view(self, quiz_id: int, db: AsyncSession) -> QuizView:
+        """
+        The cached projection of the quiz; on a miss it is built from a single SELECT.
+        """
+        view = self.cache.get(quiz_id)
+        if view is None:
+            view = QuizView.from_rows(await self.quiz_database.load_view_rows(db, quiz_id=quiz_id))
+            self.cache.set(view)
+        return view
+
+
+    async def get_owned_view(self, quiz_id: int, user: Principal, db: AsyncSession) -> QuizView:
+        view = await self.get_view(quiz_id, db)
+        if view.owner_id != user.id:
+            raise HTTPException(status_code=403, detail="You do not have access to this quiz")
+        return view
+
+
+    async def get_hint(self, quiz_id: int, question_id: int, level: int, user: Principal, db: AsyncSession) -> HintResponse:
+        view = await self.get_owned_view(quiz_id, user, db)
+        hints = view.hints.get(question_id)
+        if hints is None:
+            raise HTTPException(status_code=404, detail="question_not_found")
+        if level > len(hints):
+            raise HTTPException(status_code=404, detail="hint_not_available")
+        return HintResponse(question_id=question_id, level=level, hint=hints[level - 1], penalty=HINT_PENALTY)
+
+
+    async def get_owned_material(self, material_id: int, user: Principal, db: AsyncSession) -> Material:
+        material = await self.material_database.get(db, material_id)
+        if material.user_id != user.id:
+            raise HTTPException(status_code=403, detail="You do not have access to this material")
+        return material
+
+
+    async def submit(self, quiz_id: int, data: SubmitRequest, user: Principal, db: AsyncSession) -> SubmitResponse:
+        """
+        Grades a submission and records it: the answer key comes from the quiz cache
+        (one SELECT on a miss), then the submission, the overview stats, the mastery
+        upsert and the review cards for wrong answers are written with one statement
+        per table, committed together.
+        The cached view may belong to a quiz that another process has since replaced, so
+        the quiz row is key-share locked first: it cannot be deleted until the commit (no
+        foreign key error on the inserts), and a quiz already gone answers 409 quiz_replaced
+        and drops the stale view.
+        """
+        key = (await self.get_owned_view(quiz_id, user, db)).key
+
+        result = score(key, data.answers)
+        if not await self.quiz_database.lock_key(db, quiz_id):
+            await self._quiz_replaced(key.material_id, quiz_id, db)
+        submission = await self.submission_database.create(db, {
+            "quiz_id": quiz_id,
+            "user_id": user.id,
+            "score": result.score,
+            "score_weighted": result.score_weighted,
+            "brier": result.brier,
+            "total_questions": len(key),
+            "answers": [answer.model_dump(mode="json") for answer in data.answers],
+            "calibration": result.calibration,
+        })
+        submission_id = submission.id
+        await self.stats_database.record_attempt(db, user.id, quiz_id, result.score)
+
+        mastery = await self.mastery_database.apply_ema(db, user.id, result.tag_accuracy, self.mastery_alpha)
+
+        next_review_at = datetime.now(timezone.utc) + FIRST_REVIEW_DELAY
+        wrong = result.rows[~result.is_correct].tolist()
+        if wrong:
+            await self.review_database.create_many(db, [
+                {
+                    "user_id": user.id,
+                    "material_id": key.material_id,
+                    "tag": key.tags[row][0] if key.tags[row] else None,
+                    "prompt": key.question_texts[row],
+                    "answer": key.options[row][key.correct[row]],
+                    "next_review_at": next_review_at,
+                }
+                for row in wrong
+            ])
+        await db.commit()
+
+        return SubmitResponse(
+            submission_id=submission_id,
+            score=result.score,
+            total_questions=len(key),
+            penalty=result.penalty,
+            score_weighted=result.score_weighted,
+            brier=result.brier,
+            calibration=result.calibration,
+            results=[
+                QuestionResult(
+                    question_id=int(key.question_ids[row]),
+                    answer_index=int(chosen),
+                    correct_index=int(key.correct[row]),
+                    correct=bool(correct),
+                    explanation=key.rationales[row].get(str(chosen)),
+                )
+                for row, chosen, correct in zip(result.rows.tolist(), result.chosen.tolist(), result.is_correct.tolist())
+            ],
+            mastery=[
+                TagMastery(tag=tag, accuracy=accuracy, mastery=mastery[tag])
+                for tag, accuracy in result.tag_accuracy.items()
+            ],
+            review_cards=len(wrong),
+        )
+
+
+    async def _quiz_replaced(self, material_id: int, quiz_id: int, db: AsyncSession) -> NoReturn:
+        await db.rollback()
+        self.cache.invalidate(material_id, quiz_id)
+        raise HTTPException(status_code=409, detail="quiz_replaced")
+
+
+    async def _generate(
+        self, material_id: int, count: int, force: bool, on_question: Optional[Callable[[int], None]]
+    ) -> int:
+        async with SessionLocal() as db:
+            material = await self.material_database.get(db, material_id)
+            text = material.text
+            quiz = None if force else await self.quiz_database.find_by_material(db, material_id)
+        if quiz is not None:
+            return quiz.id
+
+        questions = await self.generator.generate(text, count, on_question=on_question)
+
+        # The old quiz (if any) is replaced only once the new questions are ready, under the
+        # material's row lock, so a replacement from another process cannot interleave.
+        async with SessionLocal() as db:
+            await self.material_database.lock(db, material_id)
+            # Waits for submissions in flight, so forget_material_quizzes sees their scores.
+            quiz = await self.quiz_database.find_by_material(db, material_id, lock=True)
+            if quiz is not None and not force:
+                # Created by another process while the questions were generated.
+                return quiz.id
+            old_quiz_id = quiz.id if quiz is not None else None
+
+            await self.stats_database.forget_material_quizzes(db, material_id)
+            await self.quiz_database.delete_where(db, material_id=material_id)
+            quiz = await self.quiz_database.create(db, {"material_id": material_id, "question_count": len(questions)})
+            await self.question_database.create_many(
+                db,
+                [{"quiz_id": quiz.id, **question.model_dump(mode="json")} for question in questions],
+            )
+            await db.commit()
+            quiz_id = quiz.id
+        # Runs in a Celery worker: the API processes' caches are told through Redis.
+        if self.invalidations is not None:
+            await self.invalidations.publish(material_id, old_quiz_id)
+        else:
+            self.cache.invalidate(material_id, old_quiz_id)
+
+        logger.info("Generated quiz id=%s for material id=%s with %d questions", quiz_id, material_id, len(questions))
+        return quiz_id
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import DateTime, Integer, func, update, values, column
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crudbase import CRUDBase
+from models import ReviewCard
+
+# The due queue walks idx_review_cards_due (user_id, next_review_at); id breaks ties.
+DUE_ORDER = ("user_id", "next_review_at", "id")
+
+
+class ReviewCardDatabase(CRUDBase[ReviewCard, dict, dict]):
+
+    async def get_due_page(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        now: datetime,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[ReviewCard], Optional[str]]:
+        """
+        The user's cards due by `now`, oldest first, keyset paginated.
+        """
+        return await self.get_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            order_by=DUE_ORDER,
+            where=[self.model.next_review_at <= now],
+            user_id=user_id,
+        )
+
+
+    async def reschedule(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        schedule: list[tuple[int, datetime, int]],
+    ) -> list[Any]:
+        """
+        Moves several cards in one UPDATE ... FROM (VALUES ...).
+        schedule: (card_id, next_review_at, ease step); ease stays within 1..3.
+        Cards that do not exist or belong to someone else are left alone and missing
+        from the returned (id, next_review_at, ease) rows.
+        """
+        grades = values(
+            column("card_id", Integer),
+            column("due", DateTime(timezone=True)),
+            column("step", Integer),
+            name="grades",
+        ).data(schedule)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == grades.c.card_id, self.model.user_id == user_id)
+            .values(
+                next_review_at=grades.c.due,
+                ease=func.least(3, func.greatest(1, self.model.ease + grades.c.step)),
+            )
+            .returning(self.model.id, self.model.next_review_at, self.model.ease)
+            .execution_options(synchronize_session=False)
+        )
+        return (await db.execute(stmt)).all()
@@ -0,0 +1,7 @@
+from fastapi import Depends
+
+from container import ServiceContainer, get_container
+from .service import ReviewService
+
+async def get_review_service(container: ServiceContainer = Depends(get_container)) -> ReviewService:
+    return container.review_service
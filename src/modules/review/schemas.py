@@ -0,0 +1,50 @@
+from enum import Enum
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+
+
+class ReviewGrade(str, Enum):
+    again = "again"
+    good = "good"
+    easy = "easy"
+
+
+class ReviewCardPublic(BaseModel):
+    id: int
+    material_id: int
+    tag: Optional[str] = None
+    prompt: str
+    answer: str
+    next_review_at: datetime
+    ease: int
+
+    model_config = {
+        "from_attributes": True
+    }
+
+
+class GradeRequest(BaseModel):
+    grade: ReviewGrade
+
+
+class CardGrade(BaseModel):
+    card_id: int
+    grade: ReviewGrade
+
+
+class BulkGradeRequest(BaseModel):
+    grades: list[CardGrade] = Field(min_length=1, max_length=100)
+
+    @field_validator("grades")
+    @classmethod
+    def cards_distinct(cls, grades: list[CardGrade]) -> list[CardGrade]:
+        if len({g.card_id for g in grades}) != len(grades):
+            raise ValueError("each card may be graded once per request")
+        return grades
+
+
+class GradeResult(BaseModel):
+    id: int
+    next_review_at: datetime
+    ease: int
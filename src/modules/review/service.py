@@ -0,0 +1,54 @@
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import ReviewCard
+from modules.auth.schemas import Principal
+from .crud import ReviewCardDatabase
+from .schemas import CardGrade, GradeResult, ReviewGrade
+
+# README, Core Rules: again +8h, good +2d, easy +5d; ease moves within 1..3.
+INTERVALS = {
+    ReviewGrade.again: timedelta(hours=8),
+    ReviewGrade.good: timedelta(days=2),
+    ReviewGrade.easy: timedelta(days=5),
+}
+EASE_STEP = {ReviewGrade.again: -1, ReviewGrade.good: 0, ReviewGrade.easy: 1}
+
+
+class ReviewService:
+    def __init__(self, review_database: ReviewCardDatabase):
+        self.review_database = review_database
+
+    async def get_due(
+        self,
+        user: Principal,
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[ReviewCard], Optional[str]]:
+        return await self.review_database.get_due_page(db, user.id, datetime.now(timezone.utc), limit, cursor)
+
+
+    async def grade(self, grades: list[CardGrade], user: Principal, db: AsyncSession) -> list[GradeResult]:
+        """
+        Reschedules all graded cards with a single UPDATE. Nothing is changed unless
+        every card exists and belongs to the user.
+        """
+        now = datetime.now(timezone.utc)
+        rows = await self.review_database.reschedule(
+            db,
+            user.id,
+            [(g.card_id, now + INTERVALS[g.grade], EASE_STEP[g.grade]) for g in grades],
+        )
+        if len(rows) != len(grades):
+            await db.rollback()
+            raise HTTPException(status_code=404, detail="review_card_not_found")
+        await db.commit()
+
+        order = {g.card_id: i for i, g in enumerate(grades)}
+        return sorted(
+            (GradeResult(id=card_id, next_review_at=next_review_at, ease=ease) for card_id, next_review_at, ease in rows),
+            key=lambda result: order[result.id],
+        )
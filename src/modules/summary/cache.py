@@ -0,0 +1,110 @@
+import re
+import hashlib
+import unicodedata
+from typing import Optional
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.logger import logger
+from .crud import SummaryCacheDatabase
+from .schemas import SummaryCacheCreate, SummaryCacheStats
+
+_SPACES = re.compile(r"[ \t\f\v\u00a0]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a material used for cache keys: NFC, unified newlines,
+    collapsed horizontal whitespace and at most one blank line between paragraphs.
+    """
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def make_cache_key(text: str, prompt_version: str) -> str:
+    payload = f"{prompt_version}\x00{normalize_text(text)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """
+    Two-tier summary cache: an in-process LRU/TTL tier in front of the summary_cache table.
+    Both tiers are keyed by make_cache_key, so a new prompt version never sees old entries.
+    Partial (map step) summaries live in a separate memory-only cache, so the stats
+    reflect lookups of full summaries only.
+    """
+
+    def __init__(self, database: SummaryCacheDatabase, prompt_version: str, maxsize: int, ttl: float):
+        self.database = database
+        self.prompt_version = prompt_version
+        self.memory: TTLCache[str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.chunks: TTLCache[str] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.db_hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        return make_cache_key(text, self.prompt_version)
+
+    def get_chunk(self, chunk: str) -> Optional[str]:
+        return self.chunks.get(make_cache_key(chunk, self.prompt_version))
+
+    def set_chunk(self, chunk: str, summary: str) -> None:
+        self.chunks.set(make_cache_key(chunk, self.prompt_version), summary)
+
+    async def get(self, key: str, db: AsyncSession) -> Optional[str]:
+        summary = self.memory.get(key)
+        if summary is not None:
+            return summary
+        return self._remember(key, await self.database.find(db, key))
+
+    def get_sync(self, key: str, db: Session) -> Optional[str]:
+        """
+        Same lookup for Celery workers, which work through SyncSessionLocal.
+        """
+        summary = self.memory.get(key)
+        if summary is not None:
+            return summary
+        return self._remember(key, self.database.find_sync(db, key))
+
+    async def set(self, key: str, summary: str, db: AsyncSession) -> None:
+        self.memory.set(key, summary)
+        await self.database.upsert(db, self._entry(key, summary))
+
+    def set_sync(self, key: str, summary: str, db: Session) -> None:
+        self.memory.set(key, summary)
+        self.database.upsert_sync(db, self._entry(key, summary))
+
+    async def invalidate(self, db: AsyncSession, stale_only: bool = False) -> int:
+        """
+        Drops the memory tier and chunk summaries and deletes persisted entries.
+        With stale_only=True only rows written under another prompt version are deleted.
+        """
+        self.memory.clear()
+        self.chunks.clear()
+        removed = await self.database.remove_all(db, keep_version=self.prompt_version if stale_only else None)
+        logger.info("Summary cache invalidated: removed=%s stale_only=%s", removed, stale_only)
+        return removed
+
+    def _remember(self, key: str, entry) -> Optional[str]:
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.db_hits += 1
+        self.memory.set(key, entry.summary)
+        return entry.summary
+
+    def _entry(self, key: str, summary: str) -> SummaryCacheCreate:
+        return SummaryCacheCreate(key=key, prompt_version=self.prompt_version, summary=summary)
+
+    def stats(self) -> SummaryCacheStats:
+        return SummaryCacheStats(
+            prompt_version=self.prompt_version,
+            memory_size=len(self.memory),
+            memory_hits=self.memory.hits,
+            db_hits=self.db_hits,
+            misses=self.misses,
+        )
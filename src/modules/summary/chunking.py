@@ -0,0 +1,71 @@
+import re
+import math
+
+# Conservative for Cyrillic text, which the GPT-4o tokenizer splits into short pieces.
+CHARS_PER_TOKEN = 3
+
+_PARAGRAPHS = re.compile(r"\n\s*\n")
+_SENTENCES = re.compile(r"(?<=[.!?…])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_text(text: str, max_tokens: int) -> list[str]:
+    """
+    Splits text into chunks of at most max_tokens (estimated), cutting on paragraph
+    boundaries first, then on sentence boundaries, and only as a last resort on words.
+    Neighbouring pieces are packed greedily, so chunks stay close to the budget.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    # (piece, separator to the previous piece): sentences of one paragraph stay on one line.
+    pieces: list[tuple[str, str]] = []
+    for paragraph in _PARAGRAPHS.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append((paragraph, "\n\n"))
+            continue
+        separator = "\n\n"
+        for sentence in _SENTENCES.split(paragraph):
+            for part in _split_long(sentence, max_chars):
+                pieces.append((part, separator))
+                separator = " "
+
+    chunks: list[str] = []
+    current = ""
+    for piece, separator in pieces:
+        candidate = f"{current}{separator}{piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_long(sentence: str, max_chars: int) -> list[str]:
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    parts, current = [], ""
+    for word in sentence.split():
+        while len(word) > max_chars:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(word[:max_chars])
+            word = word[max_chars:]
+        candidate = f"{current} {word}" if current else word
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            parts.append(current)
+            current = word
+    if current:
+        parts.append(current)
+    return parts
@@ -0,0 +1,54 @@
+from typing import Optional
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.crudbase import CRUDBase
+from models import SummaryCacheEntry
+from .schemas import SummaryCacheCreate
+
+
+class SummaryCacheDatabase(CRUDBase[SummaryCacheEntry, SummaryCacheCreate, SummaryCacheCreate]):
+
+    async def find(self, db: AsyncSession, key: str) -> Optional[SummaryCacheEntry]:
+        """
+        Primary-key lookup that returns None instead of raising 404.
+        """
+        return await db.get(self.model, key)
+
+
+    def find_sync(self, db: Session, key: str) -> Optional[SummaryCacheEntry]:
+        return db.get(self.model, key)
+
+
+    async def upsert(self, db: AsyncSession, obj_in: SummaryCacheCreate) -> None:
+        await db.execute(self._upsert_stmt(obj_in))
+
+
+    def upsert_sync(self, db: Session, obj_in: SummaryCacheCreate) -> None:
+        db.execute(self._upsert_stmt(obj_in))
+
+
+    def _upsert_stmt(self, obj_in: SummaryCacheCreate):
+        stmt = insert(self.model).values(**obj_in.model_dump())
+        return stmt.on_conflict_do_update(
+            index_elements=[self.model.key],
+            set_={
+                "summary": stmt.excluded.summary,
+                "prompt_version": stmt.excluded.prompt_version,
+                "created_at": func.now(),
+            },
+        )
+
+
+    async def remove_all(self, db: AsyncSession, keep_version: Optional[str] = None) -> int:
+        """
+        Deletes cached summaries, optionally keeping the rows of one prompt version.
+        Returns the number of deleted rows.
+        """
+        stmt = delete(self.model)
+        if keep_version is not None:
+            stmt = stmt.where(self.model.prompt_version != keep_version)
+        result = await db.execute(stmt)
+        return result.rowcount
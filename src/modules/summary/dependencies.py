@@ -0,0 +1,12 @@
+from fastapi import Depends
+
+from container import ServiceContainer, get_container
+from .cache import SummaryCache
+from .service import SummaryService
+
+async def get_summary_cache(container: ServiceContainer = Depends(get_container)) -> SummaryCache:
+    return container.summary_cache
+
+
+async def get_summary_service(container: ServiceContainer = Depends(get_container)) -> SummaryService:
+    return container.summary_service
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class SummaryCacheCreate(BaseModel):
+    key: str
+    prompt_version: str
+    summary: str
+
+
+class SummaryCacheStats(BaseModel):
+    prompt_version: str
+    memory_size: int
+    memory_hits: int
+    db_hits: int
+    misses: int
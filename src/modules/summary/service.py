@@ -0,0 +1,194 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import SessionLocal
+from core.logger import logger
+from core.singleflight import SingleFlight
+from modules.open_ai.service import OpenAIService, SUMMARY_PROMPT, CHUNK_PROMPT, REDUCE_PROMPT
+from .cache import SummaryCache
+from .chunking import estimate_tokens, split_text
+
+
+class _DeltaBuffer:
+    """
+    Deltas produced by one in-flight generation, replayed to every subscriber.
+    """
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self._waiters: list[asyncio.Future] = []
+
+    def append(self, delta: str) -> None:
+        self.parts.append(delta)
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    def changed(self) -> asyncio.Future:
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        return waiter
+
+
+class SummaryService:
+    def __init__(
+        self,
+        ai_service: OpenAIService,
+        cache: SummaryCache,
+        chunk_threshold_tokens: int,
+        chunk_tokens: int,
+        chunk_concurrency: int,
+    ):
+        self.ai_service = ai_service
+        self.cache = cache
+        self.chunk_threshold_tokens = chunk_threshold_tokens
+        self.chunk_tokens = chunk_tokens
+        self.chunk_concurrency = chunk_concurrency
+        self.flights = SingleFlight()
+        self._buffers: dict[str, _DeltaBuffer] = {}
+
+    async def summarize(self, text: str, db: AsyncSession) -> str:
+        key = self.cache.key(text)
+        cached = await self.cache.get(key, db)
+        if cached is not None:
+            return cached
+
+        try:
+            flight, _ = self._join(key, text)
+            return await flight
+        except TimeoutError:
+            raise HTTPException(status_code=500, detail="Ошибка: timeout")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Ошибка: {e}")
+
+
+    async def stream(self, text: str) -> AsyncIterator[str]:
+        """
+        Yields the cached summary in one piece, or the deltas of the shared in-flight
+        generation for this text (starting it if needed). A subscriber that joins late
+        first receives everything produced so far.
+        """
+        key = self.cache.key(text)
+        async with SessionLocal() as db:
+            cached = await self.cache.get(key, db)
+        if cached is not None:
+            yield cached
+            return
+
+        flight, buffer = self._join(key, text)
+        result = asyncio.ensure_future(flight)
+        sent = 0
+        try:
+            while True:
+                while sent < len(buffer.parts):
+                    yield buffer.parts[sent]
+                    sent += 1
+                if result.done():
+                    break
+                await asyncio.wait([result, buffer.changed()], return_when=asyncio.FIRST_COMPLETED)
+            result.result()
+        finally:
+            # Stops waiting on the shared flight; it is cancelled only if nobody else waits.
+            result.cancel()
+
+
+    def _join(self, key: str, text: str) -> tuple[Awaitable[str], _DeltaBuffer]:
+        """
+        The shared flight for key and its delta buffer. The buffer is dropped by the
+        flight's own release, so a caller that still finds the flight finds its buffer.
+        """
+        if key not in self.flights:
+            self._buffers[key] = _DeltaBuffer()
+        buffer = self._buffers[key]
+        flight = self.flights.do(
+            key,
+            lambda: self._generate(key, text, buffer),
+            on_release=lambda: self._buffers.pop(key, None),
+        )
+        return flight, buffer
+
+
+    async def generate(
+        self,
+        text: str,
+        on_delta: Optional[Callable[[str], None]] = None,
+        on_progress: Optional[Callable[[float], None]] = None,
+    ) -> str:
+        """
+        Runs the assistant without touching the persistent cache.
+        Long texts are map-reduced: chunks are summarized concurrently, then merged by a
+        streamed reduce pass. on_delta receives the deltas of the final pass and
+        on_progress the share of chunks done.
+        """
+        if estimate_tokens(text) > self.chunk_threshold_tokens:
+            chunks = split_text(text, self.chunk_tokens)
+            if len(chunks) > 1:
+                partials = await self._map_chunks(chunks, on_progress)
+                return await self._complete("\n\n".join(partials), REDUCE_PROMPT, on_delta)
+
+        return await self._complete(text, SUMMARY_PROMPT, on_delta)
+
+
+    async def _complete(self, text: str, prompt: str, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        parts = []
+        async for delta in self.ai_service.stream_summary(text, prompt=prompt):
+            parts.append(delta)
+            if on_delta is not None:
+                on_delta(delta)
+
+        summary = "".join(parts).strip()
+        if not summary:
+            raise RuntimeError("Нет ответа от ассистента.")
+        return summary
+
+
+    async def _map_chunks(self, chunks: list[str], on_progress: Optional[Callable[[float], None]]) -> list[str]:
+        """
+        Summarizes chunks under a bounded semaphore. Each finished chunk is cached right
+        away, so retrying after a partial failure only re-runs the chunks that failed.
+        """
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+        done = 0
+
+        async def summarize_chunk(chunk: str) -> str:
+            nonlocal done
+            summary = self.cache.get_chunk(chunk)
+            if summary is None:
+                async with semaphore:
+                    summary = await self._complete(chunk, CHUNK_PROMPT)
+                self.cache.set_chunk(chunk, summary)
+
+            done += 1
+            if on_progress is not None:
+                on_progress(done / len(chunks))
+            return summary
+
+        results = await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        failed = [result for result in results if isinstance(result, BaseException)]
+        if failed:
+            logger.warning("Summary map step: %s of %s chunks failed", len(failed), len(chunks))
+            raise RuntimeError(f"{len(failed)} of {len(chunks)} chunks failed: {failed[0]}") from failed[0]
+        return results
+
+
+    async def _generate(self, key: str, text: str, buffer: _DeltaBuffer) -> str:
+        """
+        The single LLM run shared by all concurrent callers with the same key.
+        Caches through its own session, since it may outlive the request that started it.
+        """
+        try:
+            summary = await self.generate(text, on_delta=buffer.append)
+
+            async with SessionLocal() as db:
+                await self.cache.set(key, summary, db)
+                await db.commit()
+            return summary
+
+        except Exception:
+            logger.exception("Summary generation failed")
+            raise
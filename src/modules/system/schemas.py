@@ -0,0 +1,20 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_total: float
+    wait_max: float
+
+
+class DatabasePoolStats(BaseModel):
+    role: str
+    async_pool: PoolStats
+    sync_pool: Optional[PoolStats] = None  # None until the process first uses the sync engine
@@ -1,7 +1,66 @@
+from typing import Any, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from core.crudbase import CRUDBase
 from models import User
 from .schemas import UserCreate, UserUpdate
 
+IMPORT_STAGING_COLUMNS = ["row_no", "email", "phone_number", "first_name", "last_name", "password_hash"]
+
+_CREATE_STAGING = text("""
+    CREATE TEMP TABLE user_import_staging (
+        row_no integer PRIMARY KEY,
+        email varchar(255) NOT NULL,
+        phone_number varchar(32),
+        first_name varchar(100),
+        last_name varchar(100),
+        password_hash varchar(255) NOT NULL
+    ) ON COMMIT DROP
+""")
+
+# One statement per batch: insert every staged row that fits, then report per row.
+# The outer SELECT sees the users table as it was before the INSERT, so *_taken
+# tells why a row was skipped; rows that were neither inserted nor taken lost a
+# race with a concurrent registration.
+_MERGE_STAGING = text("""
+    WITH inserted AS (
+        INSERT INTO users (email, phone_number, first_name, last_name, password_hash, role, company_id)
+        SELECT email, phone_number, first_name, last_name, password_hash, 'user', CAST(:company_id AS integer)
+        FROM user_import_staging
+        ORDER BY row_no
+        ON CONFLICT DO NOTHING
+        RETURNING id, email
+    )
+    SELECT
+        s.row_no,
+        i.id,
+        EXISTS (SELECT 1 FROM users u WHERE u.email = s.email) AS email_taken,
+        s.phone_number IS NOT NULL AND EXISTS (SELECT 1 FROM users u WHERE u.phone_number = s.phone_number) AS phone_taken
+    FROM user_import_staging s
+    LEFT JOIN inserted i ON i.email = s.email
+    ORDER BY s.row_no
+""")
+
 
 class UserDatabase(CRUDBase[User, UserCreate, UserUpdate]):
-    pass
+
+    async def import_batch(self, db: AsyncSession, rows: list[tuple[Any, ...]], company_id: Optional[int] = None) -> list[tuple[int, int, bool, bool]]:
+        """
+        Loads rows (in IMPORT_STAGING_COLUMNS order) with COPY into a temporary staging
+        table and merges them into users set-wise.
+        Returns (row_no, new user id or None, email_taken, phone_taken) per row.
+        The staging table is dropped at commit, so call it once per transaction.
+        """
+        await db.execute(_CREATE_STAGING)
+
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "user_import_staging",
+            records=rows,
+            columns=IMPORT_STAGING_COLUMNS,
+        )
+
+        result = await db.execute(_MERGE_STAGING, {"company_id": company_id})
+        return [tuple(r) for r in result.all()]
@@ -1,8 +1,13 @@
-from .crud import UserDatabase
+from fastapi import Depends
+
+from container import ServiceContainer, get_container
 from .service import UserService
-from models import User
+from .importer import UserImporter
+
+async def get_user_service(container: ServiceContainer = Depends(get_container)) -> UserService:
+    return container.user_service
+
+
 
-def get_user_service() -> UserService:
-    return UserService(
-        user_database=UserDatabase(User),
-    )
\ No newline at end of file
+async def get_user_importer(container: ServiceContainer = Depends(get_container)) -> UserImporter:
+    return container.user_importer
@@ -0,0 +1,205 @@
+import csv
+import json
+import codecs
+import asyncio
+import tempfile
+from typing import Any, AsyncIterator, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from core.database import SessionLocal
+from core.logger import logger
+from modules.auth.password_manager import PasswordManager
+from .crud import UserDatabase
+from .schemas import ImportFormat, UserImportResult, UserImportRow, UserImportSummary
+
+CSV_FIELDS = set(UserImportRow.model_fields)
+SPOOL_MAX_MEMORY = 1024 * 1024
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+
+async def spool_upload(chunks: AsyncIterator[bytes]) -> tempfile.SpooledTemporaryFile:
+    """
+    Copies the whole upload before the response starts: once it has, the server no longer
+    delivers the request body. Kept in memory up to SPOOL_MAX_MEMORY, on disk past that.
+    """
+    upload = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        async for chunk in chunks:
+            upload.write(chunk)
+    except BaseException:
+        upload.close()
+        raise
+    upload.seek(0)
+    return upload
+
+
+async def iter_spooled(upload: tempfile.SpooledTemporaryFile) -> AsyncIterator[bytes]:
+    while chunk := upload.read(SPOOL_CHUNK_SIZE):
+        yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Splits an uploaded byte stream into text lines without buffering the whole body.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield pending.rstrip("\r")
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: ImportFormat) -> AsyncIterator[tuple[int, Any]]:
+    """
+    Yields (row number, dict) per data row, or (row number, error message) for rows that
+    cannot be parsed. Rows are numbered from 1, not counting the CSV header; blank lines
+    are skipped. CSV values may be quoted but not span lines.
+    """
+    header: Optional[list[str]] = None
+    row_no = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+
+        if fmt == ImportFormat.csv and header is None:
+            header = [name.strip() for name in next(csv.reader([line]))]
+            unknown = set(header) - CSV_FIELDS
+            if unknown or not {"email", "password"} <= set(header):
+                raise ValueError(f"CSV header must name email and password (unknown columns: {', '.join(sorted(unknown)) or '-'})")
+            continue
+
+        row_no += 1
+        if fmt == ImportFormat.csv:
+            values = next(csv.reader([line]))
+            if len(values) != len(header):
+                yield row_no, f"Expected {len(header)} columns, got {len(values)}"
+                continue
+            yield row_no, {name: value or None for name, value in zip(header, values)}
+        else:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_no, f"Invalid JSON: {e.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield row_no, "Expected a JSON object"
+                continue
+            # Empty strings mean "not given", as empty CSV cells do.
+            yield row_no, {name: None if value == "" else value for name, value in record.items()}
+
+
+class UserImporter:
+    """
+    Bulk user import: parses the upload chunk by chunk, hashes passwords in a dedicated
+    pool (so an import never queues behind or in front of logins) and loads every batch
+    with COPY plus one set-wise merge. Emits one NDJSON report line per row, then a summary.
+    """
+
+    def __init__(self, user_database: UserDatabase, password_manager: PasswordManager, batch_size: int = 500):
+        self.user_database = user_database
+        self.password_manager = password_manager
+        self.batch_size = batch_size
+        # Concurrent imports share the pool: wait for a slot instead of getting its 503.
+        self._hash_slots = asyncio.Semaphore(password_manager.max_pending)
+
+    async def run(self, chunks: AsyncIterator[bytes], fmt: ImportFormat, company_id: Optional[int] = None) -> AsyncIterator[str]:
+        total = created = 0
+        seen_emails: set[str] = set()
+        seen_phones: set[str] = set()
+        batch: list[tuple[int, UserImportRow]] = []
+
+        def report(result: UserImportResult) -> str:
+            nonlocal total, created
+            total += 1
+            created += result.status == "created"
+            return result.model_dump_json(exclude_none=True) + "\n"
+
+        try:
+            async for row_no, record in iter_records(chunks, fmt):
+                if isinstance(record, str):
+                    yield report(UserImportResult(row=row_no, status="failed", error=record))
+                    continue
+                try:
+                    row = UserImportRow.model_validate(record)
+                except ValidationError as e:
+                    error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                    yield report(UserImportResult(row=row_no, email=record.get("email"), status="failed", error=error))
+                    continue
+
+                # users.email is unique as stored (login matches it exactly), so the file is
+                # deduplicated the same way: on the validated address, case kept.
+                email = row.email
+                if email in seen_emails or (row.phone_number and row.phone_number in seen_phones):
+                    yield report(UserImportResult(row=row_no, email=row.email, status="failed", error="Duplicate of an earlier row in this file"))
+                    continue
+                seen_emails.add(email)
+                if row.phone_number:
+                    seen_phones.add(row.phone_number)
+
+                batch.append((row_no, row))
+                if len(batch) >= self.batch_size:
+                    for result in await self._import_batch(batch, company_id):
+                        yield report(result)
+                    batch = []
+
+            if batch:
+                for result in await self._import_batch(batch, company_id):
+                    yield report(result)
+        except ValueError as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+        logger.info("User import finished: %s/%s rows created, company_id=%s", created, total, company_id)
+        yield json.dumps({"summary": UserImportSummary(total=total, created=created, failed=total - created).model_dump()}) + "\n"
+
+    async def _hash(self, password: str) -> str:
+        async with self._hash_slots:
+            return await self.password_manager.hash(password)
+
+    async def _import_batch(self, batch: list[tuple[int, UserImportRow]], company_id: Optional[int]) -> list[UserImportResult]:
+        try:
+            hashes = await asyncio.gather(*(self._hash(row.password) for _, row in batch))
+        except HTTPException as e:
+            logger.warning("User import batch not hashed: %s", e.detail)
+            return [
+                UserImportResult(row=row_no, email=row.email, status="failed", error=f"Password hashing unavailable: {e.detail}")
+                for row_no, row in batch
+            ]
+        staged = [
+            (row_no, row.email, row.phone_number, row.first_name, row.last_name, password_hash)
+            for (row_no, row), password_hash in zip(batch, hashes)
+        ]
+
+        try:
+            merged = await self._load(staged, company_id)
+        except Exception as e:
+            logger.exception("User import batch failed")
+            return [
+                UserImportResult(row=row_no, email=row.email, status="failed", error=f"Batch failed: {e.__class__.__name__}")
+                for row_no, row in batch
+            ]
+
+        emails = {row_no: row.email for row_no, row in batch}
+        results = []
+        for row_no, user_id, email_taken, phone_taken in merged:
+            if user_id is not None:
+                results.append(UserImportResult(row=row_no, email=emails[row_no], status="created", id=user_id))
+                continue
+            error = (
+                "User with this email already exists." if email_taken
+                else "User with this phone number already exists." if phone_taken
+                else "Conflicts with a user created concurrently"
+            )
+            results.append(UserImportResult(row=row_no, email=emails[row_no], status="failed", error=error))
+        return results
+
+    async def _load(self, staged: list[tuple], company_id: Optional[int]) -> list[tuple[int, Optional[int], bool, bool]]:
+        async with SessionLocal() as db:
+            merged = await self.user_database.import_batch(db, staged, company_id)
+            await db.commit()
+        return merged
@@ -1,7 +1,7 @@
 from enum import Enum
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class StatusRole(str, Enum):
@@ -36,4 +36,30 @@ class UserSchema(UserBase):
 class UserAdmin(UserSchema):
     id: int
     role: str
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+class ImportFormat(str, Enum):
+    csv = "csv"        # header row: email,password[,phone_number,first_name,last_name]
+    ndjson = "ndjson"  # one JSON object per line with the same fields
+
+
+class UserImportRow(BaseModel):
+    email: EmailStr
+    password: str = Field(min_length=6)
+    phone_number: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+
+
+class UserImportResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: str  # created | failed
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class UserImportSummary(BaseModel):
+    total: int
+    created: int
+    failed: int
@@ -1,17 +1,21 @@
-from typing import Union
+from typing import Optional, Union
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models import User
+from schemas import TotalMode
 from .crud import UserDatabase
+from modules.auth.principal import PrincipalCache
 from .schemas import UserCreate, UserUpdate, UserAdmin
 
 class UserService:
     def __init__(
             self, 
             user_database: UserDatabase,
+            principal_cache: Optional[PrincipalCache] = None,
         ):
         self.user_database = user_database
+        self.principal_cache = principal_cache
 
     async def create_user(
         self,
@@ -45,14 +49,31 @@ class UserService:
 
 
     async def update_user(self, user_id: int, data: Union[UserUpdate, dict], db: AsyncSession) -> User:
-        return await self.user_database.update(db, db_obj=await self.user_database.get(db, user_id), obj_in=data)
+        user = await self.user_database.update(db, db_obj=await self.user_database.get(db, user_id), obj_in=data)
+        self._invalidate_principal(user_id)
+        return user
 
 
-    async def get_users(self, db: AsyncSession, skip: int, limit: int) -> tuple[list[UserAdmin], int]:
-        users = await self.user_database.get_multi(db, skip, limit)
-        total = await self.user_database.count(db)
+    async def get_users(
+        self,
+        db: AsyncSession,
+        limit: int,
+        cursor: Optional[str] = None,
+        total_mode: TotalMode = TotalMode.approximate,
+    ) -> tuple[list[UserAdmin], Optional[int], Optional[str]]:
+        users, next_cursor = await self.user_database.get_page(db, limit=limit, cursor=cursor)
+
+        total = None
+        if total_mode == TotalMode.approximate:
+            total = await self.user_database.approximate_count(db)
+        if total_mode == TotalMode.exact or (total_mode == TotalMode.approximate and total is None):
+            total = await self.user_database.count_cached(db)
+
+        return users, total, next_cursor
 
-        return users, total
+
+    async def get_user(self, user_id: int, db: AsyncSession) -> User:
+        return await self.user_database.get(db, user_id)
 
 
     async def get_user_by_email(self, email: str, db: AsyncSession) -> User:
@@ -60,4 +81,10 @@ class UserService:
 
     
     async def delete_user(self, id: int, db: AsyncSession):   
-        await self.user_database.remove(db, id)
\ No newline at end of file
+        await self.user_database.remove(db, id)
+        self._invalidate_principal(id)
+
+
+    def _invalidate_principal(self, user_id: int):
+        if self.principal_cache is not None:
+            self.principal_cache.invalidate(user_id)
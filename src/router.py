@@ -4,7 +4,17 @@ routers = APIRouter(prefix="/v1")
 
 from routers.auth_router import router as auth_router
 from routers.ai_router import router as ai_router
+from routers.user_router import router as user_router
+from routers.system_router import router as system_router
+from routers.quiz_router import router as quiz_router
+from routers.review_router import router as review_router
+from routers.overview_router import router as overview_router
 
 
 routers.include_router(auth_router)
-routers.include_router(ai_router)
\ No newline at end of file
+routers.include_router(ai_router)
+routers.include_router(user_router)
+routers.include_router(system_router)
+routers.include_router(quiz_router)
+routers.include_router(review_router)
+routers.include_router(overview_router)
\ No newline at end of file
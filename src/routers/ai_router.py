@@ -1,8 +1,22 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from modules.open_ai.service import OpenAIService
-from modules.open_ai.dependencies import get_ai_service
+from modules.auth.schemas import Principal
+from core.database import get_db
+from core.logger import logger
+from schemas import StatusResponse
+from modules.auth.dependencies import admin_required, get_current_user
+from modules.jobs.service import JobService
+from modules.jobs.schemas import JobKind, JobResponse
+from modules.jobs.dependencies import get_job_service
+from modules.open_ai.dependencies import generation_rate_limit
+from modules.open_ai.sse import SSE_HEADERS, format_sse
 from modules.open_ai.schemas import SummarizeRequest, SummarizeResponse
+from modules.summary.cache import SummaryCache
+from modules.summary.schemas import SummaryCacheStats
+from modules.summary.service import SummaryService
+from modules.summary.dependencies import get_summary_cache, get_summary_service
 
 router = APIRouter(prefix="/ai", tags=["AI TEST"])
 
@@ -10,11 +24,73 @@ router = APIRouter(prefix="/ai", tags=["AI TEST"])
 @router.post("/summarize", response_model=SummarizeResponse)
 async def summarize_text(
     data: SummarizeRequest,
-    ai_service: OpenAIService = Depends(get_ai_service),
+    db: AsyncSession = Depends(get_db),
+    _: Principal = Depends(generation_rate_limit),
+    summary_service: SummaryService = Depends(get_summary_service),
 ):
-    summary = await ai_service.summarize_text(data.text)
+    summary = await summary_service.summarize(data.text, db)
+    return SummarizeResponse(summary=summary)
 
-    if summary.startswith("Ошибка"):
-        raise HTTPException(status_code=500, detail=summary)
 
-    return SummarizeResponse(summary=summary)
\ No newline at end of file
+@router.post("/summarize/stream", summary="Stream summary tokens as Server-Sent Events")
+async def summarize_text_stream(
+    data: SummarizeRequest,
+    response: Response,
+    _: Principal = Depends(generation_rate_limit),
+    summary_service: SummaryService = Depends(get_summary_service),
+):
+    async def events():
+        try:
+            async for delta in summary_service.stream(data.text):
+                yield format_sse({"delta": delta})
+        except TimeoutError:
+            yield format_sse({"detail": "Ошибка: timeout"}, event="error")
+            return
+        except Exception as e:
+            logger.exception("AI summarize stream failed")
+            yield format_sse({"detail": f"Ошибка: {e}"}, event="error")
+            return
+        yield format_sse({}, event="done")
+
+    # Headers set on the injected Response (the X-RateLimit-* ones) are not copied into a
+    # returned response, so pass them along.
+    return StreamingResponse(events(), media_type="text/event-stream", headers={**SSE_HEADERS, **response.headers})
+
+
+@router.post("/jobs/summary", response_model=JobResponse, status_code=202, summary="Queue summary generation")
+async def create_summary_job(
+    data: SummarizeRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(generation_rate_limit),
+    job_service: JobService = Depends(get_job_service),
+):
+    return await job_service.enqueue(JobKind.summary, data.model_dump(), current_user, db)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse, summary="Generation job status and result")
+async def get_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    job_service: JobService = Depends(get_job_service),
+):
+    return await job_service.get_job(job_id, current_user, db)
+
+
+@router.get("/cache/stats", response_model=SummaryCacheStats, summary="Summary cache counters")
+async def summary_cache_stats(
+    _: Principal = Depends(admin_required),
+    cache: SummaryCache = Depends(get_summary_cache),
+):
+    return cache.stats()
+
+
+@router.delete("/cache", response_model=StatusResponse, summary="Invalidate cached summaries")
+async def invalidate_summary_cache(
+    stale_only: bool = False,
+    db: AsyncSession = Depends(get_db),
+    _: Principal = Depends(admin_required),
+    cache: SummaryCache = Depends(get_summary_cache),
+):
+    removed = await cache.invalidate(db, stale_only=stale_only)
+    return StatusResponse(message=f"Removed {removed} cached summaries")
@@ -2,12 +2,11 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models import User
 from core.database import get_db
 from schemas import StatusResponse
 from modules.user.schemas import UserCreate
 from modules.auth.service import AuthService
-from modules.auth.schemas import TokenResponse, SimpleLoginForm
+from modules.auth.schemas import Principal, TokenResponse, SimpleLoginForm
 from modules.auth.dependencies import get_auth_service, get_bearer_token, get_current_user
 
 router = APIRouter(prefix="/auth", tags=["Authorization"])
@@ -52,6 +51,6 @@ async def logout_user_route(
 
 @router.post("/test", response_model=StatusResponse, summary="test user")
 async def test(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return StatusResponse(message="Logged out successfully")
\ No newline at end of file
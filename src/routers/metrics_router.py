@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+
+from core.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter(tags=["System"])
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    # Per worker process: with several uvicorn workers each scrape hits one of them.
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
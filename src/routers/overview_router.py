@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from modules.auth.schemas import Principal
+from modules.auth.dependencies import get_current_user
+from modules.overview.schemas import OverviewResponse
+from modules.overview.service import OverviewService
+from modules.overview.dependencies import get_overview_service
+
+router = APIRouter(prefix="/me", tags=["Overview"])
+
+
+@router.get("/overview", response_model=OverviewResponse, summary="Materials, completed quizzes and average best score")
+async def get_overview(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    overview_service: OverviewService = Depends(get_overview_service),
+):
+    return await overview_service.get_overview(current_user, db)
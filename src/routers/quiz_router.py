@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from modules.auth.schemas import Principal
+from modules.jobs.service import JobService
+from modules.jobs.schemas import JobKind, JobResponse
+from modules.jobs.dependencies import get_job_service
+from modules.open_ai.dependencies import generation_rate_limit
+from modules.quiz.service import QuizService
+from modules.auth.dependencies import get_current_user
+from modules.quiz.schemas import HintRequest, HintResponse, QuizGenerateRequest, QuizPublic, SubmitRequest, SubmitResponse
+from modules.quiz.dependencies import get_quiz_service
+
+router = APIRouter(tags=["Quiz"])
+
+
+@router.post("/generate/quiz", response_model=JobResponse, status_code=202, summary="Queue creating or recreating the quiz of a material")
+async def generate_quiz(
+    data: QuizGenerateRequest,
+    force: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(generation_rate_limit),
+    quiz_service: QuizService = Depends(get_quiz_service),
+    job_service: JobService = Depends(get_job_service),
+):
+    await quiz_service.get_owned_material(data.material_id, current_user, db)
+    return await job_service.enqueue(JobKind.quiz, {**data.model_dump(), "force": force}, current_user, db)
+
+
+@router.get("/materials/{material_id}/quiz", response_model=QuizPublic, summary="Public quiz of a material (no answers or hints)")
+async def get_material_quiz(
+    material_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: QuizService = Depends(get_quiz_service),
+):
+    view = await quiz_service.get_material_quiz(material_id, current_user, db)
+    return Response(view.public_json, media_type="application/json")
+
+
+@router.post("/quizzes/{quiz_id}/submit", response_model=SubmitResponse, summary="Score answers, update mastery, create review cards")
+async def submit_quiz(
+    quiz_id: int,
+    data: SubmitRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: QuizService = Depends(get_quiz_service),
+):
+    return await quiz_service.submit(quiz_id, data, current_user, db)
+
+
+@router.post("/quizzes/{quiz_id}/questions/{question_id}/hint", response_model=HintResponse, summary="Hint of level 1 or 2 for a question")
+async def get_hint(
+    quiz_id: int,
+    question_id: int,
+    data: HintRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    quiz_service: QuizService = Depends(get_quiz_service),
+):
+    return await quiz_service.get_hint(quiz_id, question_id, data.level, current_user, db)
@@ -0,0 +1,47 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from schemas import ListResponse
+from modules.auth.schemas import Principal
+from modules.auth.dependencies import get_current_user
+from modules.review.schemas import BulkGradeRequest, CardGrade, GradeRequest, GradeResult, ReviewCardPublic
+from modules.review.service import ReviewService
+from modules.review.dependencies import get_review_service
+
+router = APIRouter(prefix="/review", tags=["Review"])
+
+
+@router.get("/due", response_model=ListResponse[ReviewCardPublic], summary="Cards due for review (keyset paginated)")
+async def get_due(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    review_service: ReviewService = Depends(get_review_service),
+):
+    cards, next_cursor = await review_service.get_due(current_user, db, limit, cursor)
+    return ListResponse[ReviewCardPublic](data=cards, next_cursor=next_cursor)
+
+
+@router.post("/grade", response_model=list[GradeResult], summary="Grade several cards at once")
+async def grade_many(
+    data: BulkGradeRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    review_service: ReviewService = Depends(get_review_service),
+):
+    return await review_service.grade(data.grades, current_user, db)
+
+
+@router.post("/{card_id}/grade", response_model=GradeResult, summary="Grade a card: again, good or easy")
+async def grade(
+    card_id: int,
+    data: GradeRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    review_service: ReviewService = Depends(get_review_service),
+):
+    results = await review_service.grade([CardGrade(card_id=card_id, grade=data.grade)], current_user, db)
+    return results[0]
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from core.database import pool_stats
+from core.dependencies import get_config
+from modules.auth.schemas import Principal
+from modules.auth.dependencies import admin_required
+from modules.system.schemas import DatabasePoolStats
+
+router = APIRouter(prefix="/system", tags=["System"])
+
+@router.get("/db/pool", response_model=DatabasePoolStats, summary="Database connection pool counters")
+async def database_pool_stats(
+    _: Principal = Depends(admin_required),
+):
+    stats = pool_stats()
+    return DatabasePoolStats(role=get_config().PROCESS_ROLE, async_pool=stats["async"], sync_pool=stats["sync"])
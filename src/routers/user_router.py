@@ -0,0 +1,45 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import get_db
+from schemas import ListResponse, TotalMode
+from modules.auth.schemas import Principal
+from modules.auth.dependencies import admin_required
+from modules.user.schemas import ImportFormat, UserAdmin
+from modules.user.service import UserService
+from modules.user.importer import UserImporter, iter_spooled, spool_upload
+from modules.user.dependencies import get_user_importer, get_user_service
+
+router = APIRouter(prefix="/users", tags=["Users"])
+
+@router.get("", response_model=ListResponse[UserAdmin], summary="List users (keyset paginated)")
+async def list_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    total: TotalMode = TotalMode.approximate,
+    db: AsyncSession = Depends(get_db),
+    _: Principal = Depends(admin_required),
+    user_service: UserService = Depends(get_user_service),
+):
+    users, count, next_cursor = await user_service.get_users(db, limit, cursor, total)
+    return ListResponse[UserAdmin](data=users, total=count, next_cursor=next_cursor)
+
+
+
+@router.post("/import", summary="Bulk import users from a CSV or NDJSON body, streams an NDJSON report")
+async def import_users(
+    request: Request,
+    format: ImportFormat = ImportFormat.csv,
+    company_id: Optional[int] = None,
+    _: Principal = Depends(admin_required),
+    importer: UserImporter = Depends(get_user_importer),
+):
+    upload = await spool_upload(request.stream())
+    return StreamingResponse(
+        importer.run(iter_spooled(upload), format, company_id),
+        media_type="application/x-ndjson",
+        background=BackgroundTask(upload.close),
+    )
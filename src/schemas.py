@@ -1,11 +1,18 @@
+from enum import Enum
 from pydantic import BaseModel
 from typing import Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
+class TotalMode(str, Enum):
+    exact = "exact"              # count(*), cached for a few seconds
+    approximate = "approximate"  # planner estimate from pg_class
+    none = "none"
+
 class ListResponse(BaseModel, Generic[T]):
     data: list[T]
     total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 class StatusResponse(BaseModel):
     status: bool = True
@@ -0,0 +1,119 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Any, Callable
+from sqlalchemy.orm import Session
+
+from models import GenerationJob
+from core.logger import logger
+from core.database import get_db_sync
+from core.celery_config import celery_app
+from core.dependencies import get_config
+from modules.jobs.schemas import JobKind, JobStatus
+
+ProgressCallback = Callable[[float], None]
+
+db_session = contextmanager(get_db_sync)
+
+_loop: asyncio.AbstractEventLoop = None
+_container = None
+
+
+def get_worker_container():
+    """
+    The worker's own service container, built on first use in each worker process.
+    """
+    global _container
+    if _container is None:
+        # Imported here: the container wires JobService, which dispatches tasks from this module.
+        from container import ServiceContainer
+
+        _container = ServiceContainer(get_config())
+    return _container
+
+
+def run_async(coro):
+    """
+    Runs a coroutine on the worker's long-lived event loop, so the pooled async
+    LLM client keeps its connections between tasks.
+    """
+    global _loop
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError("Generation jobs cannot run inline inside an event loop; use a broker and a worker")
+
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+def generate_summary(job: GenerationJob, db: Session, report: ProgressCallback) -> dict[str, Any]:
+    summary_service = get_worker_container().summary_service
+    cache = summary_service.cache
+    text = job.payload["text"]
+
+    key = cache.key(text)
+    summary = cache.get_sync(key, db)
+    if summary is None:
+        report(0.1)
+        summary = run_async(summary_service.generate(text, on_progress=lambda share: report(0.1 + 0.8 * share)))
+        cache.set_sync(key, summary, db)
+
+    return {"summary": summary}
+
+
+def generate_quiz(job: GenerationJob, db: Session, report: ProgressCallback) -> dict[str, Any]:
+    quiz_service = get_worker_container().quiz_service
+    material_id = job.payload["material_id"]
+    num_questions = job.payload["num_questions"]
+
+    report(0.1)
+    quiz_id = run_async(quiz_service.generate_quiz(
+        material_id,
+        num_questions,
+        force=job.payload["force"],
+        on_question=lambda accepted: report(0.1 + 0.8 * accepted / num_questions),
+    ))
+
+    return {"quiz_id": quiz_id, "material_id": material_id}
+
+
+JOB_HANDLERS: dict[JobKind, Callable[[GenerationJob, Session, ProgressCallback], dict[str, Any]]] = {
+    JobKind.summary: generate_summary,
+    JobKind.quiz: generate_quiz,
+}
+
+
+@celery_app.task(name="generation.run_job")
+def run_generation_job(job_id: str) -> None:
+    with db_session() as db:
+        job = db.get(GenerationJob, job_id)
+        if job is None:
+            logger.warning("Generation job %s not found", job_id)
+            return
+        if job.status not in (JobStatus.queued, JobStatus.running):
+            logger.info("Generation job %s already %s, skipping", job_id, job.status)
+            return
+
+        def report(progress: float) -> None:
+            job.progress = progress
+            db.commit()
+
+        job.status = JobStatus.running.value
+        report(0.0)
+
+        try:
+            result = JOB_HANDLERS[JobKind(job.kind)](job, db, report)
+        except Exception as e:
+            logger.exception("Generation job %s failed", job_id)
+            db.rollback()
+            job.status = JobStatus.failed.value
+            job.error = getattr(e, "detail", None) or str(e)
+            return
+
+        job.status = JobStatus.succeeded.value
+        job.progress = 1.0
+        job.result = result
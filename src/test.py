@@ -1,19 +1,25 @@
-from core.config import Config
+import asyncio
 
-def main():
-    client = Config().azure_client
+from core.dependencies import get_config
+from modules.open_ai.provider import AIProvider
 
-    assistant = client.beta.assistants.create(
-        name="AIMektep Mini Assistant",
-        instructions="Ты помогаешь студентам делать краткие конспекты текста на русском языке.",
-        model="gpt-4o-mini",
-        temperature=0.5,
-        tools=[],
-    )
+async def main():
+    provider = AIProvider(get_config())
+    try:
+        async with provider.slot() as client:
+            assistant = await client.beta.assistants.create(
+                name="AIMektep Mini Assistant",
+                instructions="Ты помогаешь студентам делать краткие конспекты текста на русском языке.",
+                model="gpt-4o-mini",
+                temperature=0.5,
+                tools=[],
+            )
+    finally:
+        await provider.aclose()
 
     print(f"✅ Assistant created successfully!")
     print(f"Name: {assistant.name}")
     print(f"ID:   {assistant.id}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
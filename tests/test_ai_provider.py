@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from core.config import Config
+from modules.open_ai.provider import AIProvider
+from modules.open_ai.service import OpenAIService
+
+
+class StubStream:
+    def __init__(self, client: "StubClient"):
+        self.client = client
+
+    async def __aenter__(self):
+        self.client.active += 1
+        self.client.peak = max(self.client.peak, self.client.active)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.client.active -= 1
+        return False
+
+    @property
+    async def text_deltas(self):
+        yield "Конспект"
+        await asyncio.sleep(self.client.stall)
+        yield "."
+
+    async def get_final_run(self):
+        return SimpleNamespace(status="completed", usage=None)
+
+
+class StubClient:
+    """
+    Stands in for AsyncAzureOpenAI: every run pauses `stall` seconds between its two
+    deltas and the client counts how many runs are open at once.
+    """
+
+    def __init__(self, stall: float = 0.0):
+        self.stall = stall
+        self.active = self.peak = 0
+        self.beta = SimpleNamespace(threads=SimpleNamespace(create_and_run_stream=lambda **kwargs: StubStream(self)))
+
+
+def make_service(stall: float, run_timeout: float = 5, max_concurrency: int = 4) -> tuple[OpenAIService, StubClient]:
+    config = Config()
+    config.AZURE_OPENAI_RUN_TIMEOUT = run_timeout
+    config.AZURE_OPENAI_MAX_CONCURRENCY = max_concurrency
+    provider = AIProvider(config=config)
+    client = provider.client = StubClient(stall)
+    return OpenAIService(provider=provider), client
+
+
+async def collect(service: OpenAIService) -> str:
+    return "".join([delta async for delta in service.stream_completion("текст")])
+
+
+def test_run_timeout_bounds_a_stalled_run():
+    service, client = make_service(stall=10, run_timeout=0.05, max_concurrency=1)
+
+    async def scenario():
+        with pytest.raises(TimeoutError):
+            await collect(service)
+        # The slot is free again: a second run is not stuck behind the timed-out one.
+        client.stall = 0
+        return await collect(service)
+
+    assert asyncio.run(scenario()) == "Конспект."
+    assert client.active == 0
+
+
+def test_concurrent_runs_are_capped_by_the_semaphore():
+    service, client = make_service(stall=0.02, max_concurrency=2)
+
+    async def scenario():
+        return await asyncio.gather(*(collect(service) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["Конспект."] * 5
+    assert client.peak == 2
+
+
+def test_aclose_closes_the_http_pool():
+    provider = AIProvider(config=Config())
+
+    asyncio.run(provider.aclose())
+
+    assert provider.http_client.is_closed
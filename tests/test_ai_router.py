@@ -0,0 +1,71 @@
+import json
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.rate_limit import InMemoryBackend, RateLimiter
+from routers.ai_router import router
+from modules.auth.schemas import Principal
+from modules.auth.dependencies import get_current_user
+from modules.open_ai.fake import FakeOpenAIService
+from modules.open_ai.dependencies import get_generation_limiter
+from modules.summary.dependencies import get_summary_service
+
+TEXT = "Клетка — основная единица строения и жизнедеятельности всех живых организмов"
+
+
+class FailingAIService(FakeOpenAIService):
+    async def stream_summary(self, text, prompt=""):
+        yield "Начало"
+        raise RuntimeError("provider unavailable")
+
+
+def make_client(ai_service) -> TestClient:
+    limiter = RateLimiter(InMemoryBackend(), limit=5, period=60, scope="generation")
+    app = FastAPI()
+    app.include_router(router, prefix="/v1")
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=1, email="a@b.c", role="user")
+    app.dependency_overrides[get_generation_limiter] = lambda: limiter
+    # The route only needs SummaryService.stream; the fake streams without the cache.
+    app.dependency_overrides[get_summary_service] = lambda: SimpleNamespace(stream=ai_service.stream_summary)
+    return TestClient(app)
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.split("\n\n"):
+        if not block:
+            continue
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields.get("event", "message"), json.loads(fields["data"])))
+    return events
+
+
+def test_stream_sends_deltas_then_done_with_rate_limit_headers():
+    ai_service = FakeOpenAIService(deltas=4)
+
+    with make_client(ai_service) as client:
+        response = client.post("/v1/ai/summarize/stream", json={"text": TEXT})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert (response.headers["x-ratelimit-limit"], response.headers["x-ratelimit-remaining"]) == ("5", "4")
+    assert response.text.endswith("\n\n")
+
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["message"] * 4 + ["done"]
+    assert "".join(data["delta"] for _, data in events[:-1]) == ai_service.render(TEXT)
+
+
+def test_stream_reports_a_provider_failure_as_an_error_event():
+    with make_client(FailingAIService()) as client:
+        response = client.post("/v1/ai/summarize/stream", json={"text": TEXT})
+
+    assert response.status_code == 200
+    assert response.headers["x-ratelimit-remaining"] == "4"
+    assert parse_events(response.text) == [
+        ("message", {"delta": "Начало"}),
+        ("error", {"detail": "Ошибка: provider unavailable"}),
+    ]
@@ -1,85 +1,131 @@
-from typing import Annotated
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
 
 from models import User
 from core.database import get_db
-from schemas import StatusResponse
-from modules.user.schemas import UserCreate
+from routers.auth_router import router
 from modules.auth.service import AuthService
-from modules.auth.schemas import TokenResponse, SimpleLoginForm
-from modules.auth.dependencies import (
-    get_auth_service,
-    get_bearer_token,
-    get_current_user,
-)
-
-router = APIRouter(prefix="/auth", tags=["Authorization"])
-
-# ---------------------------
-# Register
-# ---------------------------
-@router.post("/register", response_model=TokenResponse, summary="Register a new user")
-async def register_user_route(
-    payload: UserCreate,
-    db: AsyncSession = Depends(get_db),
-    auth_service: AuthService = Depends(get_auth_service),
-):
-    access_token, refresh_token = await auth_service.register_user(payload, db)
-    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
-
-# ---------------------------
-# Login (нужен тестам)
-# ---------------------------
-@router.post("/login", response_model=TokenResponse, summary="Login user and issue tokens")
-async def login_user_route(
-    form: SimpleLoginForm,
-    db: AsyncSession = Depends(get_db),
-    auth_service: AuthService = Depends(get_auth_service),
-):
-    access_token, refresh_token = await auth_service.authenticate_user(
-        form.username, form.password, db
+from modules.auth.jwt_service import JWTService
+from modules.auth.principal import PrincipalCache
+from modules.auth.password_manager import PasswordManager
+from modules.auth.revocation import InMemoryRevocationStore
+from modules.user.service import UserService
+
+
+class InMemoryUserDatabase:
+    """
+    The part of UserDatabase that the auth flow uses, kept in a dict.
+    """
+
+    def __init__(self):
+        self.users: dict[int, User] = {}
+        self.ids = count(1)
+
+    async def get(self, db, id: int) -> User:
+        if id not in self.users:
+            raise HTTPException(status_code=404, detail="User not found")
+        return self.users[id]
+
+    async def get_objects(self, db, **filters) -> User:
+        for user in self.users.values():
+            if all(getattr(user, name) == value for name, value in filters.items()):
+                return user
+        raise HTTPException(status_code=404, detail="User not found")
+
+    async def create(self, db, obj_in: dict) -> User:
+        user = User(id=next(self.ids), **obj_in)
+        self.users[user.id] = user
+        return user
+
+    async def update(self, db, db_obj: User, obj_in: dict) -> User:
+        for name, value in obj_in.items():
+            setattr(db_obj, name, value)
+        return db_obj
+
+
+async def no_db():
+    yield None
+
+
+@pytest.fixture
+def client():
+    principal_cache = PrincipalCache(maxsize=100, ttl=60)
+    password_manager = PasswordManager(rounds=4, workers=1)
+    auth_service = AuthService(
+        user_service=UserService(InMemoryUserDatabase(), principal_cache),
+        password_manager=password_manager,
+        jwt_service=JWTService(algorithm="HS256", secret_key="test-secret-for-the-auth-router-tests", access_expiry=5, refresh_expiry=60),
+        principal_cache=principal_cache,
+        revocation_store=InMemoryRevocationStore(),
+    )
+
+    app = FastAPI()
+    app.include_router(router, prefix="/v1")
+    app.state.container = SimpleNamespace(auth_service=auth_service)
+    app.dependency_overrides[get_db] = no_db
+
+    with TestClient(app) as client:
+        yield client
+    password_manager.shutdown()
+
+
+def register(client: TestClient, email: str = "student@example.com", phone: str = "+77010000001") -> dict:
+    response = client.post("/v1/auth/register", json={"email": email, "phone_number": phone, "password": "secret-1"})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_register_returns_token_pair(client):
+    tokens = register(client)
+
+    assert tokens["access_token"] and tokens["refresh_token"]
+    assert client.post("/v1/auth/test", headers=bearer(tokens["access_token"])).status_code == 200
+
+
+def test_register_rejects_duplicate_email(client):
+    register(client)
+
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "student@example.com", "phone_number": "+77010000002", "password": "secret-1"},
     )
-    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
-
-# ---------------------------
-# Refresh (алиас под тесты)
-# ---------------------------
-@router.post("/refresh", response_model=TokenResponse, summary="Refresh access token")
-async def refresh_access_token_route(
-    db: AsyncSession = Depends(get_db),
-    refresh_token: str = Depends(get_bearer_token),
-    auth_service: AuthService = Depends(get_auth_service),
-):
-    access_token = await auth_service.refresh_access_token(refresh_token, db)
-    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
-
-# (если хочешь сохранить старый путь, оставь алиас)
-@router.post("/token/refresh", response_model=TokenResponse, summary="Refresh access token (alias)")
-async def refresh_token_route(
-    db: AsyncSession = Depends(get_db),
-    refresh_token: str = Depends(get_bearer_token),
-    auth_service: AuthService = Depends(get_auth_service),
-):
-    access_token = await auth_service.refresh_access_token(refresh_token, db)
-    return TokenResponse(access_token=access_token, refresh_token=refresh_token)
-
-# ---------------------------
-# Logout
-# ---------------------------
-@router.post("/logout", response_model=StatusResponse, summary="Logout user")
-async def logout_user_route(
-    refresh_token: str = Depends(get_bearer_token),
-    auth_service: AuthService = Depends(get_auth_service),
-):
-    await auth_service.logout_user(refresh_token)
-    return StatusResponse(message="Logged out successfully")
-
-# ---------------------------
-# Test endpoint (как в тестах)
-# ---------------------------
-@router.post("/test", response_model=StatusResponse, summary="test user")
-async def test(
-    current_user: User = Depends(get_current_user),
-):
-    return StatusResponse(message="Logged out successfully")
+    assert response.status_code == 400
+
+
+def test_login(client):
+    register(client)
+
+    ok = client.post("/v1/auth/login", data={"username": "student@example.com", "password": "secret-1"})
+    wrong = client.post("/v1/auth/login", data={"username": "student@example.com", "password": "nope"})
+    unknown = client.post("/v1/auth/login", data={"username": "nobody@example.com", "password": "secret-1"})
+
+    assert ok.status_code == 200 and ok.json()["refresh_token"]
+    assert wrong.status_code == 400
+    assert unknown.status_code == 404
+
+
+def test_protected_route_requires_access_token(client):
+    tokens = register(client)
+
+    assert client.post("/v1/auth/test").status_code == 401
+    assert client.post("/v1/auth/test", headers=bearer(tokens["refresh_token"])).status_code == 403
+
+
+def test_refresh_and_logout(client):
+    tokens = register(client)
+
+    refreshed = client.post("/v1/auth/token/refresh", headers=bearer(tokens["refresh_token"]))
+    assert refreshed.status_code == 200
+    assert client.post("/v1/auth/test", headers=bearer(refreshed.json()["access_token"])).status_code == 200
+    assert client.post("/v1/auth/token/refresh", headers=bearer(tokens["access_token"])).status_code == 403
+
+    assert client.post("/v1/auth/logout", headers=bearer(tokens["refresh_token"])).status_code == 200
+    assert client.post("/v1/auth/token/refresh", headers=bearer(tokens["refresh_token"])).status_code == 403
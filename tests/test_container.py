@@ -0,0 +1,54 @@
+import asyncio
+
+from core.config import Config
+from container import ServiceContainer
+from services.scheduler.tasks import get_worker_container
+
+
+def make_config() -> Config:
+    config = Config()
+    config.AI_PROVIDER = "azure"
+    config.REDIS_URL = None
+    config.REVOCATION_BACKEND = "memory"
+    config.RATE_LIMIT_BACKEND = "memory"
+    return config
+
+
+def test_api_and_worker_build_their_own_container():
+    api = ServiceContainer(make_config())
+    worker = get_worker_container()
+
+    assert api is not worker
+    assert get_worker_container() is worker
+    assert api.quiz_cache is not worker.quiz_cache
+    assert api.summary_cache is not worker.summary_cache
+    assert api.password_manager.executor is not worker.password_manager.executor
+    assert api.ai_service is not worker.ai_service
+
+    api.password_manager.shutdown()
+    api.user_importer.password_manager.shutdown()
+
+
+def test_aclose_releases_the_http_pool_stores_and_executors():
+    container = ServiceContainer(make_config())
+    closed = []
+
+    async def close_revocations():
+        closed.append("revocations")
+
+    async def close_limiter():
+        closed.append("limiter")
+
+    container.revocation_store.aclose = close_revocations
+    container.generation_limiter.backend.aclose = close_limiter
+
+    async def scenario():
+        await container.start()
+        await container.aclose()
+
+    asyncio.run(scenario())
+
+    assert closed == ["revocations", "limiter"]
+    assert container.ai_provider.http_client.is_closed
+    assert container.password_manager.executor._shutdown
+    assert container.user_importer.password_manager.executor._shutdown
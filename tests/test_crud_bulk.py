@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+
+from models import User, UserSkillMastery
+from core.crudbase import CRUDBase
+
+
+@pytest.fixture
+def db(sqlite_db):
+    engine = sqlite_db.session.get_bind()
+    User.__table__.create(engine)
+    sqlite_db.statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: sqlite_db.statements.append(args[2]))
+    return sqlite_db
+
+
+def rows(n, start=0):
+    return [{"email": f"user{i}@example.com", "password_hash": "x", "role": "user"} for i in range(start, start + n)]
+
+
+def test_create_many_batches_and_returns_objects(db):
+    crud = CRUDBase(User)
+    created = asyncio.run(crud.create_many(db, rows(25), batch_size=10))
+
+    assert [u.email for u in created] == [f"user{i}@example.com" for i in range(25)]
+    assert all(u.id for u in created)
+    # Ordered RETURNING needs an insert sentinel: Postgres keeps one INSERT per batch,
+    # SQLite (no sentinel support) falls back to one INSERT per row.
+    batched = db.session.get_bind().dialect.name == "postgresql"
+    assert len([s for s in db.statements if s.startswith("INSERT")]) == (3 if batched else 25)
+
+
+def test_update_many_and_delete_where(db):
+    crud = CRUDBase(User)
+    created = asyncio.run(crud.create_many(db, rows(10)))
+
+    updated = asyncio.run(crud.update_many(db, [{"id": u.id, "role": "admin"} for u in created[:4]] + [{"id": 999, "role": "admin"}]))
+    assert updated == 4  # matched rows: id 999 does not exist
+    roles = db.session.scalars(select(User.role).order_by(User.id)).all()
+    assert roles == ["admin"] * 4 + ["user"] * 6
+
+    with pytest.raises(HTTPException):
+        asyncio.run(crud.update_many(db, [{"role": "admin"}]))
+
+    ids = [u.id for u in created[:7]]
+    assert asyncio.run(crud.delete_where(db, id=ids, role="user", batch_size=2)) == 3
+    assert asyncio.run(crud.count(db)) == 7
+
+    with pytest.raises(HTTPException):
+        asyncio.run(crud.delete_where(db))
+
+
+def test_upsert_many_statement():
+    captured = {}
+
+    class CapturingSession:
+        async def scalars(self, stmt, params=None, execution_options=None):
+            captured["sql"] = str(stmt.compile(dialect=postgresql.dialect()))
+
+            class Result:
+                def all(self):
+                    return []
+            return Result()
+
+    asyncio.run(CRUDBase(User).upsert_many(CapturingSession(), rows(3), index_elements=["email"]))
+    sql = captured["sql"]
+    assert "ON CONFLICT (email) DO UPDATE SET password_hash = excluded.password_hash, role = excluded.role" in sql
+    assert sql.count("VALUES") == 1 and "RETURNING" in sql
+
+
+def test_update_many_keys_on_a_composite_primary_key(sqlite_db):
+    UserSkillMastery.__table__.create(sqlite_db.session.get_bind())
+    sqlite_db.session.add_all([UserSkillMastery(user_id=1, tag=tag, mastery=0.5) for tag in ("a", "b")])
+    sqlite_db.session.flush()
+    crud = CRUDBase(UserSkillMastery)
+
+    updated = asyncio.run(crud.update_many(sqlite_db, [
+        {"user_id": 1, "tag": "b", "mastery": 0.9},
+        {"user_id": 2, "tag": "b", "mastery": 0.9},
+    ]))
+
+    assert updated == 1
+    assert sqlite_db.session.execute(select(UserSkillMastery.tag, UserSkillMastery.mastery).order_by(UserSkillMastery.tag)).all() == [("a", 0.5), ("b", 0.9)]
+    with pytest.raises(HTTPException):
+        asyncio.run(crud.update_many(sqlite_db, [{"user_id": 1, "mastery": 0.1}]))
+
+
+@pytest.mark.postgres
+def test_update_many_from_values_on_postgres(pg):
+    async def scenario(db):
+        crud = CRUDBase(User)
+        created = await crud.create_many(db, rows(5))
+        ids = [u.id for u in created]
+        updated = await crud.update_many(db, [
+            {"id": ids[0], "role": "admin"},
+            {"id": ids[1], "role": "admin", "first_name": "B"},
+            {"id": -1, "role": "admin"},
+        ])
+        stored = (await db.execute(select(User.id, User.role, User.first_name).where(User.id.in_(ids)).order_by(User.id))).all()
+        return ids, updated, [tuple(row) for row in stored]
+
+    ids, updated, stored = pg(scenario)
+
+    assert updated == 2
+    assert stored == [(ids[0], "admin", None), (ids[1], "admin", "B"), *((i, "user", None) for i in ids[2:])]
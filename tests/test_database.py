@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+import core.database as database
+from core.pool import InstrumentedQueuePool
+from core.database import async_connect_args
+
+
+def test_pooler_profile_disables_prepared_statement_caching():
+    args = async_connect_args("pooler")
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    assert args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+
+
+def test_direct_profile_keeps_asyncpg_statement_cache():
+    args = async_connect_args("direct", statement_cache_size=256)
+    assert args == {"statement_cache_size": 256, "prepared_statement_cache_size": 256}
+
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(RuntimeError):
+        async_connect_args("bouncer")
+
+
+def test_instrumented_pool_counts_waits_and_timeouts():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    held = engine.connect()
+    assert engine.pool.stats()["checked_out"] == 1
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    held.close()
+
+    stats = engine.pool.stats()
+    assert stats["checked_out"] == 0
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_max"] >= 0.05
+
+
+def test_sync_engine_is_created_lazily():
+    assert database._sync_engine is None
+    assert database.pool_stats()["sync"] is None
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from modules.open_ai.fake import FakeOpenAIService
+from modules.open_ai.service import CHUNK_PROMPT
+
+
+def collect(service: FakeOpenAIService, text: str, **kwargs) -> list[str]:
+    async def run():
+        return [delta async for delta in service.stream_summary(text, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_output_is_deterministic_and_streamed():
+    service = FakeOpenAIService(deltas=4)
+
+    first = collect(service, "Клетка — основная единица жизни")
+    second = collect(FakeOpenAIService(deltas=4), "Клетка — основная единица жизни")
+
+    assert first == second
+    assert len(first) == 4
+    assert "".join(first) == service.render("Клетка — основная единица жизни")
+    assert service.render("text") != service.render("text", CHUNK_PROMPT)
+
+
+def test_latency_is_spread_over_the_stream(monkeypatch):
+    pauses = []
+
+    async def sleep(seconds):
+        pauses.append(seconds)
+
+    monkeypatch.setattr("modules.open_ai.fake.asyncio.sleep", sleep)
+    service = FakeOpenAIService(latency=0.1, deltas=5)
+
+    assert asyncio.run(service.summarize_text("Материал"))
+
+    assert len(pauses) == 5
+    assert sum(pauses) == pytest.approx(0.1)
+    assert service.calls == 1
@@ -0,0 +1,112 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from models import GenerationJob, SummaryCacheEntry
+from core.database import SyncSessionLocal
+from core.celery_config import celery_app, check_broker
+from services.scheduler.tasks import get_worker_container, run_generation_job
+
+
+class FakeAIService:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    async def stream_summary(self, text: str, prompt: str = ""):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("failed")
+        for word in ("Краткий ", "конспект"):
+            yield word
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    """
+    Eager Celery on an in-memory SQLite database: no broker, Redis or Postgres needed.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    GenerationJob.__table__.create(engine)
+    SummaryCacheEntry.__table__.create(engine)
+
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    original_bind = SyncSessionLocal.kw.get("bind")
+    SyncSessionLocal.configure(bind=engine)
+    summary_service = get_worker_container().summary_service
+    summary_service.cache.memory.clear()
+    yield summary_service
+    SyncSessionLocal.configure(bind=original_bind)
+
+
+def submit(text: str = None, kind: str = "summary", payload: dict = None) -> str:
+    job_id = str(uuid.uuid4())
+    with SyncSessionLocal() as db:
+        db.add(GenerationJob(id=job_id, kind=kind, status="queued", progress=0, payload=payload or {"text": text}))
+        db.commit()
+    run_generation_job.delay(job_id)
+    return job_id
+
+
+def load(job_id: str) -> GenerationJob:
+    with SyncSessionLocal() as db:
+        return db.get(GenerationJob, job_id)
+
+
+def test_summary_job_runs_and_reuses_cache(worker, monkeypatch):
+    ai_service = FakeAIService()
+    monkeypatch.setattr(worker, "ai_service", ai_service)
+
+    first = load(submit("Текст материала"))
+    worker.cache.memory.clear()
+    second = load(submit("Текст   материала"))
+
+    assert first.status == "succeeded"
+    assert first.progress == 1.0
+    assert first.result == {"summary": "Краткий конспект"}
+    assert second.result == first.result
+    assert ai_service.calls == 1
+
+
+def test_failed_job_records_error(worker, monkeypatch):
+    monkeypatch.setattr(worker, "ai_service", FakeAIService(fail=True))
+
+    job = load(submit("Другой текст"))
+
+    assert job.status == "failed"
+    assert job.error == "failed"
+    assert job.result is None
+
+
+def test_quiz_job_returns_the_quiz_id(worker, monkeypatch):
+    calls = []
+    progress = []
+
+    async def generate_quiz(material_id, count, force=False, on_question=None):
+        calls.append((material_id, count, force))
+        for accepted in range(1, count + 1):
+            on_question(accepted)
+            with SyncSessionLocal() as db:
+                progress.append(db.query(GenerationJob.progress).scalar())
+        return 42
+
+    monkeypatch.setattr(get_worker_container().quiz_service, "generate_quiz", generate_quiz)
+
+    job = load(submit(kind="quiz", payload={"material_id": 5, "num_questions": 3, "force": True}))
+
+    assert job.status == "succeeded"
+    assert job.result == {"quiz_id": 42, "material_id": 5}
+    assert calls == [(5, 3, True)]
+    assert progress == pytest.approx([0.1 + 0.8 / 3, 0.1 + 1.6 / 3, 0.9])
+    assert job.progress == 1.0
+
+
+def test_startup_requires_a_broker_unless_eager():
+    with pytest.raises(RuntimeError, match="REDIS_URL"):
+        check_broker(SimpleNamespace(REDIS_URL=None, CELERY_TASK_ALWAYS_EAGER=False, PROCESS_ROLE="api"))
+
+    check_broker(SimpleNamespace(REDIS_URL="redis://redis:6379/0", CELERY_TASK_ALWAYS_EAGER=False, PROCESS_ROLE="worker"))
+    check_broker(SimpleNamespace(REDIS_URL=None, CELERY_TASK_ALWAYS_EAGER=True, PROCESS_ROLE="worker"))
@@ -0,0 +1,33 @@
+import json
+import queue
+import logging
+
+from core.logger import SRC_DIR, JsonFormatter, QueueHandler, display_path
+
+
+def test_display_path_is_relative_to_src():
+    assert display_path(str(SRC_DIR / "core" / "crudbase.py")) == "core/crudbase.py"
+    assert display_path("/elsewhere/module.py") == "module.py"
+
+
+def test_queued_record_keeps_message_and_traceback():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test.queue")
+    logger.handlers[:] = [QueueHandler(log_queue)]
+    logger.propagate = False
+
+    payload = {"n": 1}
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.error("failed with %s", payload, exc_info=True)
+    payload["n"] = 2
+
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "failed with {'n': 1}"
+    assert record.exc_info is None and "ZeroDivisionError" in record.exc_text
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed with {'n': 1}"
+    assert entry["level"] == "ERROR"
+    assert "ZeroDivisionError" in entry["exc"]
@@ -0,0 +1,110 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from core.metrics import (
+    DB_QUERIES, HTTP_IN_FLIGHT, HTTP_REQUESTS, LLM_REQUESTS, LLM_TOKENS,
+    Counter, Histogram, MetricsMiddleware, Registry, instrument_engine, track_in_flight,
+)
+from modules.open_ai.service import CHUNK_PROMPT, OpenAIService
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = Histogram("op_seconds", "Op latency.", ["op"], registry, buckets=(0.1, 1))
+    hits = Counter("op_total", "Ops.", ["op"], registry)
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.labels("read").observe(value)
+    hits.labels('a"b').inc(2)
+
+    lines = registry.render().splitlines()
+    assert "# TYPE op_seconds histogram" in lines
+    assert 'op_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'op_seconds_bucket{op="read",le="1"} 3' in lines
+    assert 'op_seconds_bucket{op="read",le="+Inf"} 4' in lines
+    assert 'op_seconds_count{op="read"} 4' in lines
+    assert 'op_seconds_sum{op="read"} 4.05' in lines
+    assert 'op_total{op="a\\"b"} 2' in lines
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI(dependencies=[Depends(track_in_flight)])
+    router = APIRouter(prefix="/v1")
+    in_flight = []
+
+    @router.get("/items/{item_id}")
+    async def item(item_id: int):
+        in_flight.append(HTTP_IN_FLIGHT.labels("/v1/items/{item_id}").value)
+        return {"id": item_id}
+
+    app.include_router(router)
+    app.add_middleware(MetricsMiddleware)
+    client = TestClient(app)
+    before = HTTP_REQUESTS.labels("GET", "/v1/items/{item_id}", "200").value
+    client.get("/v1/items/1")
+    client.get("/v1/items/2")
+    client.get("/nowhere")
+
+    assert HTTP_REQUESTS.labels("GET", "/v1/items/{item_id}", "200").value == before + 2
+    assert HTTP_REQUESTS.labels("GET", "unmatched", "404").value >= 1
+    assert in_flight == [1, 1]
+    assert HTTP_IN_FLIGHT.labels("/v1/items/{item_id}").value == 0
+
+
+def test_engine_events_count_statements():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, "test")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("select 2"))
+    assert DB_QUERIES.labels("test", "SELECT").value == 2
+
+
+class FakeStream:
+    def __init__(self, status):
+        self.text_deltas = self._deltas()
+        self.status = status
+
+    async def _deltas(self):
+        yield "ok"
+
+    async def get_final_run(self):
+        return SimpleNamespace(status=self.status, usage=SimpleNamespace(prompt_tokens=120, completion_tokens=30))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeProvider:
+    def __init__(self, status="completed"):
+        self.status = status
+
+    @asynccontextmanager
+    async def slot(self):
+        threads = SimpleNamespace(create_and_run_stream=lambda **kwargs: FakeStream(self.status))
+        yield SimpleNamespace(beta=SimpleNamespace(threads=threads))
+
+
+def test_llm_calls_record_status_and_tokens():
+    async def consume(service):
+        return [delta async for delta in service.stream_summary("text", prompt=CHUNK_PROMPT)]
+
+    ok_before = LLM_REQUESTS.labels("chunk", "ok").value
+    tokens_before = LLM_TOKENS.labels("chunk", "prompt").value
+    assert asyncio.run(consume(OpenAIService(FakeProvider()))) == ["ok"]
+    assert LLM_REQUESTS.labels("chunk", "ok").value == ok_before + 1
+    assert LLM_TOKENS.labels("chunk", "prompt").value == tokens_before + 120
+
+    failed_before = LLM_REQUESTS.labels("chunk", "failed").value
+    try:
+        asyncio.run(consume(OpenAIService(FakeProvider(status="failed"))))
+    except RuntimeError:
+        pass
+    assert LLM_REQUESTS.labels("chunk", "failed").value == failed_before + 1
@@ -0,0 +1,105 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from models import Material, Quiz, QuizSubmission, User, UserQuizBest, UserStats
+from modules.auth.schemas import Principal
+from modules.overview.crud import UserStatsDatabase
+from modules.overview.service import OverviewService
+
+USER = Principal(id=3, email="a@b.c", role="user")
+
+
+@pytest.mark.parametrize("best_row, stats", [
+    ((1, 4), {"quizzes_completed": 1, "best_score_sum": 4}),  # first attempt at the quiz
+    ((2, 1), {"quizzes_completed": 0, "best_score_sum": 1}),  # beat the previous best by one
+    ((3, 0), None),                                           # no better: user_stats untouched
+])
+def test_record_attempt_adds_only_the_gain(best_row, stats, recording_session):
+    db = recording_session(rows=[best_row])
+
+    asyncio.run(UserStatsDatabase(UserStats).record_attempt(db, 3, 7, 4))
+
+    assert db.statements[0].startswith("INSERT INTO user_quiz_best")
+    assert "ON CONFLICT (user_id, quiz_id) DO UPDATE" in db.statements[0]
+    if stats is None:
+        assert len(db.statements) == 1
+    else:
+        sql, params = db.statements[1], db.params[1]
+        assert sql.startswith("INSERT INTO user_stats") and "ON CONFLICT (user_id) DO UPDATE" in sql
+        assert {k: params[k] for k in stats} == stats
+        assert "materials_count" not in sql.split("DO UPDATE")[1]
+
+
+def test_overview_is_one_primary_key_read():
+    reads = []
+
+    async def find(db, user_id):
+        reads.append(user_id)
+        return UserStats(user_id=user_id, materials_count=4, quizzes_completed=2, best_score_sum=7) if user_id == 3 else None
+
+    service = OverviewService(SimpleNamespace(find=find))
+
+    overview = asyncio.run(service.get_overview(USER, None))
+    empty = asyncio.run(service.get_overview(Principal(id=9, email="x@b.c", role="user"), None))
+
+    assert (overview.materials, overview.completed_quizzes, overview.avg_best_score) == (4, 2, 3.5)
+    assert (empty.materials, empty.completed_quizzes, empty.avg_best_score) == (0, 0, None)
+    assert reads == [3, 9]
+
+
+@pytest.mark.postgres
+def test_stats_follow_attempts_deletes_and_rebuild_on_postgres(pg):
+    async def scenario(db):
+        user = User(email="a@b.c", password_hash="x")
+        db.add(user)
+        await db.flush()
+        materials = [Material(user_id=user.id, title="T", text="t") for _ in range(2)]
+        db.add_all(materials)
+        await db.flush()
+        quizzes = [Quiz(material_id=material.id, question_count=4) for material in materials]
+        db.add_all(quizzes)
+        await db.flush()
+        user_id, (first, second) = user.id, [quiz.id for quiz in quizzes]
+
+        stats = UserStatsDatabase(UserStats)
+
+        async def snapshot():
+            totals = (await db.execute(
+                select(UserStats.materials_count, UserStats.quizzes_completed, UserStats.best_score_sum)
+                .where(UserStats.user_id == user_id)
+            )).one()
+            best = (await db.execute(
+                select(UserQuizBest.quiz_id, UserQuizBest.best_score, UserQuizBest.attempts, UserQuizBest.last_gain)
+                .where(UserQuizBest.user_id == user_id)
+                .order_by(UserQuizBest.quiz_id)
+            )).all()
+            drift = await stats.find_drift(db, user_id)
+            return tuple(totals), [tuple(row) for row in best], [tuple(row) for row in drift]
+
+        await stats.add_materials(db, user_id, 2)
+        for quiz_id, score in ((first, 2), (first, 3), (first, 1), (second, 4)):
+            db.add(QuizSubmission(quiz_id=quiz_id, user_id=user_id, score=score, score_weighted=score, total_questions=4, answers=[]))
+            await stats.record_attempt(db, user_id, quiz_id, score)
+        after_attempts = await snapshot()
+
+        await stats.forget_material_quizzes(db, materials[0].id)
+        await db.execute(delete(Quiz).where(Quiz.id == first))
+        after_delete = await snapshot()
+
+        await db.execute(update(UserStats).where(UserStats.user_id == user_id).values(best_score_sum=0))
+        drifted = await snapshot()
+        written = await stats.rebuild(db, user_id)
+        after_rebuild = await snapshot()
+
+        return user_id, (first, second), after_attempts, after_delete, drifted, written, after_rebuild
+
+    user_id, (first, second), after_attempts, after_delete, drifted, written, after_rebuild = pg(scenario)
+
+    assert after_attempts == ((2, 2, 7), [(first, 3, 3, 0), (second, 4, 1, 4)], [])
+    assert after_delete == ((2, 1, 4), [(second, 4, 1, 4)], [])
+    assert drifted[2] == [(user_id, 2, 1, 0, 2, 1, 4)]  # stored totals, then the aggregate
+    assert written == 1
+    assert after_rebuild == ((2, 1, 4), [(second, 4, 1, 0)], [])
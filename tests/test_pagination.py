@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from models import User, UserSkillMastery
+from schemas import ListResponse
+from core.crudbase import CRUDBase
+from modules.user.schemas import UserAdmin
+
+
+@pytest.fixture
+def db(sqlite_db):
+    session = sqlite_db.session
+    User.__table__.create(session.get_bind())
+    session.add_all(
+        User(id=i, email=f"user{i}@example.com", phone_number=f"+7700000{i:04d}", password_hash="x", role="user",
+             created_at=datetime(2024, 1, 1, tzinfo=timezone.utc))
+        for i in range(1, 26)
+    )
+    session.commit()
+    return sqlite_db
+
+
+def collect(crud, db, **kwargs):
+    pages, cursor = [], None
+    while True:
+        objects, cursor = asyncio.run(crud.get_page(db, limit=10, cursor=cursor, **kwargs))
+        pages.append([o.id for o in objects])
+        if cursor is None:
+            return pages
+
+
+def test_keyset_pages_cover_the_table_once(db):
+    crud = CRUDBase(User)
+    assert collect(crud, db) == [list(range(1, 11)), list(range(11, 21)), list(range(21, 26))]
+    assert collect(crud, db, descending=True)[0] == list(range(25, 15, -1))
+
+
+def test_cursor_is_bound_to_its_ordering(db):
+    crud = CRUDBase(User)
+    _, cursor = asyncio.run(crud.get_page(db, limit=10))
+
+    for bad in ("not-a-cursor", CRUDBase.encode_cursor(["email", "id"], ["x", 1])):
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(crud.get_page(db, limit=10, cursor=bad))
+        assert exc.value.status_code == 400
+
+
+def test_datetime_cursor_round_trip():
+    value = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = CRUDBase.encode_cursor(["created_at", "id"], [value, 7])
+    assert CRUDBase.decode_cursor(cursor, ["created_at", "id"]) == [value, 7]
+
+
+def test_unindexed_ordering_is_rejected(db):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(CRUDBase(User).get_page(db, order_by=("first_name",)))
+    assert exc.value.status_code == 400
+
+
+def test_composite_primary_key_is_the_tie_breaker(db):
+    UserSkillMastery.__table__.create(db.session.get_bind())
+    db.session.add_all(
+        UserSkillMastery(user_id=user_id, tag=tag, mastery=0.5)
+        for user_id in (2, 1) for tag in ("митоз", "клетка", "мейоз")
+    )
+    db.session.flush()
+    crud = CRUDBase(UserSkillMastery)
+
+    pages, cursor = [], None
+    while True:
+        rows, cursor = asyncio.run(crud.get_page(db, limit=4, cursor=cursor))
+        pages.append([(r.user_id, r.tag) for r in rows])
+        if cursor is None:
+            break
+
+    assert pages == [
+        [(1, "клетка"), (1, "мейоз"), (1, "митоз"), (2, "клетка")],
+        [(2, "мейоз"), (2, "митоз")],
+    ]
+
+
+def test_exact_count_is_cached(db):
+    crud = CRUDBase(User, count_ttl=60)
+    assert asyncio.run(crud.count_cached(db)) == 25
+
+    db.session.add(User(email="late@example.com", password_hash="x", role="user"))
+    db.session.flush()
+    assert asyncio.run(crud.count_cached(db)) == 25
+    assert asyncio.run(crud.count(db)) == 26
+
+
+def test_list_response_accepts_orm_rows(db):
+    users, cursor = asyncio.run(CRUDBase(User).get_page(db, limit=2))
+    response = ListResponse[UserAdmin](data=users, total=25, next_cursor=cursor)
+    assert [u.email for u in response.data] == ["user1@example.com", "user2@example.com"]
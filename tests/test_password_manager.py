@@ -0,0 +1,33 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from modules.auth.password_manager import PasswordManager
+
+
+def test_verify_and_update_rehashes_when_cost_changes():
+    old = PasswordManager(rounds=4, workers=1)
+    new = PasswordManager(rounds=5, workers=1)
+    hashed = asyncio.run(old.hash("secret123"))
+
+    assert asyncio.run(old.verify_and_update("secret123", hashed)) == (True, None)
+
+    valid, new_hash = asyncio.run(new.verify_and_update("secret123", hashed))
+    assert valid
+    assert new_hash.startswith("$2b$05$")
+    assert asyncio.run(new.verify_and_update("secret123", new_hash)) == (True, None)
+    assert asyncio.run(new.verify_and_update("wrong", hashed)) == (False, None)
+
+
+def test_queue_limit_rejects_with_503():
+    pm = PasswordManager(rounds=4, workers=1, max_pending=2)
+
+    async def spike():
+        return await asyncio.gather(*(pm.hash("secret123") for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(spike())
+
+    rejected = [r for r in results if isinstance(r, HTTPException)]
+    assert len(rejected) == 1
+    assert rejected[0].status_code == 503
+    assert pm.pending == 0
@@ -0,0 +1,85 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from modules.auth.principal import PrincipalCache
+from modules.auth.revocation import InMemoryRevocationStore
+from modules.auth.service import AuthService
+from modules.user.service import UserService
+
+
+class FakeUserDatabase:
+    def __init__(self, **users):
+        self.users = {user.id: user for user in users.values()}
+        self.reads = 0
+
+    async def get(self, db, id):
+        self.reads += 1
+        if id not in self.users:
+            raise HTTPException(status_code=404, detail="User not found")
+        return self.users[id]
+
+    async def update(self, db, db_obj, obj_in):
+        for field, value in obj_in.items():
+            setattr(db_obj, field, value)
+        return db_obj
+
+
+def make_auth_service(trust_token_claims=False):
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    database = FakeUserDatabase(alice=SimpleNamespace(id=1, email="alice@example.com", role="user"))
+    user_service = UserService(user_database=database, principal_cache=cache)
+    auth_service = AuthService(
+        jwt_service=None,
+        password_manager=None,
+        user_service=user_service,
+        principal_cache=cache,
+        revocation_store=InMemoryRevocationStore(),
+        trust_token_claims=trust_token_claims,
+    )
+    return auth_service, database
+
+
+def access_payload(**claims):
+    return {"sub": "alice@example.com", "id": 1, "role": "user", "type": "access", **claims}
+
+
+def test_principal_is_loaded_once_and_refreshed_after_update():
+    auth_service, database = make_auth_service()
+
+    first = asyncio.run(auth_service.resolve_principal(access_payload(), db=None))
+    second = asyncio.run(auth_service.resolve_principal(access_payload(), db=None))
+    assert first is second
+    assert database.reads == 1
+
+    asyncio.run(auth_service.user_service.update_user(1, {"role": "admin"}, db=None))
+    reads = database.reads
+    principal = asyncio.run(auth_service.resolve_principal(access_payload(), db=None))
+    assert principal.role == "admin"
+    assert database.reads == reads + 1
+
+
+def test_invalidation_blocks_a_load_that_started_before_it():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    auth_service, _ = make_auth_service()
+    stale = asyncio.run(auth_service.resolve_principal(access_payload(), db=None))
+
+    cache.invalidate(1)
+    cache.set(stale)
+    assert cache.get(1) is None
+
+
+def test_token_for_another_email_is_rejected():
+    auth_service, _ = make_auth_service()
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_service.resolve_principal(access_payload(sub="mallory@example.com"), db=None))
+    assert exc.value.status_code == 403
+
+
+def test_claims_only_mode_skips_the_database():
+    auth_service, database = make_auth_service(trust_token_claims=True)
+    principal = asyncio.run(auth_service.resolve_principal(access_payload(role="admin"), db=None))
+    assert (principal.id, principal.role) == (1, "admin")
+    assert database.reads == 0
@@ -0,0 +1,74 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from core.logger import logger
+from core.query_tracker import (
+    QueryBudgetExceeded, QueryTracker, QueryTrackingMiddleware, install_query_tracking, query_budget,
+)
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://")
+    install_query_tracking(engine)
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(n: int = 1):
+        with engine.connect() as conn:
+            for i in range(n):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"n": n}
+
+    @app.get("/plain")
+    async def plain():
+        return {}
+
+    app.add_middleware(QueryTrackingMiddleware, n_plus_one_threshold=3)
+    return TestClient(app)
+
+
+def test_server_timing_reports_query_count(client):
+    response = client.get("/items", params={"n": 2})
+    assert response.headers["server-timing"].endswith('desc="2 queries"')
+    assert "server-timing" not in client.get("/plain").headers
+
+
+def test_repeated_shapes_are_flagged():
+    tracker = QueryTracker()
+    for i in range(4):
+        tracker.record("SELECT * FROM quiz_questions\n WHERE quiz_id = ?", 0.001)
+    tracker.record("SELECT * FROM quizzes WHERE id = ?", 0.001)
+
+    assert tracker.repeated(3) == [("SELECT * FROM quiz_questions WHERE quiz_id = ?", 4)]
+    assert tracker.count == 5
+
+
+def test_query_budget_fails_the_request(client):
+    with query_budget(3):
+        client.get("/items", params={"n": 3})
+        with pytest.raises(QueryBudgetExceeded):
+            client.get("/items", params={"n": 4})
+    client.get("/items", params={"n": 4})
+
+
+def test_configured_budget_only_warns(caplog):
+    engine = create_engine("sqlite://")
+    install_query_tracking(engine)
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    app.add_middleware(QueryTrackingMiddleware, budget=2)
+    with caplog.at_level("WARNING", logger=logger.name):
+        response = TestClient(app).get("/items")
+
+    assert response.status_code == 200
+    assert "ran 3 queries, budget is 2" in caplog.text
@@ -0,0 +1,227 @@
+import json
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from modules.auth.schemas import Principal
+from modules.quiz.cache import QuizCache, QuizInvalidations, QuizView
+from modules.quiz.service import QuizService
+
+CREATED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+OWNER = Principal(id=1, email="a@b.c", role="user")
+
+
+def rows(quiz_id: int = 7, material_id: int = 5) -> list[tuple]:
+    # QuizDatabase.load_view_rows
+    return [
+        (11, 2, ["клетка"], "Q11", ["A", "B", "C", "D"], {"2": "верно"}, material_id, 1, "easy", "remember", ["h1", "h2"], quiz_id, 2, CREATED),
+        (12, 0, ["митоз"], "Q12", ["A", "B", "C", "D"], {}, material_id, 1, "hard", "apply", [], quiz_id, 2, CREATED),
+    ]
+
+
+def make_service(loads: list) -> QuizService:
+    async def load_view_rows(db, quiz_id=None, material_id=None):
+        loads.append(quiz_id or ("material", material_id))
+        return rows()
+
+    return QuizService(
+        generator=None,
+        quiz_database=SimpleNamespace(load_view_rows=load_view_rows),
+        question_database=None,
+        material_database=None,
+        submission_database=None,
+        mastery_database=None,
+        review_database=None,
+        stats_database=None,
+        cache=QuizCache(maxsize=16, ttl=60),
+    )
+
+
+def test_public_json_leaks_no_answers():
+    view = QuizView.from_rows(rows())
+
+    public = json.loads(view.public_json)
+
+    assert public["id"] == 7 and public["material_id"] == 5 and public["question_count"] == 2
+    assert [q["id"] for q in public["questions"]] == [11, 12]
+    for question in public["questions"]:
+        assert not {"correct_index", "hints", "rationales"} & question.keys()
+    assert view.hints == {11: ("h1", "h2"), 12: ()}
+    assert view.key.correct.tolist() == [2, 0]
+
+
+def test_hints_are_served_from_one_load():
+    loads = []
+    service = make_service(loads)
+
+    first = asyncio.run(service.get_hint(7, 11, 1, OWNER, None))
+    second = asyncio.run(service.get_hint(7, 11, 2, OWNER, None))
+    asyncio.run(service.get_material_quiz(5, OWNER, None))
+
+    assert (first.hint, second.hint, second.penalty) == ("h1", "h2", 0.25)
+    assert loads == [7]
+
+    for question_id, level, status in ((99, 1, 404), (12, 1, 404)):
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(service.get_hint(7, question_id, level, OWNER, None))
+        assert e.value.status_code == status
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(service.get_hint(7, 11, 1, Principal(id=2, email="x@b.c", role="user"), None))
+    assert e.value.status_code == 403
+
+
+def test_invalidate_drops_both_keys_and_blocks_stale_writes():
+    cache = QuizCache(maxsize=16, ttl=60)
+    old = QuizView.from_rows(rows(quiz_id=7))
+    cache.set(old)
+
+    cache.invalidate(5, 7)
+    # A request that read the old rows before the new quiz was committed.
+    cache.set(old)
+
+    assert cache.get(7) is None and cache.get_by_material(5) is None
+
+    new = QuizView.from_rows(rows(quiz_id=8))
+    cache.set(new)
+    assert cache.get(8) is new
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        pass
+
+
+def generating_service(monkeypatch, quizzes: dict, during_generation=lambda: None) -> tuple[QuizService, list]:
+    """
+    QuizService whose tables are `quizzes` (material id -> quiz id); returns it with the
+    list of generator calls and writes made.
+    """
+    monkeypatch.setattr("modules.quiz.service.SessionLocal", FakeSession)
+    calls = []
+
+    async def generate(text, count, on_question=None):
+        calls.append("generate")
+        await asyncio.sleep(0.01)
+        during_generation()
+        return []
+
+    async def find_by_material(db, material_id, lock=False):
+        return SimpleNamespace(id=quizzes[material_id]) if material_id in quizzes else None
+
+    async def delete_where(db, material_id):
+        calls.append(("delete", quizzes.pop(material_id, None)))
+
+    async def create(db, obj_in):
+        quizzes[obj_in["material_id"]] = 20 + len(calls)
+        return SimpleNamespace(id=quizzes[obj_in["material_id"]])
+
+    async def get_material(db, material_id):
+        return SimpleNamespace(id=material_id, text="текст")
+
+    async def noop(*args, **kwargs):
+        pass
+
+    service = QuizService(
+        generator=SimpleNamespace(generate=generate),
+        quiz_database=SimpleNamespace(find_by_material=find_by_material, delete_where=delete_where, create=create),
+        question_database=SimpleNamespace(create_many=noop),
+        material_database=SimpleNamespace(get=get_material, lock=noop),
+        submission_database=None,
+        mastery_database=None,
+        review_database=None,
+        stats_database=SimpleNamespace(forget_material_quizzes=noop),
+        cache=QuizCache(maxsize=16, ttl=60),
+    )
+    return service, calls
+
+
+def test_generate_without_force_keeps_an_existing_quiz(monkeypatch):
+    service, calls = generating_service(monkeypatch, {5: 7})
+
+    assert asyncio.run(service.generate_quiz(5, 2)) == 7
+    assert calls == []
+
+    assert asyncio.run(service.generate_quiz(5, 2, force=True)) == 22
+    assert calls == ["generate", ("delete", 7)]
+
+
+def test_generate_keeps_a_quiz_created_during_generation(monkeypatch):
+    quizzes = {}
+    # Another process commits a quiz for the material while the questions are generated.
+    service, calls = generating_service(monkeypatch, quizzes, during_generation=lambda: quizzes.setdefault(5, 8))
+
+    async def racing():
+        return await asyncio.gather(service.generate_quiz(5, 2), service.generate_quiz(5, 2))
+
+    assert asyncio.run(racing()) == [8, 8]
+    assert calls == ["generate"]
+    assert quizzes == {5: 8}
+
+
+class FakeRedis:
+    """
+    The pub/sub part of redis.asyncio.Redis, in memory: every subscription gets its own queue.
+    """
+
+    def __init__(self):
+        self.subscribers: list[asyncio.Queue] = []
+
+    async def publish(self, channel, data):
+        for queue in self.subscribers:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def aclose(self):
+        pass
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.queue: asyncio.Queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        self.redis.subscribers.remove(self.queue)
+
+
+def test_job_replacing_a_quiz_clears_the_api_cache(monkeypatch):
+    redis = FakeRedis()
+    api_loads = []
+    api = make_service(api_loads)
+    api.invalidations = QuizInvalidations(redis, api.cache)
+    worker, calls = generating_service(monkeypatch, {5: 7})
+    worker.invalidations = QuizInvalidations(redis, worker.cache)
+
+    async def scenario():
+        await api.invalidations.start()
+        await api.get_material_quiz(5, OWNER, None)
+        assert api.cache.get(7) is not None
+
+        new_quiz_id = await worker.generate_quiz(5, 2, force=True)
+        for _ in range(3):
+            await asyncio.sleep(0)
+        await api.invalidations.aclose()
+        return new_quiz_id
+
+    assert asyncio.run(scenario()) == 22
+    assert calls == ["generate", ("delete", 7)]
+    assert api.cache.get(7) is None and api.cache.get_by_material(5) is None
+    assert redis.subscribers == []
@@ -0,0 +1,143 @@
+import json
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from modules.open_ai.fake import FakeOpenAIService
+from modules.quiz.parser import JSONItemStream
+from modules.quiz.generator import QuizGenerator, parse_question
+
+
+def question(n: int, **overrides) -> dict:
+    return {
+        "question_text": f"Что происходит на шаге {n}?",
+        "options": ["Деление", "Рост", "Синтез", "Распад"],
+        "correct_index": n % 4,
+        "difficulty": "medium",
+        "tags": ["Клетка"],
+        "bloom": "remember",
+        "hints": ["Вспомни {фазы}"],
+        "rationales": {"0": "Да", "1": "Нет", "2": "Нет", "3": "Нет"},
+        **overrides,
+    }
+
+
+class ScriptedAI:
+    """
+    Streams canned responses, one per call, in small chunks.
+    """
+
+    def __init__(self, *responses: str, chunk: int = 7):
+        self.responses = list(responses)
+        self.chunk = chunk
+        self.prompts: list[tuple[str, str]] = []
+        self.closed = 0
+
+    async def stream_completion(self, content: str, operation: str = "custom"):
+        self.prompts.append((operation, content))
+        response = self.responses.pop(0)
+        try:
+            for start in range(0, len(response), self.chunk):
+                yield response[start:start + self.chunk]
+        finally:
+            self.closed += 1
+
+
+def feed_all(document: str, chunk: int) -> tuple[list[str], JSONItemStream]:
+    parser = JSONItemStream()
+    items = []
+    for start in range(0, len(document), chunk):
+        items.extend(parser.feed(document[start:start + chunk]))
+    return items, parser
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 1000])
+def test_parser_emits_items_as_they_complete(chunk):
+    questions = [question(1), question(2, question_text='Кавычки \\" и скобки } ] {')]
+    document = "```json\n" + json.dumps({"questions": questions}, ensure_ascii=False) + "\n```"
+
+    items, parser = feed_all(document, chunk)
+
+    assert [json.loads(item) for item in items] == questions
+    assert parser.done and parser.close() is None
+
+
+def test_parser_reports_truncated_item_and_bare_arrays():
+    items, parser = feed_all(json.dumps([question(1)]) + "junk", 5)
+    assert len(items) == 1 and parser.done
+
+    document = json.dumps({"questions": [question(1), question(2)]})
+    items, parser = feed_all(document[:-40], 5)
+    assert len(items) == 1
+    assert parser.close().startswith('{"question_text"')
+
+
+def test_parse_question_validation():
+    ok, error = parse_question(json.dumps(question(1, tags=[" Клетка ", "клетка"], rationales=["a", "b", "c", "d"])))
+    assert error is None and ok.tags == ["клетка"] and ok.rationales["3"] == "d"
+
+    for overrides in (
+        {"correct_index": 4},
+        {"options": ["A", "a", "B", "C"]},
+        {"options": ["A", "B", "C"]},
+        {"tags": []},
+        {"hints": ["1", "2", "3"]},
+        {"difficulty": "extreme"},
+        {"rationales": {"5": "?"}},
+    ):
+        assert parse_question(json.dumps(question(1, **overrides)))[1] is not None, overrides
+
+    assert parse_question("{'question_text': 1}")[1].startswith("invalid JSON")
+
+
+def test_only_invalid_questions_are_retried():
+    first = json.dumps({"questions": [question(1), question(2, correct_index=9), question(3)]})
+    repair = json.dumps({"questions": [question(2)]})
+    ai = ScriptedAI(first, repair)
+
+    questions = asyncio.run(QuizGenerator(ai).generate("Материал о клетке", 3))
+
+    assert [q.question_text for q in questions] == [question(n)["question_text"] for n in (1, 3, 2)]
+    (_, initial), (operation, repair_prompt) = ai.prompts
+    assert "Материал о клетке" in initial
+    assert operation == "quiz_repair"
+    assert "Количество вопросов: 1" in repair_prompt
+    assert "correct_index" in repair_prompt and '"correct_index": 9' in repair_prompt
+    # Fixing a question does not need the material again.
+    assert "Материал о клетке" not in repair_prompt
+
+
+def test_missing_questions_are_generated_from_the_material():
+    truncated = json.dumps({"questions": [question(1), question(2)]})[:-60]
+    ai = ScriptedAI(truncated, json.dumps({"questions": [question(1), question(5)]}))
+
+    questions = asyncio.run(QuizGenerator(ai).generate("Материал о клетке", 2))
+
+    assert [q.question_text for q in questions] == [question(n)["question_text"] for n in (1, 5)]
+    repair_prompt = ai.prompts[1][1]
+    assert "Материал о клетке" in repair_prompt
+    assert question(1)["question_text"] in repair_prompt
+
+
+def test_stream_is_closed_once_enough_questions_arrived():
+    ai = ScriptedAI(json.dumps({"questions": [question(n) for n in range(1, 9)]}))
+
+    questions = asyncio.run(QuizGenerator(ai).generate("Материал", 2))
+
+    assert len(questions) == 2
+    assert ai.closed == 1 and len(ai.prompts) == 1
+
+
+def test_no_valid_question_is_an_error():
+    ai = ScriptedAI("not json at all", '{"questions": [{"question_text": "?"}]}')
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(QuizGenerator(ai, repair_rounds=1).generate("Материал", 3))
+    assert e.value.status_code == 422 and e.value.detail == "llm_invalid_json"
+
+
+def test_fake_provider_answers_quiz_prompts():
+    questions = asyncio.run(QuizGenerator(FakeOpenAIService(deltas=20)).generate("Материал", 4))
+
+    assert len(questions) == 4 and len({q.question_text for q in questions}) == 4
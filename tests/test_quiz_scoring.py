@@ -0,0 +1,180 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from models import User, UserSkillMastery
+from modules.auth.schemas import Principal
+from modules.quiz.cache import QuizCache
+from modules.quiz.crud import MasteryDatabase
+from modules.quiz.schemas import AnswerSubmit, SubmitRequest
+from modules.quiz.scoring import AnswerKey, score
+from modules.quiz.service import QuizService
+
+OPTIONS = ["A", "B", "C", "D"]
+CREATED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# QuizDatabase.load_view_rows: (id, correct_index, tags, question_text, options, rationales,
+# material_id, owner_id, difficulty, bloom, hints, quiz_id, question_count, created_at)
+ROWS = [
+    (11, 0, ["клетка"], "Q11", OPTIONS, {"0": "верно", "1": "нет"}, 5, 1, "easy", "remember", ["h1", "h2"], 7, 4, CREATED),
+    (12, 1, ["клетка", "митоз"], "Q12", OPTIONS, {}, 5, 1, "medium", "understand", [], 7, 4, CREATED),
+    (13, 2, ["митоз"], "Q13", OPTIONS, {}, 5, 1, "medium", "apply", ["h"], 7, 4, CREATED),
+    (14, 3, ["мейоз"], "Q14", OPTIONS, {}, 5, 1, "hard", "analyze", [], 7, 4, CREATED),
+]
+
+
+def answer(question_id: int, index: int, confidence: str = "med", hints=()) -> AnswerSubmit:
+    return AnswerSubmit(question_id=question_id, answer_index=index, confidence=confidence, hints_used=list(hints))
+
+
+def test_score_brier_penalty_and_tags():
+    key = AnswerKey.from_rows(7, ROWS)
+
+    result = score(key, [
+        answer(13, 2, "high", hints=[1, 1]),
+        answer(11, 0, "low", hints=[1, 2]),
+        answer(12, 3, "high"),
+    ])
+
+    assert result.score == 2
+    assert result.penalty == pytest.approx(0.75)  # unique hint levels: 1 + 2
+    assert result.score_weighted == pytest.approx(1.25)
+    assert result.brier == pytest.approx(((0.85 - 1) ** 2 + (0.55 - 1) ** 2 + 0.85 ** 2) / 3)
+    assert result.calibration == {
+        "low": {"count": 1, "accuracy": 1.0, "p": 0.55},
+        "high": {"count": 2, "accuracy": 0.5, "p": 0.85},
+    }
+    assert result.tag_accuracy == {"клетка": 0.5, "митоз": 0.5}
+    assert result.rows.tolist() == [2, 0, 1]
+
+
+def test_score_weighted_is_not_negative():
+    key = AnswerKey.from_rows(7, ROWS)
+
+    result = score(key, [answer(11, 1, hints=[1, 2]), answer(12, 0, hints=[2])])
+
+    assert result.score == 0 and result.score_weighted == 0.0
+
+
+@pytest.mark.parametrize("answers", [
+    [answer(99, 0)],
+    [answer(10, 0)],
+    [answer(11, 0), answer(11, 1)],
+])
+def test_score_rejects_foreign_or_repeated_questions(answers):
+    with pytest.raises(HTTPException) as e:
+        score(AnswerKey.from_rows(7, ROWS), answers)
+    assert e.value.status_code == 400
+
+
+def test_submit_writes_one_statement_per_table():
+    calls = []
+
+    async def load_view_rows(db, quiz_id=None, material_id=None):
+        calls.append("select")
+        return ROWS
+
+    async def lock_key(db, quiz_id):
+        calls.append("lock")
+        return True
+
+    async def create(db, obj):
+        calls.append("submission")
+        return SimpleNamespace(id=101, **obj)
+
+    async def apply_ema(db, user_id, accuracy, alpha):
+        calls.append("mastery")
+        return {tag: 0.5 for tag in accuracy}
+
+    async def create_many(db, rows):
+        calls.append(("review", [row["prompt"] for row in rows]))
+        return rows
+
+    async def record_attempt(db, user_id, quiz_id, score):
+        calls.append(("stats", quiz_id, score))
+
+    async def commit():
+        calls.append("commit")
+
+    service = QuizService(
+        generator=None,
+        quiz_database=SimpleNamespace(load_view_rows=load_view_rows, lock_key=lock_key),
+        question_database=None,
+        material_database=None,
+        submission_database=SimpleNamespace(create=create),
+        mastery_database=SimpleNamespace(apply_ema=apply_ema),
+        review_database=SimpleNamespace(create_many=create_many),
+        stats_database=SimpleNamespace(record_attempt=record_attempt),
+        cache=QuizCache(maxsize=8, ttl=60),
+    )
+    data = SubmitRequest(answers=[answer(11, 0), answer(12, 0), answer(14, 1)])
+
+    response = asyncio.run(service.submit(7, data, Principal(id=1, email="a@b.c", role="user"), SimpleNamespace(commit=commit)))
+
+    assert calls == ["select", "lock", "submission", ("stats", 7, 1), "mastery", ("review", ["Q12", "Q14"]), "commit"]
+    assert response.submission_id == 101 and response.score == 1 and response.review_cards == 2
+    assert response.results[0].explanation == "верно"
+    assert {m.tag for m in response.mastery} == {"клетка", "митоз", "мейоз"}
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(service.submit(7, data, Principal(id=2, email="x@b.c", role="user"), SimpleNamespace(commit=commit)))
+    assert e.value.status_code == 403
+
+
+def test_submit_to_a_replaced_quiz_drops_the_stale_view():
+    loads = []
+
+    async def load_view_rows(db, quiz_id=None, material_id=None):
+        loads.append(quiz_id)
+        return ROWS
+
+    async def lock_key(db, quiz_id):
+        return False  # another process has regenerated the material's quiz
+
+    async def rollback():
+        pass
+
+    cache = QuizCache(maxsize=8, ttl=60)
+    service = QuizService(
+        generator=None,
+        quiz_database=SimpleNamespace(load_view_rows=load_view_rows, lock_key=lock_key),
+        question_database=None,
+        material_database=None,
+        submission_database=None,
+        mastery_database=None,
+        review_database=None,
+        stats_database=None,
+        cache=cache,
+    )
+    data = SubmitRequest(answers=[answer(11, 0)])
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(service.submit(7, data, Principal(id=1, email="a@b.c", role="user"), SimpleNamespace(rollback=rollback)))
+
+    assert (e.value.status_code, e.value.detail) == (409, "quiz_replaced")
+    assert cache.get(7) is None and cache.get_by_material(5) is None
+
+
+@pytest.mark.postgres
+def test_apply_ema_upserts_every_tag(pg):
+    async def scenario(db):
+        user = User(email="a@b.c", password_hash="x")
+        db.add(user)
+        await db.flush()
+        db.add(UserSkillMastery(user_id=user.id, tag="клетка", mastery=0.8))
+        await db.flush()
+
+        returned = await MasteryDatabase(UserSkillMastery).apply_ema(db, user.id, {"клетка": 0.0, "митоз": 1.0}, alpha=0.5)
+        stored = (await db.execute(
+            select(UserSkillMastery.tag, UserSkillMastery.mastery).where(UserSkillMastery.user_id == user.id)
+        )).all()
+        return returned, dict(stored)
+
+    returned, stored = pg(scenario)
+
+    # An existing row moves from its value (0.5 * 0.8 + 0.5 * 0), a new one from the prior (0.5 * 0.5 + 0.5 * 1).
+    assert returned == pytest.approx({"клетка": 0.4, "митоз": 0.75})
+    assert stored == pytest.approx(returned)
@@ -0,0 +1,50 @@
+import asyncio
+
+from core.rate_limit import InMemoryBackend, RateLimiter
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def hit(limiter: RateLimiter, identity: str):
+    return asyncio.run(limiter.hit(identity))
+
+
+def test_bucket_allows_burst_then_returns_retry_after():
+    clock = Clock()
+    limiter = RateLimiter(InMemoryBackend(clock=clock), limit=5, period=60)
+
+    results = [hit(limiter, "1") for _ in range(6)]
+
+    assert [r.allowed for r in results] == [True] * 5 + [False]
+    assert results[4].remaining == 0
+    assert results[5].retry_after == 12
+    assert results[5].headers["Retry-After"] == "12"
+
+
+def test_bucket_refills_over_time_per_user():
+    clock = Clock()
+    limiter = RateLimiter(InMemoryBackend(clock=clock), limit=5, period=60)
+    for _ in range(5):
+        hit(limiter, "1")
+
+    assert not hit(limiter, "1").allowed
+    assert hit(limiter, "2").allowed
+
+    clock.now = 12
+    assert hit(limiter, "1").allowed
+    assert not hit(limiter, "1").allowed
+
+
+def test_key_table_is_bounded():
+    backend = InMemoryBackend(max_keys=3)
+    limiter = RateLimiter(backend, limit=5)
+    for identity in range(10):
+        hit(limiter, str(identity))
+
+    assert len(backend._buckets) == 3
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from models import Material, ReviewCard, User
+from modules.auth.schemas import Principal
+from modules.review.crud import ReviewCardDatabase
+from modules.review.schemas import BulkGradeRequest, CardGrade
+from modules.review.service import ReviewService
+
+USER = Principal(id=3, email="a@b.c", role="user")
+
+
+def test_due_page_uses_keyset_on_due_index(recording_session):
+    crud = ReviewCardDatabase(ReviewCard)
+    cursor = crud.encode_cursor(["user_id", "next_review_at", "id"], [3, datetime(2025, 1, 1, tzinfo=timezone.utc), 40])
+    db = recording_session()
+
+    asyncio.run(crud.get_due_page(db, 3, datetime.now(timezone.utc), 20, cursor))
+
+    sql = db.statements[0]
+    assert "review_cards.next_review_at <= " in sql and "review_cards.user_id = " in sql
+    assert "(review_cards.user_id, review_cards.next_review_at, review_cards.id) > " in sql
+    assert "ORDER BY review_cards.user_id ASC, review_cards.next_review_at ASC, review_cards.id ASC" in sql
+    assert "OFFSET" not in sql
+
+
+def test_grade_many_cards_in_one_update(recording_session):
+    now = datetime.now(timezone.utc)
+    db = recording_session(rows=[(8, now + timedelta(days=5), 3), (5, now + timedelta(hours=8), 1)])
+    service = ReviewService(ReviewCardDatabase(ReviewCard))
+
+    results = asyncio.run(service.grade(
+        [CardGrade(card_id=5, grade="again"), CardGrade(card_id=8, grade="easy")], USER, db,
+    ))
+
+    assert len(db.statements) == 1 and db.statements[0].startswith("UPDATE review_cards SET")
+    assert "FROM (VALUES" in db.statements[0]
+    assert [r.id for r in results] == [5, 8] and db.committed
+
+
+def test_grade_rejects_foreign_or_missing_cards(recording_session):
+    db = recording_session(rows=[(5, datetime.now(timezone.utc), 2)])
+    service = ReviewService(ReviewCardDatabase(ReviewCard))
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(service.grade([CardGrade(card_id=5, grade="good"), CardGrade(card_id=6, grade="good")], USER, db))
+
+    assert e.value.status_code == 404
+    assert db.rolled_back and not db.committed
+
+
+def test_bulk_grade_rejects_repeated_cards():
+    with pytest.raises(ValidationError):
+        BulkGradeRequest(grades=[{"card_id": 1, "grade": "good"}, {"card_id": 1, "grade": "easy"}])
+
+
+@pytest.mark.postgres
+def test_due_pages_and_reschedule_on_postgres(pg):
+    now = datetime.now(timezone.utc)
+
+    async def scenario(db):
+        user, other = User(email="a@b.c", password_hash="x"), User(email="x@b.c", password_hash="x")
+        db.add_all([user, other])
+        await db.flush()
+        material = Material(user_id=user.id, title="T", text="t")
+        db.add(material)
+        await db.flush()
+
+        def card(owner, due):
+            return ReviewCard(user_id=owner.id, material_id=material.id, prompt="Q", answer="A", next_review_at=due, ease=2)
+
+        due = [card(user, now - timedelta(hours=hours)) for hours in (1, 2, 3)]
+        later, foreign = card(user, now + timedelta(days=1)), card(other, now - timedelta(days=1))
+        db.add_all([*due, later, foreign])
+        await db.flush()
+        ids = [c.id for c in due]
+
+        crud = ReviewCardDatabase(ReviewCard)
+        first, cursor = await crud.get_due_page(db, user.id, now, 2)
+        second, last = await crud.get_due_page(db, user.id, now, 2, cursor)
+        pages = [[c.id for c in first], [c.id for c in second], last]
+
+        moved = await crud.reschedule(db, user.id, [(ids[0], now + timedelta(days=3), 1), (ids[1], now, -5), (foreign.id, now, 1)])
+        stored = (await db.execute(
+            select(ReviewCard.id, ReviewCard.ease).where(ReviewCard.id.in_([*ids, foreign.id]))
+        )).all()
+        return ids, foreign.id, pages, sorted((row[0], row[2]) for row in moved), dict(stored)
+
+    ids, foreign_id, pages, moved, stored = pg(scenario)
+
+    assert pages == [[ids[2], ids[1]], [ids[0]], None]
+    assert moved == sorted([(ids[0], 3), (ids[1], 1)])
+    assert stored == {ids[0]: 3, ids[1]: 1, ids[2]: 2, foreign_id: 2}
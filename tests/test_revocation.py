@@ -0,0 +1,107 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from modules.auth.jwt_service import JWTService
+from modules.auth.service import AuthService
+from modules.auth.revocation import BloomFilter, BloomFrontedStore, InMemoryRevocationStore
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSharedBackend:
+    def __init__(self):
+        self.revoked: dict[str, float] = {}
+        self.feed: list[tuple[float, str]] = []
+        self.lookups = 0
+
+    async def revoke(self, jti, expires_at):
+        self.revoked[jti] = expires_at
+        self.feed.append((len(self.feed) + 1, jti))
+
+    async def is_revoked(self, jti):
+        self.lookups += 1
+        return jti in self.revoked
+
+    async def changes_since(self, cursor):
+        return [jti for at, jti in self.feed if at > cursor], float(len(self.feed))
+
+    async def aclose(self):
+        pass
+
+
+def test_in_memory_store_forgets_tokens_at_expiry():
+    clock = FakeClock()
+    store = InMemoryRevocationStore(bucket_seconds=60, clock=clock)
+
+    asyncio.run(store.revoke("a", clock.now + 30))
+    asyncio.run(store.revoke("b", clock.now + 600))
+    asyncio.run(store.revoke("expired", clock.now - 1))
+    assert asyncio.run(store.is_revoked("a"))
+    assert not asyncio.run(store.is_revoked("expired"))
+    assert len(store) == 2
+
+    clock.now += 120
+    assert not asyncio.run(store.is_revoked("a"))
+    assert asyncio.run(store.is_revoked("b"))
+    assert len(store) == 1
+
+    clock.now += 600
+    assert not asyncio.run(store.is_revoked("b"))
+    assert len(store) == 0
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"jti-{i}")
+
+    assert all(f"jti-{i}" in bloom for i in range(1000))
+    false_positives = sum(f"other-{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+
+
+def test_bloom_front_skips_the_backend_for_unrevoked_tokens():
+    async def scenario():
+        backend = FakeSharedBackend()
+        local = BloomFrontedStore(backend, capacity=1000)
+        other_worker = BloomFrontedStore(backend, capacity=1000)
+
+        await local.revoke("revoked", expires_at=2e9)
+        assert await local.is_revoked("revoked")
+        assert not await other_worker.is_revoked("revoked")
+
+        await other_worker.sync()
+        assert await other_worker.is_revoked("revoked")
+
+        backend.lookups = 0
+        for i in range(200):
+            assert not await other_worker.is_revoked(f"fresh-{i}")
+        return backend.lookups
+
+    assert asyncio.run(scenario()) < 10
+
+
+def test_logout_revokes_the_refresh_token():
+    jwt_service = JWTService(algorithm="HS256", secret_key="test", access_expiry=5, refresh_expiry=60)
+    auth_service = AuthService(
+        jwt_service=jwt_service,
+        password_manager=None,
+        user_service=None,
+        principal_cache=None,
+        revocation_store=InMemoryRevocationStore(),
+    )
+    token = jwt_service.generate_refresh_token(SimpleNamespace(id=1, email="alice@example.com"))
+
+    asyncio.run(auth_service.logout_user(token))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(auth_service.refresh_token(token, db=None))
+    assert exc.value.detail == "Refresh token revoked"
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "summary"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(30)))
+        return calls, results, flights
+
+    calls, results, flights = asyncio.run(scenario())
+
+    assert calls == 1
+    assert results == ["summary"] * 30
+    assert flights.coalesced == 29
+    assert flights.in_flight() == 0
+
+
+def test_leader_error_reaches_every_waiter_and_releases_key():
+    async def scenario():
+        flights = SingleFlight()
+        attempts = 0
+
+        async def work():
+            nonlocal attempts
+            attempts += 1
+            await asyncio.sleep(0.01)
+            if attempts == 1:
+                raise RuntimeError("llm failed")
+            return "ok"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(3)), return_exceptions=True)
+        retry = await flights.do("key", work)
+        return results, retry
+
+    results, retry = asyncio.run(scenario())
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert retry == "ok"
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        leader = asyncio.ensure_future(flights.do("key", work))
+        follower = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower, leader
+
+    result, leader = asyncio.run(scenario())
+
+    assert result == "ok"
+    assert leader.cancelled()
+
+
+def test_work_is_cancelled_when_last_waiter_leaves():
+    async def scenario():
+        flights = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        return flights
+
+    flights = asyncio.run(scenario())
+
+    assert "key" not in flights
+
+
+def test_on_release_runs_together_with_the_release():
+    async def scenario():
+        flights = SingleFlight()
+        state = {}
+        mismatches = []
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        async def watch():
+            # Whatever runs between loop iterations sees the key and its state together.
+            while True:
+                if ("key" in flights) != ("key" in state):
+                    mismatches.append(dict(state))
+                await asyncio.sleep(0)
+
+        watcher = asyncio.ensure_future(watch())
+        state["key"] = "buffer"
+        result = await flights.do("key", work, on_release=lambda: state.pop("key"))
+        await asyncio.sleep(0)
+        watcher.cancel()
+        return result, state, mismatches, flights
+
+    result, state, mismatches, flights = asyncio.run(scenario())
+
+    assert result == "ok"
+    assert state == {} and flights.in_flight() == 0
+    assert mismatches == []
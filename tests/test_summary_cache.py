@@ -0,0 +1,40 @@
+import time
+
+from core.cache import TTLCache
+from modules.summary.cache import make_cache_key, normalize_text
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_normalized_materials_share_a_key():
+    original = "Сортировка  пузырьком.\r\n\r\n\r\n\tПростой   алгоритм. "
+    reuploaded = "Сортировка пузырьком.\n\nПростой алгоритм."
+
+    assert normalize_text(original) == reuploaded
+    assert make_cache_key(original, "v1") == make_cache_key(reuploaded, "v1")
+
+
+def test_prompt_version_changes_the_key():
+    assert make_cache_key("text", "v1") != make_cache_key("text", "v2")
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from modules.open_ai.service import CHUNK_PROMPT, REDUCE_PROMPT
+from modules.summary.cache import SummaryCache
+from modules.summary.chunking import CHARS_PER_TOKEN, split_text
+from modules.summary.service import SummaryService
+
+
+def test_split_text_respects_budget_and_paragraphs():
+    paragraphs = [f"Абзац {i}. " + "Предложение о сортировке. " * 10 for i in range(6)]
+    text = "\n\n".join(p.strip() for p in paragraphs)
+
+    chunks = split_text(text, max_tokens=200)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 200 * CHARS_PER_TOKEN for chunk in chunks)
+    assert all(chunk.startswith("Абзац") for chunk in chunks)
+    assert " ".join(chunks).replace("\n\n", " ").split() == text.replace("\n\n", " ").split()
+
+
+def test_split_text_falls_back_to_sentences_and_words():
+    sentence = "Очень длинное предложение без точек " * 20
+    chunks = split_text(sentence + ". Второе.", max_tokens=20)
+
+    assert all(len(chunk) <= 20 * CHARS_PER_TOKEN for chunk in chunks)
+    assert chunks[-1].endswith("Второе.")
+
+
+class FlakyAIService:
+    def __init__(self):
+        self.prompts = []
+        self.fail_on = "Часть 2"
+
+    async def stream_summary(self, text: str, prompt: str = ""):
+        self.prompts.append((prompt, text))
+        await asyncio.sleep(0)
+        if prompt == CHUNK_PROMPT and self.fail_on and text.startswith(self.fail_on):
+            raise RuntimeError("timeout")
+        yield f"итог[{text[:7]}]"
+
+
+def make_service(ai_service) -> SummaryService:
+    cache = SummaryCache(database=None, prompt_version="test", maxsize=100, ttl=60)
+    return SummaryService(
+        ai_service=ai_service,
+        cache=cache,
+        chunk_threshold_tokens=50,
+        chunk_tokens=50,
+        chunk_concurrency=2,
+    )
+
+
+def test_retry_after_partial_failure_only_reruns_failed_chunks():
+    text = "\n\n".join(f"Часть {i}. " + "Текст. " * 15 for i in range(4))
+    ai_service = FlakyAIService()
+    service = make_service(ai_service)
+
+    with pytest.raises(RuntimeError, match="1 of 4 chunks failed"):
+        asyncio.run(service.generate(text))
+
+    ai_service.prompts.clear()
+    ai_service.fail_on = None
+    progress = []
+    summary = asyncio.run(service.generate(text, on_progress=progress.append))
+
+    map_calls = [text for prompt, text in ai_service.prompts if prompt == CHUNK_PROMPT]
+    reduce_calls = [text for prompt, text in ai_service.prompts if prompt == REDUCE_PROMPT]
+    assert [call[:7] for call in map_calls] == ["Часть 2"]
+    assert len(reduce_calls) == 1
+    assert reduce_calls[0].count("итог[Часть") == 4
+    assert progress[-1] == 1.0
+    assert summary.startswith("итог[")
+    assert service.cache.chunks.hits == 3
+    assert service.cache.stats().memory_hits == 0
+    assert service.cache.stats().memory_size == 0
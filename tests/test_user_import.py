@@ -0,0 +1,147 @@
+import json
+import asyncio
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from routers.user_router import router
+from modules.auth.dependencies import admin_required
+from modules.auth.password_manager import PasswordManager
+from modules.user import importer as importer_module
+from modules.user.dependencies import get_user_importer
+from modules.user.importer import UserImporter
+from modules.user.schemas import ImportFormat
+
+
+class FakeImporter(UserImporter):
+    """
+    Replaces the COPY + merge step: emails in `taken` already exist, everything else is created.
+    """
+
+    def __init__(self, taken=(), batch_size=2, password_manager=None):
+        password_manager = password_manager or PasswordManager(rounds=4, workers=2)
+        super().__init__(user_database=None, password_manager=password_manager, batch_size=batch_size)
+        self.taken = set(taken)
+        self.batches = []
+
+    async def _load(self, staged, company_id):
+        self.batches.append(staged)
+        return [
+            (row_no, None if email in self.taken else 1000 + row_no, email in self.taken, False)
+            for row_no, email, *_ in staged
+        ]
+
+
+async def chunked(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def run(importer, data: bytes, fmt: ImportFormat) -> list[dict]:
+    async def collect():
+        return [json.loads(line) async for line in importer.run(chunked(data), fmt, company_id=3)]
+    return asyncio.run(collect())
+
+
+def test_csv_import_reports_every_row():
+    data = (
+        "email,password,phone_number\r\n"
+        "a@example.com,secret1,+1\r\n"
+        "not-an-email,secret2,\r\n"
+        "b@example.com,secret3,+1\r\n"
+        "taken@example.com,secret4,\r\n"
+        "\r\n"
+        "c@example.com,secret5\r\n"
+        "d@example.com,secret6,\r\n"
+    ).encode()
+    importer = FakeImporter(taken={"taken@example.com"})
+    lines = run(importer, data, ImportFormat.csv)
+
+    results = {line["row"]: line for line in lines if "row" in line}
+    assert results[1] == {"row": 1, "email": "a@example.com", "status": "created", "id": 1001}
+    assert results[2]["status"] == "failed" and results[2]["error"].startswith("email:")
+    assert results[3]["error"] == "Duplicate of an earlier row in this file"
+    assert results[4]["error"] == "User with this email already exists."
+    assert results[5]["error"] == "Expected 3 columns, got 2"
+    assert results[6]["status"] == "created"
+    assert lines[-1] == {"summary": {"total": 6, "created": 2, "failed": 4}}
+
+    assert [len(b) for b in importer.batches] == [2, 1]
+    assert all(b[5].startswith("$2b$04$") for batch in importer.batches for b in batch)
+
+
+def test_ndjson_import_and_bad_lines():
+    data = (
+        b'{"email": "a@example.com", "password": "secret1", "phone_number": ""}\n[1, 2]\n{broken\n'
+        b'{"email": "b@example.com", "password": "secret2", "phone_number": ""}\n'
+        b'{"email": "A@example.com", "password": "secret3"}\n{"email": "a@example.com", "password": "secret4"}'
+    )
+    importer = FakeImporter()
+    lines = run(importer, data, ImportFormat.ndjson)
+
+    statuses = {line["row"]: line["status"] for line in lines[:-1]}
+    assert [statuses[row] for row in range(1, 7)] == ["created", "failed", "failed", "created", "created", "failed"]
+    # Only the exact repeat is a duplicate, as in users.email; an empty phone is no phone.
+    assert [line["row"] for line in lines[:-1] if line.get("error") == "Duplicate of an earlier row in this file"] == [6]
+    assert [b[2] for batch in importer.batches for b in batch] == [None, None, None]
+    assert lines[-1]["summary"] == {"total": 6, "created": 3, "failed": 3}
+
+
+def test_concurrent_imports_wait_for_the_hashing_pool():
+    importer = FakeImporter(batch_size=2, password_manager=PasswordManager(rounds=4, workers=2, max_pending=2))
+    data = "".join(f'{{"email": "u{i}@example.com", "password": "secret{i}"}}\n' for i in range(6)).encode()
+
+    async def both():
+        async def collect():
+            return [json.loads(line) async for line in importer.run(chunked(data), ImportFormat.ndjson)]
+        # Two imports at once: together they queue more hashes than the pool admits.
+        return await asyncio.gather(collect(), collect())
+
+    first, second = asyncio.run(both())
+
+    assert first[-1] == second[-1] == {"summary": {"total": 6, "created": 6, "failed": 0}}
+
+
+def test_overloaded_hashing_fails_the_batch_and_still_summarizes():
+    class BusyPasswordManager:
+        max_pending = 4
+
+        async def hash(self, password):
+            raise HTTPException(status_code=503, detail="Server is busy, try again")
+
+    data = b'{"email": "a@example.com", "password": "secret1"}\n{"email": "b@example.com", "password": "secret2"}\n'
+    lines = run(FakeImporter(password_manager=BusyPasswordManager()), data, ImportFormat.ndjson)
+
+    assert [line["error"] for line in lines[:-1]] == ["Password hashing unavailable: Server is busy, try again"] * 2
+    assert lines[-1] == {"summary": {"total": 2, "created": 0, "failed": 2}}
+
+
+def test_csv_without_required_columns_is_rejected():
+    lines = run(FakeImporter(), b"email,name\nx@example.com,X\n", ImportFormat.csv)
+    assert "error" in lines[0]
+    assert lines[-1]["summary"]["total"] == 0
+
+
+def test_import_through_the_app_reads_the_whole_upload(monkeypatch):
+    # Small enough that the upload spills to disk.
+    monkeypatch.setattr(importer_module, "SPOOL_MAX_MEMORY", 64)
+    importer = FakeImporter(taken={"taken@example.com"})
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[admin_required] = lambda: None
+    app.dependency_overrides[get_user_importer] = lambda: importer
+
+    rows = [f"user{i}@example.com,secret{i}\n" for i in range(20)] + ["taken@example.com,secret\n"]
+    body = ("email,password\n" + "".join(rows)).encode()
+
+    def upload():
+        for start in range(0, len(body), 50):
+            yield body[start:start + 50]
+
+    with TestClient(app) as client:
+        response = client.post("/users/import?format=csv", content=upload())
+
+    assert response.status_code == 200 and response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1] == {"summary": {"total": 21, "created": 20, "failed": 1}}
+    assert sum(len(batch) for batch in importer.batches) == 21